@@ -2,7 +2,12 @@ import os
 import sys
 import logging
 import re
-from typing import List, Optional, Dict, Any
+import time
+import contextlib
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Dict, Any, Tuple
 
 from dotenv import load_dotenv
 
@@ -11,6 +16,11 @@ from slack_bolt.adapter.socket_mode import SocketModeHandler
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langchain_community.vectorstores import Chroma
 
+from event_dedup import EventDeduplicator
+from intent_router import IntentMatch, IntentRouter, describe as describe_intents
+from slack_stream import SlackReplyStream
+from worker_pool import FairWorkerPool, QueueFull
+
 # -------------------------------------------------------------------
 # ENV + LOGGING
 # -------------------------------------------------------------------
@@ -24,20 +34,78 @@ load_dotenv()
 
 # Try to import Monday client
 try:
-    from monday_client import _call_monday, search_items_by_text, get_all_items
+    from monday_client import (
+        _call_monday,
+        search_items_by_text,
+        get_all_items,
+        search_items_multi,
+        get_all_items_multi,
+        ComplexityBudgetExceeded,
+    )
+    from monday_metrics import labels as monday_call_labels
+    from monday_resilience import MondayUnavailableError
     MONDAY_AVAILABLE = True
 except ImportError:
     logger.warning("Could not find 'monday_client.py'. Monday functions will not work.")
     MONDAY_AVAILABLE = False
+    def monday_call_labels(**labels: Any) -> Any: return contextlib.nullcontext()
+    class ComplexityBudgetExceeded(RuntimeError): pass
+    class MondayUnavailableError(RuntimeError): pass
     def _call_monday(*args: Any) -> None: return None
-    def search_items_by_text(*args: Any) -> List[Any]: return []
-    def get_all_items(*args: Any) -> List[Any]: return []
+    def search_items_by_text(*args: Any, **kwargs: Any) -> List[Any]: return []
+    def get_all_items(*args: Any, **kwargs: Any) -> List[Any]: return []
+    def search_items_multi(*args: Any, **kwargs: Any) -> List[Any]: return []
+    def get_all_items_multi(*args: Any, **kwargs: Any) -> List[Any]: return []
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_APP_TOKEN = os.getenv("SLACK_APP_TOKEN")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 MONDAY_API_KEY = os.getenv("MONDAY_API_KEY")
 CUSTOMER_BOARD_ID = int(os.getenv("MONDAY_CUSTOMER_BOARD_ID", "5085798849"))
+# Boards searched in CRM mode (e.g. leads, customers, partners); defaults to the customer board
+MONDAY_BOARD_IDS = [
+    int(b) for b in os.getenv("MONDAY_BOARD_IDS", "").replace(" ", "").split(",") if b
+] or [CUSTOMER_BOARD_ID]
+MONDAY_MIRROR_ENABLED = os.getenv("MONDAY_MIRROR_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+MONDAY_MIRROR_SYNC_INTERVAL = int(os.getenv("MONDAY_MIRROR_SYNC_INTERVAL", "300"))
+MONDAY_WEBHOOK_PORT = int(os.getenv("MONDAY_WEBHOOK_PORT", "0"))
+# Serve Monday call metrics in Prometheus text format on this port (0 = off)
+MONDAY_METRICS_PORT = int(os.getenv("MONDAY_METRICS_PORT", "0"))
+# Mentions are handled by a bounded worker pool: workers running at once, waiting
+# requests in total and per user before Saiborg answers "busy"
+SAIBORG_WORKERS = int(os.getenv("SAIBORG_WORKERS", "4"))
+SAIBORG_QUEUE_SIZE = int(os.getenv("SAIBORG_QUEUE_SIZE", "20"))
+SAIBORG_MAX_QUEUED_PER_USER = int(os.getenv("SAIBORG_MAX_QUEUED_PER_USER", "3"))
+# Stream LLM answers into the "thinking" message (chat.update at most every N seconds)
+SAIBORG_STREAM_REPLIES = os.getenv("SAIBORG_STREAM_REPLIES", "true").strip().lower() in ("1", "true", "yes")
+SAIBORG_STREAM_UPDATE_INTERVAL = float(os.getenv("SAIBORG_STREAM_UPDATE_INTERVAL", "1.0"))
+# "sync" (threads, default) or "async" (asyncio, see app_async.py) request pipeline
+SAIBORG_RUNTIME = os.getenv("SAIBORG_RUNTIME", "sync").strip().lower()
+# Mentions answered at once by the async runtime
+SAIBORG_ASYNC_CONCURRENCY = int(os.getenv("SAIBORG_ASYNC_CONCURRENCY", "200"))
+# CRM questions about documents (policies, contracts, ...) combine Monday data and
+# retrieved documents, fetched concurrently within a shared deadline in seconds
+SAIBORG_HYBRID_MODE = os.getenv("SAIBORG_HYBRID_MODE", "true").strip().lower() in ("1", "true", "yes")
+SAIBORG_HYBRID_TIMEOUT = float(os.getenv("SAIBORG_HYBRID_TIMEOUT", "10"))
+# Threads for the branches of hybrid requests, including lookups still running after their deadline
+SAIBORG_HYBRID_THREADS = max(2, int(os.getenv("SAIBORG_HYBRID_THREADS", str(4 * max(1, SAIBORG_WORKERS)))))
+
+
+def _column_list(env_name: str, default: str) -> Optional[List[str]]:
+    """Read a comma-separated list of Monday column IDs; an empty value means all columns."""
+    value = os.getenv(env_name, default)
+    columns = [c.strip() for c in value.split(",") if c.strip()]
+    return columns or None
+
+
+# Monday column IDs each CRM mode needs (the item name is always included).
+# Only these are fetched, which keeps payloads and prompts small.
+CRM_MODE_COLUMNS: Dict[str, Optional[List[str]]] = {
+    "summary": _column_list("MONDAY_SUMMARY_COLUMNS", "title,company,status,email"),
+    "email_followup": _column_list("MONDAY_EMAIL_FOLLOWUP_COLUMNS", ""),
+    "meeting_prep": _column_list("MONDAY_MEETING_PREP_COLUMNS", ""),
+    "next_steps": _column_list("MONDAY_NEXT_STEPS_COLUMNS", ""),
+}
 
 # Validate required environment variables
 required_vars = {
@@ -73,6 +141,14 @@ except Exception as e:
     logger.error("Could not connect to Slack: %s", e)
     sys.exit(1)
 
+# Drops Slack redeliveries of events that are already being answered
+event_dedup = EventDeduplicator()
+
+# Runs handle_mention's pipeline off the Bolt listener threads, fairly per channel and user
+mention_pool = FairWorkerPool(
+    SAIBORG_WORKERS, SAIBORG_QUEUE_SIZE, max_per_user=SAIBORG_MAX_QUEUED_PER_USER, name="mention"
+)
+
 # -------------------------------------------------------------------
 # LLM + RAG (Chroma)
 # -------------------------------------------------------------------
@@ -197,29 +273,75 @@ def extract_customer_name(text: str) -> str:
     return t.strip(" ?!.:,;")
 
 
-def build_rag_answer(user_text: str) -> str:
-    """Build an answer using PDF/RAG + LLM for a normal question."""
-    context_parts: List[str] = []
+# Classifies mentions by the phrases in intents.json (SAIBORG_INTENTS_PATH)
+intent_router = IntentRouter.from_file()
 
-    if retriever is not None:
-        try:
-            # Use .invoke() instead of .get_relevant_documents()
-            docs = retriever.invoke(user_text)
-            if docs:
-                logger.info("Found %d relevant document snippets.", len(docs))
-                for doc in docs[:5]:
-                    src = doc.metadata.get('source', 'Unknown source')
-                    page = doc.metadata.get('page', '?')
-                    logger.debug("  - %s (page %s)", src, page)
-                context_parts = [doc.page_content for doc in docs[:5]]
-            else:
-                logger.info("No documents matched the query.")
-        except Exception as e:
-            logger.error("Error during document search: %s", e)
-            context_parts = []
-    else:
-        logger.info("RAG is not active (no Chroma DB).")
+# CRM answer modes by priority when several are asked for
+CRM_MODES = ["email_followup", "meeting_prep", "next_steps"]
+
+
+def plan_crm_request(user_text: str, intents: Dict[str, IntentMatch]) -> Tuple[str, bool, str]:
+    """
+    Decide how to answer a CRM request, based on the intents found in it.
 
+    Returns:
+        (mode, overview, search_term): the answer mode (see monday_prompt),
+        whether all items are needed, and the customer to search for
+        (empty for an overview)
+    """
+    mode = next((name for name in CRM_MODES if name in intents), "summary")
+    overview = "overview" in intents
+    search_term = "" if overview else extract_customer_name(user_text)
+    return mode, overview, search_term
+
+
+def monday_reply_notes(items: List[Dict[str, Any]], search_term: str) -> Tuple[str, str]:
+    """
+    Notes around the LLM's answer about how the Monday items were found.
+
+    Returns:
+        (prefix, suffix): a prefix if the items are only the closest names
+        (typo-tolerant search), a suffix if only the best-ranked matches
+        were sent to the LLM
+    """
+    prefix = suffix = ""
+    if items and "match_score" in items[0]:
+        prefix = f"🔎 Jeg fandt ikke et præcist match på \"{search_term}\" – her er de nærmeste bud:\n\n"
+    if getattr(items, "truncated", 0):
+        suffix = (
+            f"\n\n_\"{search_term}\" matchede {items.total} emner – jeg har kun kigget på "
+            f"de {len(items)} mest relevante. Skriv gerne et mere præcist navn for at indsnævre søgningen._"
+        )
+    return prefix, suffix
+
+
+def generate(prompt: str, on_progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Run the LLM on a prompt and return its answer.
+
+    With on_progress, the answer is streamed and on_progress is called
+    with the text written so far after every chunk.
+    """
+    if on_progress is None:
+        return llm.invoke(prompt).content
+
+    parts: List[str] = []
+    for chunk in llm.stream(prompt):
+        if isinstance(chunk.content, str) and chunk.content:
+            parts.append(chunk.content)
+            on_progress("".join(parts))
+    return "".join(parts)
+
+
+def rag_prompt(user_text: str, docs: List[Any]) -> str:
+    """Build the RAG prompt from the question and the retrieved document snippets."""
+    if docs:
+        logger.info("Found %d relevant document snippets.", len(docs))
+        for doc in docs[:5]:
+            src = doc.metadata.get('source', 'Unknown source')
+            page = doc.metadata.get('page', '?')
+            logger.debug("  - %s (page %s)", src, page)
+    context_parts = [doc.page_content for doc in docs[:5]]
     context = "\n\n---\n\n".join(context_parts)
 
     prompt = f"""
@@ -246,16 +368,37 @@ OUTPUTFORMAT:
 - Start med en 1–2 linjers opsummering.
 - Giv derefter et struktureret svar (punktopstilling eller korte afsnit).
 """
+    return prompt
+
+
+def retrieve_docs(user_text: str) -> List[Any]:
+    """Search the Chroma DB for snippets relevant to the question (empty if RAG is off or fails)."""
+    if retriever is None:
+        logger.info("RAG is not active (no Chroma DB).")
+        return []
     try:
-        response = llm.invoke(prompt)
-        return response.content
+        # Use .invoke() instead of .get_relevant_documents()
+        docs = retriever.invoke(user_text)
+        if not docs:
+            logger.info("No documents matched the query.")
+        return docs
+    except Exception as e:
+        logger.error("Error during document search: %s", e)
+        return []
+
+
+def build_rag_answer(user_text: str, on_progress: Optional[Callable[[str], None]] = None) -> str:
+    """Build an answer using PDF/RAG + LLM for a normal question (streamed to on_progress, if given)."""
+    prompt = rag_prompt(user_text, retrieve_docs(user_text))
+    try:
+        return generate(prompt, on_progress)
     except Exception as e:
         logger.error("Error invoking LLM: %s", e)
         return "Beklager, jeg kunne ikke generere et svar lige nu. Prøv igen senere."
 
 
-def build_monday_answer(user_text: str, items: List[Dict[str, Any]], mode: str = "summary") -> str:
-    """Use LLM to format Monday results nicely.
+def monday_prompt(user_text: str, items: List[Dict[str, Any]], mode: str = "summary") -> str:
+    """Build the prompt that turns Monday results into an answer.
 
     mode:
         - "summary": short CRM overview (default)
@@ -275,6 +418,9 @@ def build_monday_answer(user_text: str, items: List[Dict[str, Any]], mode: str =
                 for cv in (item.get("column_values") or [])
             },
         }
+        if item.get("board_name"):
+            # Tells the LLM whether this is a lead, customer or partner
+            entry["board"] = item["board_name"]
         structured.append(entry)
 
     if mode == "email_followup":
@@ -358,116 +504,345 @@ DATA FRA MONDAY:
 BRUGERENS SPØRGSMÅL:
 \"\"\"{user_text}\"\"\"
 """
+    return crm_prompt
+
+
+def build_monday_answer(
+    user_text: str,
+    items: List[Dict[str, Any]],
+    mode: str = "summary",
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Use LLM to format Monday results nicely (streamed to on_progress, if given); see monday_prompt."""
     try:
-        resp = llm.invoke(crm_prompt)
-        return resp.content
+        return generate(monday_prompt(user_text, items, mode), on_progress)
     except Exception as e:
         logger.error("Error invoking LLM for Monday answer: %s", e)
         return "Beklager, jeg kunne ikke formatere Monday-resultaterne lige nu."
 
 
+def hybrid_prompt(user_text: str, docs: List[Any], items: List[Dict[str, Any]]) -> str:
+    """Build one prompt from both the retrieved document snippets and the Monday items."""
+    context = "\n\n---\n\n".join(doc.page_content for doc in docs[:5])
+    structured = [
+        {
+            "name": item.get("name"),
+            "board": item.get("board_name"),
+            "columns": {cv.get("id"): cv.get("text") for cv in (item.get("column_values") or [])},
+        }
+        for item in items
+    ]
+
+    prompt = f"""
+Du er SAIBORG – en professionel, præcis og hjælpsom dansk AI-assistent.
+
+OPGAVEN:
+- Besvar brugerens spørgsmål ved at kombinere virksomhedens dokumenter med CRM-data fra Monday.
+- Brug dokument-konteksten til regler, vilkår og politikker, og Monday-data til fakta om kunden/leadet.
+- Forklar konkret, hvad dokumenterne betyder for netop denne kunde.
+
+BRUGERENS SPØRGSMÅL:
+\"\"\"{user_text}\"\"\"
+
+DOKUMENT-KONTEKST:
+\"\"\"{context}\"\"\"
+
+DATA FRA MONDAY:
+{structured}
+
+REGLER:
+1) Du må aldrig opfinde tal, priser eller specifikke fakta, der ikke står i konteksten eller i Monday-data.
+2) Hvis en af kilderne mangler eller er tom, så sig det tydeligt og svar ud fra den anden.
+3) Ingen tekniske detaljer som IDs, JSON, kolonne-id'er osv.
+
+OUTPUTFORMAT:
+- Start med en 1–2 linjers opsummering.
+- Giv derefter et struktureret svar (punktopstilling eller korte afsnit).
+"""
+    return prompt
+
+
+def log_missing_columns(mode: str, columns: Optional[List[str]], items: List[Dict[str, Any]]) -> None:
+    """Warn about configured CRM column IDs (see CRM_MODE_COLUMNS) that the fetched items lack."""
+    if not columns or not items:
+        return
+    present = {cv.get("id") for item in items for cv in item.get("column_values") or []}
+    missing = [column for column in columns if column not in present]
+    if missing:
+        logger.warning(
+            "Monday column IDs configured for %s mode not found on the board: %s (found: %s)",
+            mode, ", ".join(missing), ", ".join(sorted(str(c) for c in present)) or "none",
+        )
+
+
+def fetch_crm_items(mode: str, overview: bool, search_term: str) -> List[Dict[str, Any]]:
+    """Fetch the Monday items for a CRM request planned by plan_crm_request."""
+    columns = CRM_MODE_COLUMNS.get(mode)
+
+    def fetch(cols: Optional[List[str]]) -> List[Dict[str, Any]]:
+        multi = len(MONDAY_BOARD_IDS) > 1
+        if overview:
+            logger.info("Monday lookup: fetching all items from %d board(s)", len(MONDAY_BOARD_IDS))
+            if multi:
+                return get_all_items_multi(MONDAY_BOARD_IDS, columns=cols)
+            return get_all_items(MONDAY_BOARD_IDS[0], columns=cols)
+        logger.info("Monday lookup for: '%s'", search_term)
+        if multi:
+            return search_items_multi(MONDAY_BOARD_IDS, search_term, columns=cols)
+        return search_items_by_text(MONDAY_BOARD_IDS[0], search_term, columns=cols)
+
+    # Tags the Monday calls' metrics with the intent that caused them
+    with monday_call_labels(intent="overview" if overview else mode):
+        items = fetch(columns)
+        log_missing_columns(mode, columns, items)
+        if columns and items and not any(item.get("column_values") for item in items):
+            # None of the configured column IDs exist on the board
+            logger.warning("Column projection %s matched no columns, fetching all columns", columns)
+            items = fetch(None)
+    return items
+
+
+# Runs the branches of hybrid requests, apart from the worker pool
+hybrid_executor = ThreadPoolExecutor(max_workers=SAIBORG_HYBRID_THREADS, thread_name_prefix="saiborg-hybrid")
+# Branches submitted and not yet finished, counting those their request stopped waiting for
+_hybrid_running = 0
+_hybrid_running_lock = threading.Lock()
+
+# Note on a hybrid answer without Monday data, by the reason it is missing
+HYBRID_MONDAY_NOTES = {
+    "timeout": "_Monday svarede ikke i tide – svaret bygger kun på dokumenterne._",
+    "error": "_Jeg kunne ikke hente data fra Monday – svaret bygger kun på dokumenterne._",
+    "busy": "_Monday-opslag hober sig op lige nu, så jeg sprang det over – svaret bygger kun på dokumenterne._",
+}
+
+
+def _hybrid_branch_done(_future: Future) -> None:
+    global _hybrid_running
+    with _hybrid_running_lock:
+        _hybrid_running -= 1
+
+
+def _submit_hybrid_branches(*branches: Tuple[Callable[..., Any], Tuple[Any, ...]]) -> Optional[List[Future]]:
+    """
+    Submit the branches to hybrid_executor, or nothing if its threads are
+    taken: a branch past its deadline keeps its thread until it finishes,
+    and new branches would only queue behind those and miss their deadline.
+    """
+    global _hybrid_running
+    with _hybrid_running_lock:
+        if _hybrid_running + len(branches) > SAIBORG_HYBRID_THREADS:
+            return None
+        _hybrid_running += len(branches)
+
+    futures = []
+    for fn, args in branches:
+        # Each branch runs in a copy of the caller's context, so Monday metrics keep their labels
+        future = hybrid_executor.submit(contextvars.copy_context().run, fn, *args)
+        future.add_done_callback(_hybrid_branch_done)
+        futures.append(future)
+    return futures
+
+
+def gather_hybrid_context(
+    user_text: str, mode: str, overview: bool, search_term: str
+) -> Tuple[List[Any], Optional[List[Dict[str, Any]]], Optional[str]]:
+    """
+    Retrieve documents and look up Monday at the same time.
+
+    Both branches share one deadline (SAIBORG_HYBRID_TIMEOUT), so the wait
+    is that of the slower branch, never their sum. A branch that misses
+    the deadline is left out of the answer. While the hybrid threads are
+    all held by earlier lookups, Monday is skipped and the documents are
+    retrieved on the calling thread.
+
+    Returns:
+        (docs, items, missing): items is None if there is no Monday data,
+        and missing then says why ('timeout', 'error' or 'busy'); docs is
+        empty if retrieval failed or timed out
+    """
+    started = time.monotonic()
+    futures = _submit_hybrid_branches(
+        (retrieve_docs, (user_text,)),
+        (fetch_crm_items, (mode, overview, search_term)),
+    )
+    if futures is None:
+        logger.warning("All %d hybrid threads are busy, answering without Monday", SAIBORG_HYBRID_THREADS)
+        return retrieve_docs(user_text), None, "busy"
+
+    docs_future, items_future = futures
+    wait(futures, timeout=SAIBORG_HYBRID_TIMEOUT)
+
+    docs: List[Any] = docs_future.result() if docs_future.done() else []
+    items: Optional[List[Dict[str, Any]]] = None
+    missing: Optional[str] = None
+    if not items_future.done():
+        logger.warning("Monday lookup missed the hybrid deadline of %.1f s", SAIBORG_HYBRID_TIMEOUT)
+        missing = "timeout"
+    elif items_future.exception() is not None:
+        logger.warning("Monday lookup failed in hybrid mode: %s", items_future.exception())
+        missing = "error"
+    else:
+        items = items_future.result()
+    if not docs_future.done():
+        logger.warning("Document search missed the hybrid deadline of %.1f s", SAIBORG_HYBRID_TIMEOUT)
+
+    logger.info(
+        "Hybrid context in %.0f ms: %d documents, %s Monday items",
+        (time.monotonic() - started) * 1000, len(docs), "no" if items is None else len(items),
+    )
+    return docs, items, missing
+
+
+def hybrid_reply_notes(
+    docs: List[Any], items: Optional[List[Dict[str, Any]]], search_term: str, missing: Optional[str] = None
+) -> Tuple[str, str]:
+    """monday_reply_notes for hybrid answers, plus a note about a source that is missing (and why)."""
+    prefix, suffix = monday_reply_notes(items or [], search_term)
+    if items is None:
+        suffix += "\n\n" + HYBRID_MONDAY_NOTES.get(missing or "error", HYBRID_MONDAY_NOTES["error"])
+    elif not docs:
+        suffix += "\n\n_Jeg fandt ingen relevante dokumenter – svaret bygger kun på Monday-data._"
+    return prefix, suffix
+
+
+def build_hybrid_answer(
+    user_text: str,
+    docs: List[Any],
+    items: List[Dict[str, Any]],
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Answer from documents and Monday items together (streamed to on_progress, if given)."""
+    try:
+        return generate(hybrid_prompt(user_text, docs, items), on_progress)
+    except Exception as e:
+        logger.error("Error invoking LLM for hybrid answer: %s", e)
+        return "Beklager, jeg kunne ikke generere et svar lige nu. Prøv igen senere."
+
+
 # -------------------------------------------------------------------
 # Slack handler
 # -------------------------------------------------------------------
 
 @app.event("app_mention")
-def handle_mention(event: Dict[str, Any], say: Any) -> None:
-    """Main entry point when someone mentions @Saiborg in Slack."""
+def handle_mention(event: Dict[str, Any], say: Any, body: Dict[str, Any]) -> None:
+    """
+    Main entry point when someone mentions @Saiborg in Slack.
+
+    Skips redeliveries of an event already received, then queues the
+    request for the worker pool and tells the user right away if it has to
+    wait, or if Saiborg is too busy to take it.
+    """
+    if event_dedup.is_duplicate(body, event):
+        return
+
+    thread_ts = event.get("thread_ts", event.get("ts"))
+    try:
+        position = mention_pool.submit(
+            lambda: process_mention(event, say),
+            channel=event.get("channel", ""),
+            user=event.get("user", ""),
+        )
+    except QueueFull as e:
+        logger.warning("Rejected mention: %s", e)
+        say(text="🚦 Saiborg har travlt lige nu – prøv igen om lidt.", thread_ts=thread_ts)
+        return
+
+    if position:
+        say(text=f"⏳ Der er travlt lige nu – du er ca. nr. {position} i køen.", thread_ts=thread_ts)
+
+
+def process_mention(event: Dict[str, Any], say: Any) -> None:
+    """Answer a mention: Monday health-check, CRM lookup or RAG answer (runs on a pool worker)."""
     channel = event["channel"]
     thread_ts = event.get("thread_ts", event.get("ts"))
 
     raw_text = event.get("text", "")
     user_text = strip_bot_mention(raw_text)
-    lower = user_text.lower()
+    intents = intent_router.matches(user_text)
 
     logger.info("Received message: %s", user_text)
+    logger.info("Intents: %s", describe_intents(intents))
+
+    # Send "thinking..." message first; with streaming, the answer is written into it
+    placeholder = say(text="🤔 Saiborg er i gang med at tænke...", thread_ts=thread_ts)
+    stream: Optional[SlackReplyStream] = None
+    if SAIBORG_STREAM_REPLIES and placeholder and placeholder.get("ts"):
+        stream = SlackReplyStream(
+            app.client, channel, placeholder["ts"], thread_ts, interval=SAIBORG_STREAM_UPDATE_INTERVAL
+        )
+    progress = stream.update if stream is not None else None
 
-    # Send "thinking..." message first
-    say(text="🤔 Saiborg er i gang med at tænke...", thread_ts=thread_ts)
+    def send_reply(text: str) -> None:
+        if stream is not None:
+            stream.finish(text)
+        else:
+            app.client.chat_postMessage(channel=channel, text=text, thread_ts=thread_ts)
 
     try:
         reply = ""
         
         # 1) Monday health-check
-        if "monday test" in lower:
+        if "health_check" in intents:
             if not MONDAY_API_KEY:
                 reply = "Jeg har ikke nogen Monday API-nøgle konfigureret."
             else:
                 query = "query { me { name email } }"
-                data = _call_monday(query)
+                with monday_call_labels(intent="health_check"):
+                    data = _call_monday(query)
                 me = (data or {}).get("me")
                 if me:
                     reply = f"✅ Monday-forbindelse virker! Du er logget ind som: {me.get('name')} ({me.get('email')})"
                 else:
                     reply = "❌ Jeg kunne ikke læse brugerinfo fra Monday – tjek API-nøglen."
 
-        # 2) Monday CRM-mode
-        elif "monday" in lower or "crm" in lower:
+        # 2) Hybrid mode: CRM data and documents, fetched concurrently
+        elif (
+            "crm" in intents and "documents" in intents and MONDAY_API_KEY
+            and SAIBORG_HYBRID_MODE and retriever is not None
+        ):
+            mode, overview, search_term = plan_crm_request(user_text, intents)
+            docs, items, missing = gather_hybrid_context(user_text, mode, overview, search_term)
+            prefix, suffix = hybrid_reply_notes(docs, items, search_term, missing)
+            reply = prefix + build_hybrid_answer(
+                user_text,
+                docs,
+                items or [],
+                on_progress=(lambda text: progress(prefix + text)) if progress else None,
+            ) + suffix
+
+        # 3) Monday CRM-mode
+        elif "crm" in intents:
             if not MONDAY_API_KEY:
                 reply = "Jeg har ikke nogen Monday API-nøgle konfigureret, så jeg kan ikke læse CRM-data endnu."
             else:
-                items: Optional[List[Dict[str, Any]]] = None
-                mode = "summary"
-
-                overview_phrases = [
-                    "alle kunder", "alle leads", "hvilke leads har vi",
-                    "hvilke kunder har vi", "overblik over vores leads", "overblik over kunder",
-                ]
-
-                email_phrases = [
-                    "skriv en mail", "skriv en e-mail", "skriv email", "skriv en email",
-                    "formuler en mail", "lav en mail", "follow up mail", "opfølgningsmail",
-                ]
-
-                meeting_phrases = [
-                    "forbered møde", "forberedelse til møde", "mødeforberedelse",
-                    "prepare meeting", "prepare for meeting", "salgsmøde", "kundemøde",
-                ]
-
-                next_step_phrases = [
-                    "næste skridt", "next steps", "hvad gør vi nu", "hvad er næste skridt",
-                    "hvad bør jeg gøre nu",
-                ]
-
-                if any(phrase in lower for phrase in overview_phrases):
-                    logger.info("Monday lookup: fetching all items from board")
-                    items = get_all_items(CUSTOMER_BOARD_ID)
-                else:
-                    search_term = extract_customer_name(user_text)
-                    logger.info("Monday lookup for: '%s'", search_term)
-                    items = search_items_by_text(CUSTOMER_BOARD_ID, search_term)
-
-                # Decide which Monday mode to use, based on phrasing
-                if any(phrase in lower for phrase in email_phrases):
-                    mode = "email_followup"
-                elif any(phrase in lower for phrase in meeting_phrases):
-                    mode = "meeting_prep"
-                elif any(phrase in lower for phrase in next_step_phrases):
-                    mode = "next_steps"
+                mode, overview, search_term = plan_crm_request(user_text, intents)
+                items = fetch_crm_items(mode, overview, search_term)
 
                 if not items:
                     reply = "Jeg kunne ikke finde nogen kunder/leads i Monday, der matcher din forespørgsel."
                 else:
                     logger.info("Monday-lookup succeeded with %d items", len(items))
-                    reply = build_monday_answer(user_text, items, mode=mode)
-
-        # 3) Standard RAG-/AI-mode
+                    prefix, suffix = monday_reply_notes(items, search_term)
+                    reply = prefix + build_monday_answer(
+                        user_text,
+                        items,
+                        mode=mode,
+                        on_progress=(lambda text: progress(prefix + text)) if progress else None,
+                    ) + suffix
+
+        # 4) Standard RAG-/AI-mode
         else:
-            reply = build_rag_answer(user_text)
+            reply = build_rag_answer(user_text, on_progress=progress)
 
-        app.client.chat_postMessage(
-            channel=channel,
-            text=reply,
-            thread_ts=thread_ts,
-        )
+        send_reply(reply)
+
+    except (MondayUnavailableError, ComplexityBudgetExceeded) as e:
+        logger.warning("Monday unavailable in handle_mention: %s", e)
+        send_reply("⏳ Monday svarer ikke lige nu – prøv igen om lidt.")
 
     except Exception as e:
         logger.exception("Error in handle_mention")
-        app.client.chat_postMessage(
-            channel=channel,
-            text=f"❌ Der skete en fejl: {e}",
-            thread_ts=thread_ts,
-        )
+        send_reply(f"❌ Der skete en fejl: {e}")
 
 
 # -------------------------------------------------------------------
@@ -475,7 +850,36 @@ def handle_mention(event: Dict[str, Any], say: Any) -> None:
 # -------------------------------------------------------------------
 
 if __name__ == "__main__":
-    logger.info("Connecting to Slack via Socket Mode...")
-    logger.info("🤖 === SAIBORG IS ONLINE! === 🤖")
-    handler = SocketModeHandler(app, SLACK_APP_TOKEN)
-    handler.start()
\ No newline at end of file
+    if MONDAY_AVAILABLE and MONDAY_API_KEY and MONDAY_MIRROR_ENABLED:
+        from monday_mirror import start_background_sync
+        logger.info("Keeping local Monday mirror in sync every %d s", MONDAY_MIRROR_SYNC_INTERVAL)
+        start_background_sync(CUSTOMER_BOARD_ID, MONDAY_MIRROR_SYNC_INTERVAL)
+
+    if MONDAY_AVAILABLE and MONDAY_API_KEY and MONDAY_WEBHOOK_PORT:
+        from monday_webhooks import start_webhook_server
+        try:
+            start_webhook_server(port=MONDAY_WEBHOOK_PORT)
+        except ValueError as e:
+            logger.error("Monday webhook receiver not started: %s", e)
+
+    if SAIBORG_RUNTIME == "async":
+        # app_async imports this module as "app"; reuse it instead of loading it twice
+        sys.modules.setdefault("app", sys.modules[__name__])
+        import app_async
+        request_metrics = app_async.limiter.prometheus_lines
+    else:
+        request_metrics = mention_pool.prometheus_lines
+
+    if MONDAY_AVAILABLE and MONDAY_METRICS_PORT:
+        from monday_metrics import add_collector, start_exporter
+        add_collector("mention_pool", request_metrics)
+        add_collector("event_dedup", event_dedup.prometheus_lines)
+        start_exporter(port=MONDAY_METRICS_PORT)
+
+    if SAIBORG_RUNTIME == "async":
+        app_async.run()
+    else:
+        logger.info("Connecting to Slack via Socket Mode...")
+        logger.info("🤖 === SAIBORG IS ONLINE! === 🤖")
+        handler = SocketModeHandler(app, SLACK_APP_TOKEN)
+        handler.start()
\ No newline at end of file
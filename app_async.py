@@ -0,0 +1,293 @@
+"""Asyncio runtime of the Saiborg Slack bot (SAIBORG_RUNTIME=async).
+
+Answers mentions with the same pipeline as app.process_mention, on the
+async Bolt app and Socket Mode handler: the retriever and the LLM are
+awaited (ainvoke/astream) and Monday is read through monday_async, so a
+waiting request holds no thread and one process can serve hundreds of
+mentions at once. Configuration, prompts and helpers come from app.py.
+
+Usage:
+    SAIBORG_RUNTIME=async python3 app.py
+"""
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+
+import app as saiborg
+from slack_stream import AsyncSlackReplyStream
+from worker_pool import AsyncRequestLimiter, QueueFull
+
+try:
+    import monday_async
+except ImportError:
+    monday_async = None
+
+logger = logging.getLogger(__name__)
+
+async_app = AsyncApp(token=saiborg.SLACK_BOT_TOKEN)
+
+# At most SAIBORG_ASYNC_CONCURRENCY mentions are answered at once; channels and their users take turns
+limiter = AsyncRequestLimiter(
+    saiborg.SAIBORG_ASYNC_CONCURRENCY,
+    saiborg.SAIBORG_QUEUE_SIZE,
+    max_per_user=saiborg.SAIBORG_MAX_QUEUED_PER_USER,
+)
+
+Progress = Optional[Callable[[str], Awaitable[None]]]
+
+
+async def agenerate(prompt: str, on_progress: Progress = None) -> str:
+    """Async counterpart of app.generate: ainvoke, or astream with on_progress."""
+    if on_progress is None:
+        return (await saiborg.llm.ainvoke(prompt)).content
+
+    parts: List[str] = []
+    async for chunk in saiborg.llm.astream(prompt):
+        if isinstance(chunk.content, str) and chunk.content:
+            parts.append(chunk.content)
+            await on_progress("".join(parts))
+    return "".join(parts)
+
+
+async def aretrieve_docs(user_text: str) -> List[Any]:
+    """Async counterpart of app.retrieve_docs."""
+    if saiborg.retriever is None:
+        logger.info("RAG is not active (no Chroma DB).")
+        return []
+    try:
+        docs = await saiborg.retriever.ainvoke(user_text)
+        if not docs:
+            logger.info("No documents matched the query.")
+        return docs
+    except Exception as e:
+        logger.error("Error during document search: %s", e)
+        return []
+
+
+async def abuild_rag_answer(user_text: str, on_progress: Progress = None) -> str:
+    """Async counterpart of app.build_rag_answer."""
+    docs = await aretrieve_docs(user_text)
+    try:
+        return await agenerate(saiborg.rag_prompt(user_text, docs), on_progress)
+    except Exception as e:
+        logger.error("Error invoking LLM: %s", e)
+        return "Beklager, jeg kunne ikke generere et svar lige nu. Prøv igen senere."
+
+
+async def abuild_monday_answer(
+    user_text: str,
+    items: List[Dict[str, Any]],
+    mode: str = "summary",
+    on_progress: Progress = None,
+) -> str:
+    """Async counterpart of app.build_monday_answer."""
+    try:
+        return await agenerate(saiborg.monday_prompt(user_text, items, mode), on_progress)
+    except Exception as e:
+        logger.error("Error invoking LLM for Monday answer: %s", e)
+        return "Beklager, jeg kunne ikke formatere Monday-resultaterne lige nu."
+
+
+async def afetch_crm_items(mode: str, overview: bool, search_term: str) -> List[Dict[str, Any]]:
+    """Async counterpart of app.fetch_crm_items."""
+    board_ids = saiborg.MONDAY_BOARD_IDS
+    columns = saiborg.CRM_MODE_COLUMNS.get(mode)
+
+    async def fetch(cols: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if overview:
+            logger.info("Monday lookup: fetching all items from %d board(s)", len(board_ids))
+            if len(board_ids) > 1:
+                return await monday_async.aget_all_items_multi(board_ids, columns=cols)
+            return await monday_async.aget_all_items(board_ids[0], columns=cols)
+        logger.info("Monday lookup for: '%s'", search_term)
+        if len(board_ids) > 1:
+            return await monday_async.asearch_items_multi(board_ids, search_term, columns=cols)
+        return await monday_async.asearch_items_by_text(board_ids[0], search_term, columns=cols)
+
+    with saiborg.monday_call_labels(intent="overview" if overview else mode):
+        items = await fetch(columns)
+        saiborg.log_missing_columns(mode, columns, items)
+        if columns and items and not any(item.get("column_values") for item in items):
+            logger.warning("Column projection %s matched no columns, fetching all columns", columns)
+            items = await fetch(None)
+    return items
+
+
+async def agather_hybrid_context(
+    user_text: str, mode: str, overview: bool, search_term: str
+) -> Tuple[List[Any], Optional[List[Dict[str, Any]]], Optional[str]]:
+    """Async counterpart of app.gather_hybrid_context; a branch past the deadline is cancelled."""
+    started = time.monotonic()
+    docs_task = asyncio.create_task(aretrieve_docs(user_text))
+    items_task = asyncio.create_task(afetch_crm_items(mode, overview, search_term))
+    _, pending = await asyncio.wait([docs_task, items_task], timeout=saiborg.SAIBORG_HYBRID_TIMEOUT)
+    for task in pending:
+        task.cancel()
+
+    docs: List[Any] = [] if docs_task in pending else docs_task.result()
+    items: Optional[List[Dict[str, Any]]] = None
+    missing: Optional[str] = None
+    if items_task in pending:
+        logger.warning("Monday lookup missed the hybrid deadline of %.1f s", saiborg.SAIBORG_HYBRID_TIMEOUT)
+        missing = "timeout"
+    elif items_task.exception() is not None:
+        logger.warning("Monday lookup failed in hybrid mode: %s", items_task.exception())
+        missing = "error"
+    else:
+        items = items_task.result()
+    if docs_task in pending:
+        logger.warning("Document search missed the hybrid deadline of %.1f s", saiborg.SAIBORG_HYBRID_TIMEOUT)
+
+    logger.info(
+        "Hybrid context in %.0f ms: %d documents, %s Monday items",
+        (time.monotonic() - started) * 1000, len(docs), "no" if items is None else len(items),
+    )
+    return docs, items, missing
+
+
+async def abuild_hybrid_answer(
+    user_text: str, docs: List[Any], items: List[Dict[str, Any]], on_progress: Progress = None
+) -> str:
+    """Async counterpart of app.build_hybrid_answer."""
+    try:
+        return await agenerate(saiborg.hybrid_prompt(user_text, docs, items), on_progress)
+    except Exception as e:
+        logger.error("Error invoking LLM for hybrid answer: %s", e)
+        return "Beklager, jeg kunne ikke generere et svar lige nu. Prøv igen senere."
+
+
+async def aprocess_mention(event: Dict[str, Any], say: Any, client: Any) -> None:
+    """Async counterpart of app.process_mention."""
+    channel = event["channel"]
+    thread_ts = event.get("thread_ts", event.get("ts"))
+    user_text = saiborg.strip_bot_mention(event.get("text", ""))
+    intents = saiborg.intent_router.matches(user_text)
+
+    logger.info("Received message: %s", user_text)
+    logger.info("Intents: %s", saiborg.describe_intents(intents))
+
+    placeholder = await say(text="🤔 Saiborg er i gang med at tænke...", thread_ts=thread_ts)
+    stream: Optional[AsyncSlackReplyStream] = None
+    if saiborg.SAIBORG_STREAM_REPLIES and placeholder and placeholder.get("ts"):
+        stream = AsyncSlackReplyStream(
+            client, channel, placeholder["ts"], thread_ts, interval=saiborg.SAIBORG_STREAM_UPDATE_INTERVAL
+        )
+    progress = stream.update if stream is not None else None
+
+    async def send_reply(text: str) -> None:
+        if stream is not None:
+            await stream.finish(text)
+        else:
+            await client.chat_postMessage(channel=channel, text=text, thread_ts=thread_ts)
+
+    monday_ready = saiborg.MONDAY_API_KEY and monday_async is not None
+    try:
+        # 1) Monday health-check
+        if "health_check" in intents:
+            if not monday_ready:
+                reply = "Jeg har ikke nogen Monday API-nøgle konfigureret."
+            else:
+                with saiborg.monday_call_labels(intent="health_check"):
+                    data = await monday_async._acall_monday("query { me { name email } }")
+                me = (data or {}).get("me")
+                if me:
+                    reply = f"✅ Monday-forbindelse virker! Du er logget ind som: {me.get('name')} ({me.get('email')})"
+                else:
+                    reply = "❌ Jeg kunne ikke læse brugerinfo fra Monday – tjek API-nøglen."
+
+        # 2) Hybrid mode: CRM data and documents, fetched concurrently
+        elif (
+            "crm" in intents and "documents" in intents and monday_ready
+            and saiborg.SAIBORG_HYBRID_MODE and saiborg.retriever is not None
+        ):
+            mode, overview, search_term = saiborg.plan_crm_request(user_text, intents)
+            docs, hybrid_items, missing = await agather_hybrid_context(user_text, mode, overview, search_term)
+            prefix, suffix = saiborg.hybrid_reply_notes(docs, hybrid_items, search_term, missing)
+
+            async def prefixed(text: str) -> None:
+                await progress(prefix + text)
+
+            reply = prefix + await abuild_hybrid_answer(
+                user_text, docs, hybrid_items or [], on_progress=prefixed if progress else None
+            ) + suffix
+
+        # 3) Monday CRM-mode
+        elif "crm" in intents:
+            if not monday_ready:
+                reply = "Jeg har ikke nogen Monday API-nøgle konfigureret, så jeg kan ikke læse CRM-data endnu."
+            else:
+                mode, overview, search_term = saiborg.plan_crm_request(user_text, intents)
+                items = await afetch_crm_items(mode, overview, search_term)
+
+                if not items:
+                    reply = "Jeg kunne ikke finde nogen kunder/leads i Monday, der matcher din forespørgsel."
+                else:
+                    logger.info("Monday-lookup succeeded with %d items", len(items))
+                    prefix, suffix = saiborg.monday_reply_notes(items, search_term)
+
+                    async def prefixed(text: str) -> None:
+                        await progress(prefix + text)
+
+                    reply = prefix + await abuild_monday_answer(
+                        user_text, items, mode=mode, on_progress=prefixed if progress else None
+                    ) + suffix
+
+        # 4) Standard RAG-/AI-mode
+        else:
+            reply = await abuild_rag_answer(user_text, on_progress=progress)
+
+        await send_reply(reply)
+
+    except (saiborg.MondayUnavailableError, saiborg.ComplexityBudgetExceeded) as e:
+        logger.warning("Monday unavailable in handle_mention: %s", e)
+        await send_reply("⏳ Monday svarer ikke lige nu – prøv igen om lidt.")
+
+    except Exception as e:
+        logger.exception("Error in handle_mention")
+        await send_reply(f"❌ Der skete en fejl: {e}")
+
+
+@async_app.event("app_mention")
+async def handle_mention(event: Dict[str, Any], say: Any, client: Any, body: Dict[str, Any]) -> None:
+    """Async counterpart of app.handle_mention: dedup, admission control, then the pipeline."""
+    # The shared dedup store is a SQLite file, so keep its writes off the event loop
+    if await asyncio.to_thread(saiborg.event_dedup.is_duplicate, body, event):
+        return
+
+    thread_ts = event.get("thread_ts", event.get("ts"))
+    try:
+        ticket = limiter.admit(event.get("channel", ""), event.get("user", ""))
+    except QueueFull as e:
+        logger.warning("Rejected mention: %s", e)
+        await say(text="🚦 Saiborg har travlt lige nu – prøv igen om lidt.", thread_ts=thread_ts)
+        return
+
+    if ticket.position:
+        try:
+            await say(text=f"⏳ Der er travlt lige nu – du er ca. nr. {ticket.position} i køen.", thread_ts=thread_ts)
+        except BaseException:
+            limiter.cancel(ticket)
+            raise
+    await limiter.run(ticket, aprocess_mention(event, say, client))
+
+
+async def serve() -> None:
+    """Connect to Slack via Socket Mode and answer mentions until cancelled."""
+    handler = AsyncSocketModeHandler(async_app, saiborg.SLACK_APP_TOKEN)
+    try:
+        await handler.start_async()
+    finally:
+        if monday_async is not None:
+            await monday_async.aclose()
+
+
+def run() -> None:
+    """Start the async runtime (blocks)."""
+    logger.info("Connecting to Slack via Socket Mode (asyncio runtime, up to %d concurrent mentions)...",
+                saiborg.SAIBORG_ASYNC_CONCURRENCY)
+    logger.info("🤖 === SAIBORG IS ONLINE! === 🤖")
+    asyncio.run(serve())
@@ -0,0 +1,191 @@
+"""Deduplication of redelivered Slack events.
+
+Slack redelivers an event when it is not acknowledged quickly enough, so
+the same mention can arrive several times. Every event is claimed by its
+event_id and client_msg_id for a time window; a later event with a key
+that was already claimed is a duplicate. Keys are kept in process memory
+and, with SAIBORG_DEDUP_PATH set, in a SQLite file shared by all bot
+replicas on the host.
+"""
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long (seconds) a claimed event key is remembered
+DEDUP_TTL = float(os.getenv("SAIBORG_DEDUP_TTL", "600"))
+# Maximum number of keys kept in memory
+DEDUP_MAX_ENTRIES = int(os.getenv("SAIBORG_DEDUP_MAX_ENTRIES", "10000"))
+# SQLite file shared by replicas on the same host (empty = in-process only)
+DEDUP_PATH = os.getenv("SAIBORG_DEDUP_PATH", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_events (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS seen_events_expiry ON seen_events (expires_at);
+"""
+
+# Purge expired rows from the shared store every this many claims
+PURGE_EVERY = 200
+
+
+class MemoryDedupStore:
+    """Bounded in-process store of claimed keys, each valid for `ttl` seconds."""
+
+    def __init__(self, ttl: float = DEDUP_TTL, max_entries: int = DEDUP_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # key -> expiry; insertion order is expiry order, as the TTL is fixed
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def claim(self, key: str) -> bool:
+        """Claim a key; returns False if it was already claimed within the window."""
+        now = time.monotonic()
+        with self._lock:
+            while self._entries:
+                oldest, expires_at = next(iter(self._entries.items()))
+                if expires_at > now and len(self._entries) < self.max_entries:
+                    break
+                del self._entries[oldest]
+            if key in self._entries:
+                return False
+            self._entries[key] = now + self.ttl
+            return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteDedupStore:
+    """Store of claimed keys in a SQLite file, shared by the processes that open it."""
+
+    def __init__(self, path: str, ttl: float = DEDUP_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._claims = 0
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def claim(self, key: str) -> bool:
+        """Claim a key for all replicas; returns False if it was already claimed within the window."""
+        now = time.time()
+        self._claims += 1
+        with self._connect() as conn:
+            if self._claims % PURGE_EVERY == 0:
+                conn.execute("DELETE FROM seen_events WHERE expires_at <= ?", (now,))
+            # An expired claim can be taken over; a live one cannot
+            cursor = conn.execute(
+                "INSERT INTO seen_events (key, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at "
+                "WHERE seen_events.expires_at <= ?",
+                (key, now + self.ttl, now),
+            )
+            return cursor.rowcount == 1
+
+
+def event_keys(body: Optional[Dict[str, Any]], event: Dict[str, Any]) -> List[str]:
+    """
+    Keys identifying a Slack event delivery: the envelope's event_id and the
+    message's client_msg_id, or channel and timestamp if neither is present.
+    """
+    keys = []
+    if body and body.get("event_id"):
+        keys.append(f"event:{body['event_id']}")
+    if event.get("client_msg_id"):
+        keys.append(f"msg:{event['client_msg_id']}")
+    if not keys and event.get("ts"):
+        keys.append(f"ts:{event.get('channel')}:{event['ts']}")
+    return keys
+
+
+class EventDeduplicator:
+    """
+    Tells first deliveries of Slack events from redeliveries.
+
+    Args:
+        ttl: Seconds a key is remembered
+        max_entries: Maximum number of keys kept in memory
+        path: Optional SQLite file shared by several replicas
+    """
+
+    def __init__(self, ttl: float = DEDUP_TTL, max_entries: int = DEDUP_MAX_ENTRIES, path: str = DEDUP_PATH) -> None:
+        self._memory = MemoryDedupStore(ttl, max_entries)
+        self._shared: Optional[SQLiteDedupStore] = None
+        if path:
+            try:
+                self._shared = SQLiteDedupStore(path, ttl)
+            except sqlite3.Error as e:
+                logger.warning("Shared dedup store %s unavailable, deduplicating in-process only: %s", path, e)
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "duplicates": 0, "memory_hits": 0, "shared_hits": 0, "shared_errors": 0}
+
+    def is_duplicate(self, body: Optional[Dict[str, Any]], event: Dict[str, Any]) -> bool:
+        """
+        Claim an event's keys and report whether it was seen before.
+
+        If the shared store fails, the event is let through (a duplicate
+        answer is better than a lost one).
+        """
+        keys = event_keys(body, event)
+        # Claim every key, so a redelivery matching any one of them is caught
+        claimed_memory = [self._memory.claim(key) for key in keys]
+        duplicate = not all(claimed_memory)
+        source = "memory_hits" if duplicate else None
+
+        if self._shared is not None and keys and not duplicate:
+            try:
+                duplicate = not all([self._shared.claim(key) for key in keys])
+                source = "shared_hits" if duplicate else None
+            except sqlite3.Error as e:
+                logger.warning("Shared dedup store failed: %s", e)
+                with self._lock:
+                    self._stats["shared_errors"] += 1
+
+        with self._lock:
+            self._stats["checked"] += 1
+            if duplicate:
+                self._stats["duplicates"] += 1
+                self._stats[source] += 1
+        if duplicate:
+            logger.info("Skipping redelivered Slack event %s", ", ".join(keys))
+        return duplicate
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counts of checked events, duplicates (by store) and keys held in memory."""
+        with self._lock:
+            return dict(self._stats, memory_keys=len(self._memory), shared=self._shared is not None)
+
+    def prometheus_lines(self, prefix: str = "saiborg") -> List[str]:
+        """Render the dedup counters in Prometheus text format."""
+        stats = self.stats()
+        lines = [
+            f"# HELP {prefix}_events_checked_total Slack events checked for redelivery.",
+            f"# TYPE {prefix}_events_checked_total counter",
+            f"{prefix}_events_checked_total {stats['checked']}",
+            f"# HELP {prefix}_events_duplicate_total Redelivered Slack events skipped, by the store that caught them.",
+            f"# TYPE {prefix}_events_duplicate_total counter",
+        ]
+        lines += [
+            f'{prefix}_events_duplicate_total{{store="{store}"}} {stats[f"{store}_hits"]}'
+            for store in ("memory", "shared")
+        ]
+        return lines
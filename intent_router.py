@@ -0,0 +1,262 @@
+"""Intent routing of Slack messages by phrase, in a single pass.
+
+The phrases of all intents (loaded from intents.json) are compiled into
+one regular expression, shaped as a trie of their characters, that finds
+at every position of a message the longest phrase starting there. Each phrase also implies the shorter
+phrases it contains, so one scan finds every intent with a phrase in the
+message, exactly like checking each phrase on its own, and reports which
+phrase matched it.
+
+Usage:
+    python3 intent_router.py classify "Find kunden Vocast i Monday og skriv en mail"
+    python3 intent_router.py benchmark [--corpus saiborg.log] [--repeat 200]
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Intent definitions: {"intents": [{"name": ..., "phrases": [...]}, ...]}, highest priority first
+INTENTS_PATH = os.getenv(
+    "SAIBORG_INTENTS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "intents.json")
+)
+
+# Prefix of the bot's log line for every mention (see app.process_mention)
+_LOG_MARKER = "Received message: "
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """
+    Regex matching any of the phrases, with common prefixes factored out
+    (e.g. "m(?:onday(?: test)?|ødeforberedelse)"), so that each position
+    of the text is tested once per character instead of once per phrase.
+    The longest phrase at a position wins.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional, so a longer phrase is preferred over this one
+            return ("(?:" + body + ")?") if len(branches) == 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+def _straddles(owners: Dict[str, List[str]]) -> bool:
+    """
+    True if a phrase can start inside another one and end after it (the
+    end of one is the start of the other) while adding an intent. Only
+    then do matches have to overlap for the scan to find every intent.
+    """
+    for phrase in owners:
+        for i in range(1, len(phrase)):
+            tail = phrase[i:]
+            for other in owners:
+                if len(other) > len(tail) and other.startswith(tail) and set(owners[other]) - set(owners[phrase]):
+                    return True
+    return False
+
+
+class IntentMatch:
+    """The first phrase of an intent found in a message, and where it starts."""
+
+    __slots__ = ("intent", "phrase", "start")
+
+    def __init__(self, intent: str, phrase: str, start: int) -> None:
+        self.intent = intent
+        self.phrase = phrase
+        self.start = start
+
+    def __repr__(self) -> str:
+        return f"IntentMatch({self.intent!r}, {self.phrase!r}, {self.start})"
+
+
+class IntentRouter:
+    """
+    Classifies messages by the phrases of a set of intents.
+
+    Matching is case-insensitive substring matching, like `phrase in
+    text.lower()`. Any set of intents can be plugged in (see from_file).
+
+    Args:
+        intents: (name, phrases) pairs in priority order (highest first)
+    """
+
+    def __init__(self, intents: Iterable[Tuple[str, Sequence[str]]]) -> None:
+        self.intents: List[str] = []
+        owners: Dict[str, List[str]] = {}
+        for name, phrases in intents:
+            self.intents.append(name)
+            for phrase in phrases:
+                phrase = phrase.strip().lower()
+                if phrase and name not in owners.setdefault(phrase, []):
+                    owners[phrase].append(name)
+
+        # A match of a phrase is also a match of every phrase it contains (at that offset)
+        self._hits: Dict[str, List[Tuple[str, str, int]]] = {
+            phrase: [(name, other, phrase.find(other)) for other in owners if other in phrase for name in owners[other]]
+            for phrase in owners
+        }
+        self._pattern: Optional[Pattern[str]] = None
+        if owners:
+            pattern = f"({_trie_regex(owners)})"
+            if _straddles(owners):
+                # Let matches overlap, so every start position is tried (about half as fast)
+                pattern = f"(?={pattern})"
+            self._pattern = re.compile(pattern)
+
+    @classmethod
+    def from_file(cls, path: str = INTENTS_PATH) -> "IntentRouter":
+        """Load the intents from a JSON file (see intents.json)."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        router = cls((intent["name"], intent.get("phrases") or []) for intent in data["intents"])
+        logger.info("Loaded %d intents from %s", len(router.intents), path)
+        return router
+
+    def matches(self, text: str) -> Dict[str, IntentMatch]:
+        """Return every intent with a phrase in the text, with its first matching phrase."""
+        found: Dict[str, IntentMatch] = {}
+        if self._pattern is None:
+            return found
+        for m in self._pattern.finditer(text.lower()):
+            for name, phrase, offset in self._hits[m.group(1)]:
+                if name not in found:
+                    found[name] = IntentMatch(name, phrase, m.start() + offset)
+        return found
+
+    def classify(self, text: str) -> Optional[IntentMatch]:
+        """Return the match of the highest-priority intent in the text, if any."""
+        found = self.matches(text)
+        for name in self.intents:
+            if name in found:
+                return found[name]
+        return None
+
+
+def describe(found: Dict[str, IntentMatch]) -> str:
+    """Render matched intents for logging, e.g. "crm ('monday'), overview ('alle leads')"."""
+    return ", ".join(f"{m.intent} ({m.phrase!r})" for m in found.values()) or "none"
+
+
+# Stand-in corpus for the benchmark when no recording is given
+SAMPLE_MESSAGES = [
+    "Hvad er vores returpolitik?",
+    "Hvad koster produkt X?",
+    "Find kunden Vocast i Monday",
+    "Hvilke leads har vi i Monday?",
+    "Find kunden X i Monday og skriv en mail hvor jeg følger op",
+    "Lav en opfølgningsmail for leadet Y",
+    "Forbered møde med kunden X i morgen",
+    "Mødeforberedelse til salgsmødet med firma Y",
+    "Hvad er næste skridt for kunden X i Monday?",
+    "Hvad bør jeg gøre nu med leadet Y?",
+    "Hvad siger vores rabatpolitik om kunden Vocast i Monday?",
+    "monday test",
+    "Kan du opsummere vores onboarding-procedure for nye medarbejdere, så jeg kan sende den videre?",
+    "Giv mig et overblik over kunder i CRM, der ikke har fået svar i denne uge",
+]
+
+
+def load_corpus(path: str) -> List[str]:
+    """Read messages from a file: one per line, or the mentions logged in a bot log."""
+    messages = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if _LOG_MARKER in line:
+                line = line.split(_LOG_MARKER, 1)[1]
+            elif " - INFO - " in line or " - WARNING - " in line or " - ERROR - " in line:
+                continue
+            line = line.strip()
+            if line:
+                messages.append(line)
+    return messages
+
+
+def run_benchmark(router: IntentRouter, phrases: Dict[str, List[str]], messages: List[str], repeat: int = 200) -> Dict[str, Any]:
+    """
+    Time classifying a corpus with one scan per intent (the old path) and
+    with the router, after checking that both find the same intents.
+
+    Returns:
+        messages, scans_us and router_us (microseconds per message)
+    """
+    def scan(text: str) -> List[str]:
+        lower = text.lower()
+        return [name for name, intent_phrases in phrases.items() if any(p in lower for p in intent_phrases)]
+
+    for text in messages:
+        assert set(scan(text)) == set(router.matches(text)), text
+
+    def per_message_us(fn: Any) -> float:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for text in messages:
+                fn(text)
+        return (time.perf_counter() - started) * 1e6 / (repeat * len(messages))
+
+    return {
+        "messages": len(messages),
+        "scans_us": per_message_us(scan),
+        "router_us": per_message_us(router.matches),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point for classifying messages and benchmarking the router."""
+    parser = argparse.ArgumentParser(description="Single-pass intent router for Slack messages")
+    parser.add_argument("--intents", default=INTENTS_PATH, help="Intent definitions (JSON)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    classify_cmd = sub.add_parser("classify", help="Show the intents found in messages")
+    classify_cmd.add_argument("messages", nargs="+")
+
+    bench_cmd = sub.add_parser("benchmark", help="Compare per-intent phrase scans with the router")
+    bench_cmd.add_argument("--corpus", help="Messages, one per line, or a Saiborg log (default: built-in sample)")
+    bench_cmd.add_argument("--repeat", type=int, default=200)
+
+    args = parser.parse_args(argv)
+    router = IntentRouter.from_file(args.intents)
+
+    if args.command == "classify":
+        for text in args.messages:
+            best = router.classify(text)
+            print(f"{best.intent if best else '-':<15} {describe(router.matches(text))}  <- {text}")
+    elif args.command == "benchmark":
+        with open(args.intents, encoding="utf-8") as f:
+            phrases = {intent["name"]: [p.lower() for p in intent.get("phrases") or []] for intent in json.load(f)["intents"]}
+        messages = load_corpus(args.corpus) if args.corpus else SAMPLE_MESSAGES
+        if not messages:
+            print("No messages in corpus.", file=sys.stderr)
+            return 1
+        row = run_benchmark(router, phrases, messages, args.repeat)
+        print(f"{'messages':>8}  {'scans µs':>9}  {'router µs':>9}  {'speedup':>7}")
+        print(
+            f"{row['messages']:>8}  {row['scans_us']:>9.2f}  {row['router_us']:>9.2f}"
+            f"  {row['scans_us'] / row['router_us']:>6.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,657 @@
+"""Asyncio-native Monday.com client, alongside the blocking API in monday_client.
+
+Uses one pooled aiohttp session per event loop and shares queries, the
+complexity budget, the board snapshot cache and the search helpers with
+monday_client, so both APIs behave the same:
+
+- RuntimeError if the API key is missing or Monday returns errors
+- ComplexityBudgetExceeded if a call is shed to stay within the budget
+- MondayUnavailableError while the shared circuit breaker is open
+- aiohttp.ClientError if the HTTP request fails after retries
+"""
+import time
+import asyncio
+import logging
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+import monday_client
+import monday_metrics
+from monday_client import (
+    FIRST_PAGE_QUERY,
+    MULTI_FIRST_PAGE_FIELD,
+    MULTI_NEXT_PAGE_FIELD,
+    NEXT_PAGE_QUERY,
+    PROJECTED_FIRST_PAGE_QUERY,
+    PROJECTED_NEXT_PAGE_QUERY,
+    ComplexityBudgetExceeded,
+    SearchResults,
+    build_search_query_params,
+    project_item,
+    rank_results,
+    tag_item,
+    with_complexity,
+)
+from monday_json import loads
+from monday_resilience import RETRYABLE_STATUSES, backoff_delay, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Keyed by the loop itself, not id(loop), which a later loop could reuse
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def _drop_dead_sessions() -> None:
+    """
+    Forget the sessions of event loops that were closed without aclose().
+
+    Nothing can be awaited on a closed loop, so such a session is detached
+    rather than closed; its sockets are released once it is collected, and
+    aiohttp reports the connector as unclosed. Call aclose() before a loop
+    ends to avoid that.
+    """
+    for loop in [loop for loop in list(_sessions) if loop.is_closed()]:
+        session = _sessions.pop(loop, None)
+        if session is not None:
+            session.detach()
+            logger.debug("Dropped the Monday session of a closed event loop")
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the pooled keep-alive session for the running event loop.
+
+    aiohttp sessions are bound to the loop they were created on, so one is
+    kept per loop; the connector is sized by MONDAY_POOL_SIZE like the
+    sync client.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        _drop_dead_sessions()
+        connector = aiohttp.TCPConnector(limit=monday_client.POOL_SIZE, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=monday_client.CONNECT_TIMEOUT,
+            sock_read=monday_client.READ_TIMEOUT,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Content-Type": "application/json"},
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def aclose() -> None:
+    """Close the session of the running event loop (call on shutdown)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def _acall_monday(query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Async counterpart of monday_client._call_monday.
+
+    Args:
+        query: GraphQL query string
+        variables: Optional variables dictionary for the query
+
+    Returns:
+        The 'data' field from the API response
+
+    Shares the circuit breaker and retry settings of the sync client:
+    timeouts, connection errors, 429 and 5xx are retried with jittered
+    exponential backoff (honouring Retry-After).
+
+    Raises:
+        RuntimeError: If API key is missing or API returns errors
+        ComplexityBudgetExceeded: If the call was shed to stay within Monday's budget
+        MondayUnavailableError: If the circuit breaker is open
+        aiohttp.ClientError: If the HTTP request fails after retries
+    """
+    with monday_metrics.track_call(monday_client._operation_name(query)) as call:
+        result = await _aexecute_with_retries(query, variables, call)
+        call.items = monday_metrics.count_items(result)
+        return result
+
+
+async def _aexecute_with_retries(
+    query: str,
+    variables: Optional[Dict[str, Any]],
+    call: monday_metrics.CallRecord,
+) -> Optional[Dict[str, Any]]:
+    """The breaker and retry loop of _acall_monday."""
+    if not monday_client.MONDAY_API_KEY:
+        # A configuration error says nothing about Monday's health, so it stays out of the breaker
+        raise RuntimeError("MONDAY_API_KEY is missing in .env")
+    breaker = monday_client._breaker
+    breaker.before_call()
+    started = time.monotonic()
+    deadline = monday_client._retry_deadline.set(started + monday_client.RETRY_MAX_ELAPSED)
+    attempt = 0
+    try:
+        while True:
+            call.attempts = attempt + 1
+            try:
+                result = await _asend_monday(query, variables)
+            except ComplexityBudgetExceeded:
+                breaker.release_probe()
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = e.status if isinstance(e, aiohttp.ClientResponseError) else None
+                if status is not None and status not in RETRYABLE_STATUSES:
+                    breaker.record_success()
+                    raise
+
+                if attempt < monday_client.MAX_RETRIES:
+                    headers = getattr(e, "headers", None) or {}
+                    delay = backoff_delay(
+                        attempt,
+                        monday_client.RETRY_BASE_DELAY,
+                        monday_client.RETRY_MAX_DELAY,
+                        parse_retry_after(headers.get("Retry-After")),
+                    )
+                    if time.monotonic() - started + delay <= monday_client.RETRY_MAX_ELAPSED:
+                        attempt += 1
+                        logger.warning(
+                            "Monday call failed (%s), retry %d/%d in %.2f s",
+                            e, attempt, monday_client.MAX_RETRIES, delay,
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+
+                breaker.record_failure()
+                raise
+            except RuntimeError:
+                breaker.record_success()
+                raise
+            except BaseException:
+                breaker.release_probe()
+                raise
+
+            breaker.record_success()
+            return result
+    finally:
+        monday_client._retry_deadline.reset(deadline)
+
+
+async def _areserve(budget: Any, operation: str) -> int:
+    """
+    Reserve complexity budget for one call without blocking the event loop.
+
+    The wait for the budget window runs in a thread, which cannot be
+    interrupted: if the caller is cancelled meanwhile (e.g. on the hybrid
+    deadline), the reservation the thread still takes is released as soon
+    as it has it, so the budget does not leak.
+    """
+    acquire = asyncio.ensure_future(asyncio.to_thread(budget.acquire, operation))
+    try:
+        return await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        def refund(done: "asyncio.Future[int]") -> None:
+            if not done.cancelled() and done.exception() is None and done.result():
+                budget.release(done.result())
+
+        acquire.add_done_callback(refund)
+        raise
+
+
+async def _asend_monday(query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Send exactly one GraphQL request to Monday (see _acall_monday)."""
+    budget = monday_client._budget
+    operation = monday_client._operation_name(query)
+    payload = {
+        "query": with_complexity(query) if budget is not None or monday_metrics.enabled() else query,
+        "variables": variables or {},
+    }
+
+    reserved = await _areserve(budget, operation) if budget is not None else 0
+    try:
+        async with _get_session().post(
+            monday_client.MONDAY_API_URL,
+            json=payload,
+            headers={"Authorization": monday_client.MONDAY_API_KEY},
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=monday_client.CONNECT_TIMEOUT,
+                sock_read=monday_client._read_timeout(),
+            ),
+        ) as resp:
+            if resp.status == 429:
+                monday_client._note_complexity_error(await resp.text())
+            resp.raise_for_status()
+            body = await resp.read()
+            data = loads(body)
+
+        result = data.get("data") or None
+        complexity = result.pop("complexity", None) if isinstance(result, dict) else None
+        if budget is not None:
+            budget.observe(operation, reserved, complexity)
+            reserved = 0
+        call = monday_metrics.current_call()
+        if call is not None:
+            call.note_response(len(body), complexity)
+
+        if "errors" in data:
+            monday_client._note_complexity_error(data["errors"])
+            error_msg = f"Monday API error: {data['errors']}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        return result
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error("Request to Monday API failed: %s", e)
+        raise
+    finally:
+        if budget is not None and reserved:
+            budget.release(reserved)
+
+
+async def aiter_item_pages(
+    board_id: int,
+    page_size: int = monday_client.PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the items of a board one page at a time, following the cursor.
+
+    The request for the next page is started before the current page is
+    handed to the caller, so processing a page overlaps with downloading
+    the next one.
+
+    Yields:
+        Lists of item dictionaries, each containing id, name, and column_values
+    """
+    first_query, next_query = FIRST_PAGE_QUERY, NEXT_PAGE_QUERY
+    extra: Dict[str, Any] = {}
+    if columns is not None:
+        first_query, next_query = PROJECTED_FIRST_PAGE_QUERY, PROJECTED_NEXT_PAGE_QUERY
+        extra["columns"] = list(columns)
+
+    variables: Dict[str, Any] = {"board_id": [board_id], "limit": page_size, **extra}
+    if query_params:
+        variables["query_params"] = query_params
+    data = await _acall_monday(first_query, variables=variables)
+    boards = (data or {}).get("boards") or []
+    if not boards:
+        logger.warning("No boards found for board_id: %d", board_id)
+        return
+
+    page = boards[0].get("items_page") or {}
+    while True:
+        cursor = page.get("cursor")
+        next_page: Optional[asyncio.Task] = None
+        if cursor:
+            next_page = asyncio.ensure_future(
+                _acall_monday(next_query, variables={"cursor": cursor, "limit": page_size, **extra})
+            )
+        try:
+            items = page.get("items") or []
+            if items:
+                yield items
+            if next_page is None:
+                return
+            data = await next_page
+        finally:
+            # The caller stopped early (or failed): don't leave the prefetch running
+            if next_page is not None:
+                next_page.cancel()
+        page = (data or {}).get("next_items_page") or {}
+
+
+async def aiter_items(
+    board_id: int,
+    page_size: int = monday_client.PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every item on a board, fetching pages lazily (and one page ahead)."""
+    async for page in aiter_item_pages(board_id, page_size=page_size, query_params=query_params, columns=columns):
+        for item in page:
+            yield item
+
+
+async def aget_all_items(
+    board_id: int,
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of monday_client.get_all_items.
+
+    A snapshot already in the shared cache is served without I/O (stale
+    ones are refreshed in the background by the cache); otherwise the board
+    is downloaded asynchronously and cached.
+
+    Raises:
+        RuntimeError: If API call fails
+    """
+    try:
+        cache = monday_client._snapshot_cache
+        if use_cache and cache.enabled:
+            cached = cache.peek(monday_client._snapshot_key(board_id)) if columns is not None else None
+            if cached is None:
+                # An empty snapshot (a board without items) is a hit too
+                cached = cache.peek(monday_client._snapshot_key(board_id, columns))
+            if cached is not None:
+                # Non-blocking now: the snapshot exists, get_all_items only schedules refreshes
+                return monday_client.get_all_items(board_id, limit=limit, columns=columns)
+
+        page_size = min(limit, monday_client.PAGE_SIZE) if limit else monday_client.PAGE_SIZE
+        items: List[Dict[str, Any]] = []
+        async for page in aiter_item_pages(board_id, page_size=page_size, columns=columns):
+            items.extend(page)
+            if limit is not None and len(items) >= limit:
+                break
+
+        if use_cache and limit is None:
+            monday_client.store_snapshot(board_id, items, columns)
+        logger.info("Fetched %d items from board %d", len(items), board_id)
+        return list(islice(items, limit))
+    except Exception as e:
+        logger.error("Failed to get items from board %d: %s", board_id, e)
+        raise
+
+
+async def aget_many_boards(
+    board_ids: Sequence[int],
+    columns: Optional[List[str]] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Fetch several boards concurrently.
+
+    Returns:
+        Dictionary mapping board ID to its items
+
+    Raises:
+        RuntimeError: If any board fails to load
+    """
+    results = await asyncio.gather(*(aget_all_items(board_id, columns=columns) for board_id in board_ids))
+    return dict(zip(board_ids, results))
+
+
+async def aiter_multi_board_pages(
+    board_ids: Sequence[int],
+    page_size: int = monday_client.PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Async counterpart of monday_client.iter_multi_board_pages: one aliased
+    query per page round for all boards, and the board names are learned
+    from the first round.
+
+    Yields:
+        (board_id, items) tuples; use tag_item() to label items with their board
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    if not board_ids:
+        return
+
+    extra: Dict[str, Any] = {"limit": page_size}
+    if columns is not None:
+        extra["columns"] = list(columns)
+
+    indexes = list(range(len(board_ids)))
+    variables: Dict[str, Any] = dict(extra, **{f"b{i}": [board_ids[i]] for i in indexes})
+    if query_params:
+        variables["query_params"] = query_params
+    query = monday_client._multi_board_query(
+        "MultiBoardFirstPage", MULTI_FIRST_PAGE_FIELD, "$b%(index)d: [ID!]!", indexes, columns
+    )
+    data = await _acall_monday(query, variables=variables) or {}
+
+    cursors: Dict[int, str] = {}
+    for i in indexes:
+        boards = data.get(f"b{i}") or []
+        if not boards:
+            logger.warning("No boards found for board_id: %d", board_ids[i])
+            continue
+        if boards[0].get("name"):
+            monday_client._board_names[board_ids[i]] = boards[0]["name"]
+        page = boards[0].get("items_page") or {}
+        if page.get("items"):
+            yield board_ids[i], page["items"]
+        if page.get("cursor"):
+            cursors[i] = page["cursor"]
+
+    while cursors:
+        indexes = sorted(cursors)
+        variables = dict(extra, **{f"c{i}": cursors[i] for i in indexes})
+        query = monday_client._multi_board_query(
+            "MultiBoardNextPage", MULTI_NEXT_PAGE_FIELD, "$c%(index)d: String!", indexes, columns
+        )
+        data = await _acall_monday(query, variables=variables) or {}
+
+        cursors = {}
+        for i in indexes:
+            page = data.get(f"p{i}") or {}
+            if page.get("items"):
+                yield board_ids[i], page["items"]
+            if page.get("cursor"):
+                cursors[i] = page["cursor"]
+
+
+async def aget_all_items_multi(
+    board_ids: Sequence[int],
+    use_cache: bool = True,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of monday_client.get_all_items_multi: cached boards
+    are served from the cache, all others are downloaded together (see
+    aiter_multi_board_pages) and cached per board.
+
+    Raises:
+        RuntimeError: If API call fails
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    try:
+        by_board: Dict[int, List[Dict[str, Any]]] = {board_id: [] for board_id in board_ids}
+        remote = [b for b in board_ids if not (use_cache and monday_client._is_cached(b, columns))]
+        for board_id in board_ids:
+            if board_id not in remote:
+                by_board[board_id] = await aget_all_items(board_id, columns=columns)
+
+        if remote:
+            async for board_id, page in aiter_multi_board_pages(remote, columns=columns):
+                by_board[board_id].extend(page)
+            if use_cache:
+                for board_id in remote:
+                    monday_client.store_snapshot(board_id, by_board[board_id], columns)
+
+        items = [tag_item(item, board_id) for board_id in board_ids for item in by_board[board_id]]
+        logger.info(
+            "Fetched %d items from %d boards (%d in one multi-board download)",
+            len(items), len(board_ids), len(remote),
+        )
+        return items
+    except Exception as e:
+        logger.error("Failed to get items from boards %s: %s", board_ids, e)
+        raise
+
+
+async def asearch_items_by_text(
+    board_id: int,
+    text: str,
+    columns: Optional[List[str]] = None,
+    fuzzy: bool = True,
+    limit: Optional[int] = None,
+) -> SearchResults:
+    """
+    Async counterpart of monday_client.search_items_by_text, with the same
+    path order: local mirror, cached snapshot, server-side query_params
+    search, then a full client-side scan, and the same ranking, cap and
+    fuzzy fallback.
+
+    Returns:
+        SearchResults with the ranked matches and the total number of matches
+
+    Raises:
+        MondayUnavailableError: If Monday is down (circuit breaker open)
+        RuntimeError: If Monday could not be searched, so callers can tell
+            "no matches" apart from "Monday unavailable"
+    """
+    term = (text or "").strip().lower()
+    if not term:
+        logger.warning("Empty search term provided")
+        return SearchResults()
+
+    try:
+        path = "client"
+        started = time.perf_counter()
+        results = await asyncio.to_thread(monday_client._search_mirror, board_id, term)
+        cache = monday_client._snapshot_cache
+        snapshot = None
+        if results is None and cache.enabled:
+            snapshot = cache.peek(monday_client._snapshot_key(board_id))
+
+        if results is not None:
+            path = "mirror"
+        elif snapshot is not None:
+            results = monday_client._search_client_side(board_id, term)
+            path = "cache"
+        elif monday_client.SEARCH_MODE == "server":
+            fetch_columns = None if columns is None else sorted(set(columns) | set(monday_client.SEARCH_COLUMNS))
+            try:
+                results = [
+                    project_item(item, columns)
+                    async for item in aiter_items(
+                        board_id, query_params=build_search_query_params(term), columns=fetch_columns
+                    )
+                    if monday_client._item_matches(item, term)
+                ]
+                path = "server"
+                if not results:
+                    # Only the name and MONDAY_SEARCH_COLUMNS were searched; scan every column
+                    logger.info("No server-side match for '%s', scanning every column", term)
+                    results = None
+                    path = "client"
+            except ComplexityBudgetExceeded:
+                raise
+            except (RuntimeError, aiohttp.ClientResponseError) as e:
+                if isinstance(e, aiohttp.ClientResponseError) and not monday_client._search_rejected(e):
+                    raise
+                logger.warning("Server-side search failed, falling back to client-side scan: %s", e)
+                started = time.perf_counter()
+
+        if results is None:
+            items = await aget_all_items(board_id)
+            results = [item for item in items if monday_client._item_matches(item, term)]
+
+        results = rank_results(results, term, limit)
+        if path != "server":
+            results[:] = [project_item(item, columns) for item in results]
+
+        if not results and fuzzy and monday_client.FUZZY_ENABLED:
+            results = SearchResults(
+                await asyncio.to_thread(monday_client.fuzzy_search_items, board_id, term, columns=columns)
+            )
+            path = "fuzzy"
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        monday_client._record_search(path, elapsed_ms)
+        logger.info(
+            "Found %d matching items for search term '%s' (path=%s, %.1f ms, %d returned)",
+            results.total, term, path, elapsed_ms, len(results),
+        )
+        return results
+    except Exception as e:
+        logger.error("Failed to search items: %s", e)
+        raise
+
+
+async def asearch_items_multi(
+    board_ids: Sequence[int],
+    text: str,
+    columns: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> SearchResults:
+    """
+    Async counterpart of monday_client.search_items_multi, with the same
+    paths: boards held locally are searched without API calls, the others
+    server-side together in one aliased query per page round (falling back
+    to one multi-board download scanned on every column), then ranked and
+    capped together; without exact matches, the closest names across the
+    boards held locally (see monday_client.fuzzy_search_items_multi).
+
+    Raises:
+        MondayUnavailableError: If Monday is down (circuit breaker open)
+        RuntimeError: If Monday could not be searched
+    """
+    term = (text or "").strip().lower()
+    board_ids = list(dict.fromkeys(board_ids))
+    if not term or not board_ids:
+        logger.warning("Empty search term or board list provided")
+        return SearchResults()
+
+    try:
+        by_board: Dict[int, List[Dict[str, Any]]] = {}
+        remote = []
+        for board_id in board_ids:
+            if monday_client._is_cached(board_id) or await asyncio.to_thread(monday_client._mirror_ready, board_id):
+                by_board[board_id] = await asearch_items_by_text(board_id, term, columns=columns, fuzzy=False, limit=0)
+            else:
+                remote.append(board_id)
+
+        if remote:
+            path = "client"
+            started = time.perf_counter()
+            matches: Optional[Dict[int, List[Dict[str, Any]]]] = None
+            if monday_client.SEARCH_MODE == "server":
+                fetch_columns = None if columns is None else sorted(set(columns) | set(monday_client.SEARCH_COLUMNS))
+                try:
+                    matches = {board_id: [] for board_id in remote}
+                    pages = aiter_multi_board_pages(
+                        remote, query_params=build_search_query_params(term), columns=fetch_columns
+                    )
+                    async for board_id, page in pages:
+                        matches[board_id].extend(
+                            project_item(item, columns) for item in page if monday_client._item_matches(item, term)
+                        )
+                    path = "server"
+                    if not any(matches.values()):
+                        logger.info("No server-side match for '%s', scanning every column", term)
+                        matches = None
+                        path = "client"
+                    elif monday_client._snapshot_cache.enabled:
+                        monday_client._prefetch_multi(remote)
+                except ComplexityBudgetExceeded:
+                    raise
+                except (RuntimeError, aiohttp.ClientResponseError) as e:
+                    if isinstance(e, aiohttp.ClientResponseError) and not monday_client._search_rejected(e):
+                        raise
+                    logger.warning("Server-side multi-board search failed, falling back to client-side scan: %s", e)
+                    matches = None
+                    started = time.perf_counter()
+
+            if matches is None:
+                matches = {board_id: [] for board_id in remote}
+                for item in await aget_all_items_multi(remote):
+                    if monday_client._item_matches(item, term):
+                        matches[item["board_id"]].append(project_item(item, columns))
+
+            by_board.update(matches)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            monday_client._record_search(path, elapsed_ms)
+            logger.info(
+                "Searched %d boards in one multi-board query for '%s' (path=%s, %.1f ms)",
+                len(remote), term, path, elapsed_ms,
+            )
+
+        results = rank_results(
+            [tag_item(item, board_id) for board_id in board_ids for item in by_board[board_id]], term, limit
+        )
+        if not results and monday_client.FUZZY_ENABLED:
+            results = SearchResults(
+                await asyncio.to_thread(monday_client.fuzzy_search_items_multi, board_ids, term, columns=columns)
+            )
+        return results
+    except Exception as e:
+        logger.error("Failed to search items on boards %s: %s", board_ids, e)
+        raise
@@ -0,0 +1,287 @@
+"""Checks for the asyncio Monday client against a fake GraphQL server.
+
+A small HTTP server on 127.0.0.1 answers the board page queries of
+monday_client (items_page / next_items_page, following the cursor) and
+can be told to fail, so no API key or network access is needed. Covers
+pagination and column projection, the server-side search, multi-board
+loads and searches in one aliased query, retries on 429, GraphQL errors,
+cancelling the next-page prefetch when the caller stops early, handing
+back a complexity reservation taken after the caller was cancelled, and
+dropping the sessions of closed event loops.
+
+Usage:
+    python3 monday_async_test.py
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# The client reads its settings at import: no cache, mirror or complexity budget, fast retries
+os.environ.update(
+    MONDAY_API_KEY="test-key",
+    MONDAY_CACHE_TTL="0",
+    MONDAY_MIRROR_ENABLED="false",
+    MONDAY_RATE_LIMIT_ENABLED="false",
+    MONDAY_RETRY_BASE_DELAY="0.01",
+    MONDAY_SEARCH_COLUMNS="company",
+)
+
+import monday_client
+import monday_async
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ITEMS = [
+    {"id": str(i), "name": name, "updated_at": "2026-01-01T10:00:00Z",
+     "column_values": [{"id": "company", "text": company}, {"id": "status", "text": "Lead"}]}
+    for i, (name, company) in enumerate([
+        ("Vocast ApS", "Vocast"), ("Firma B", "B Holding"), ("Firma C", "Vocast Group"),
+        ("Firma D", "D A/S"), ("Firma E", "E ApS"),
+    ], start=1)
+]
+
+
+class FakeMonday(ThreadingHTTPServer):
+    """Serves ITEMS as board 1; `failures` holds HTTP statuses to answer the next requests with."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeMondayHandler)
+        self.requests: List[Dict[str, Any]] = []
+        self.failures: List[int] = []
+        self.next_page_delay = 0.0
+        self.lock = threading.Lock()
+
+    def page(self, offset: int, limit: int, variables: Dict[str, Any]) -> Dict[str, Any]:
+        items = ITEMS
+        rules = (variables.get("query_params") or {}).get("rules") or []
+        if rules:
+            items = [item for item in items if any(self._matches(item, rule) for rule in rules)]
+        cursor = f"{offset + limit}" if offset + limit < len(items) else None
+        page = [dict(item) for item in items[offset:offset + limit]]
+        if variables.get("columns") is not None:
+            for item in page:
+                item["column_values"] = [cv for cv in item["column_values"] if cv["id"] in variables["columns"]]
+        return {"cursor": cursor, "items": page}
+
+    @staticmethod
+    def _matches(item: Dict[str, Any], rule: Dict[str, Any]) -> bool:
+        term = rule["compare_value"][0].lower()
+        if rule["column_id"] == "name":
+            return term in item["name"].lower()
+        return any(cv["id"] == rule["column_id"] and term in (cv["text"] or "").lower() for cv in item["column_values"])
+
+
+class FakeMondayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeMonday
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        query, variables = body["query"], body.get("variables") or {}
+        with self.server.lock:
+            self.server.requests.append(body)
+            failure = self.server.failures.pop(0) if self.server.failures else None
+
+        if self.headers.get("Authorization") != "test-key":
+            self._reply(401, {"error_message": "Not Authenticated"})
+        elif failure is not None:
+            self._reply(failure, {"error_message": "Rate limit"}, {"Retry-After": "0"})
+        elif "MultiBoardFirstPage" in query:
+            boards = {
+                f"b{i}": [{"id": "1", "name": "Leads", "items_page": self.server.page(0, variables["limit"], variables)}]
+                if variables[f"b{i}"] == [1] else []
+                for i in range(len(variables)) if f"b{i}" in variables
+            }
+            self._reply(200, {"data": boards})
+        elif "MultiBoardNextPage" in query:
+            pages = {
+                f"p{i}": self.server.page(int(variables[f"c{i}"]), variables["limit"], variables)
+                for i in range(len(variables)) if f"c{i}" in variables
+            }
+            self._reply(200, {"data": pages})
+        elif "next_items_page" in query:
+            time.sleep(self.server.next_page_delay)
+            page = self.server.page(int(variables["cursor"]), variables["limit"], variables)
+            self._reply(200, {"data": {"next_items_page": page}})
+        elif "items_page" in query:
+            if variables["board_id"] != [1]:
+                self._reply(200, {"data": {"boards": []}})
+                return
+            page = self.server.page(0, variables["limit"], variables)
+            self._reply(200, {"data": {"boards": [{"items_page": page}]}})
+        elif "me" in query:
+            self._reply(200, {"data": {"me": {"name": "Test", "email": "test@example.com"}}})
+        else:
+            self._reply(200, {"errors": [{"message": "Unknown query"}]})
+
+
+async def check_pagination(fake: FakeMonday) -> None:
+    pages = [page async for page in monday_async.aiter_item_pages(1, page_size=2)]
+    assert [len(page) for page in pages] == [2, 2, 1], pages
+    assert [item["id"] for page in pages for item in page] == ["1", "2", "3", "4", "5"]
+
+    items = await monday_async.aget_all_items(1, columns=["status"])
+    assert len(items) == 5 and all(item["column_values"] == [{"id": "status", "text": "Lead"}] for item in items)
+    assert fake.requests[-1]["variables"]["columns"] == ["status"]
+    assert await monday_async.aget_all_items(2) == []
+
+
+async def check_search(fake: FakeMonday) -> None:
+    results = await monday_async.asearch_items_by_text(1, "vocast", fuzzy=False)
+    assert [item["id"] for item in results] == ["1", "3"], results
+    rules = fake.requests[-1]["variables"]["query_params"]["rules"]
+    assert [rule["column_id"] for rule in rules] == ["name", "company"], rules
+
+    # A search Monday rejects (e.g. a rule on a column type it cannot filter) falls back to a scan
+    fake.failures[:] = [400]
+    results = await monday_async.asearch_items_by_text(1, "vocast", fuzzy=False)
+    assert [item["id"] for item in results] == ["1", "3"], results
+    assert "query_params" not in fake.requests[-1]["variables"]
+
+    # Status is not searched server-side, so nothing comes back and the whole board is scanned
+    before = len(fake.requests)
+    results = await monday_async.asearch_items_by_text(1, "lead", fuzzy=False, limit=0)
+    assert results.total == 5, results.total
+    assert "query_params" not in fake.requests[-1]["variables"] and len(fake.requests) > before + 1
+
+
+async def check_multi_board(fake: FakeMonday) -> None:
+    # Both boards in one aliased query per page round, named from the same response
+    before = len(fake.requests)
+    items = await monday_async.aget_all_items_multi([1, 2])
+    assert len(items) == 5 and all(item["board_id"] == 1 and item["board_name"] == "Leads" for item in items)
+    assert ["MultiBoardFirstPage" in request["query"] for request in fake.requests[before:]] == [True]
+
+    pages = [page async for page in monday_async.aiter_multi_board_pages([1, 2], page_size=2)]
+    assert [(board_id, len(page)) for board_id, page in pages] == [(1, 2), (1, 2), (1, 1)], pages
+
+    before = len(fake.requests)
+    results = await monday_async.asearch_items_multi([1, 2], "vocast")
+    assert [(item["id"], item["board_name"]) for item in results] == [("1", "Leads"), ("3", "Leads")], results
+    assert len(fake.requests) == before + 1 and "query_params" in fake.requests[-1]["variables"]
+
+
+async def check_retries(fake: FakeMonday) -> None:
+    fake.failures[:] = [429, 503]
+    before = len(fake.requests)
+    data = await monday_async._acall_monday("query { me { name email } }")
+    assert data == {"me": {"name": "Test", "email": "test@example.com"}}
+    assert len(fake.requests) == before + 3
+
+    try:
+        await monday_async._acall_monday("query { unknown }")
+    except RuntimeError as e:
+        assert "Unknown query" in str(e)
+    else:
+        raise AssertionError("GraphQL errors did not raise")
+
+
+async def check_early_stop(fake: FakeMonday) -> None:
+    fake.next_page_delay = 1.0
+    try:
+        pages = monday_async.aiter_item_pages(1, page_size=2)
+        first = await pages.__anext__()
+        assert len(first) == 2
+        await pages.aclose()
+        # The next page was being fetched; closing the iterator must cancel that request
+        await asyncio.sleep(0)
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        assert not others, others
+    finally:
+        fake.next_page_delay = 0.0
+
+
+async def check_cancelled_reservation() -> None:
+    class SlowBudget:
+        def __init__(self) -> None:
+            self.released: List[int] = []
+
+        def acquire(self, operation: str) -> int:
+            time.sleep(0.2)
+            return 7
+
+        def release(self, reserved: int) -> None:
+            self.released.append(reserved)
+
+    # Cancelled while the budget thread waits: the reservation it then takes is handed back
+    budget = SlowBudget()
+    reserve = asyncio.ensure_future(monday_async._areserve(budget, "BoardFirstPage"))
+    await asyncio.sleep(0.05)
+    reserve.cancel()
+    try:
+        await reserve
+    except asyncio.CancelledError:
+        pass
+    await asyncio.sleep(0.3)
+    assert budget.released == [7], budget.released
+
+
+def check_sessions() -> None:
+    async def call() -> None:
+        await monday_async._acall_monday("query { me { name email } }")
+
+    # A loop that ends without aclose() leaves its session registered until the next one is created
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(call())
+    assert list(monday_async._sessions) == [loop]
+    # Free its sockets while the loop still runs, so only the registration is left behind
+    loop.run_until_complete(monday_async._sessions[loop].close())
+    loop.close()
+
+    async def call_and_close() -> None:
+        await call()
+        assert list(monday_async._sessions) == [asyncio.get_running_loop()]
+        await monday_async.aclose()
+
+    asyncio.run(call_and_close())
+    assert not monday_async._sessions
+
+
+async def run_checks(fake: FakeMonday) -> None:
+    try:
+        await check_pagination(fake)
+        await check_search(fake)
+        await check_multi_board(fake)
+        await check_retries(fake)
+        await check_early_stop(fake)
+        await check_cancelled_reservation()
+    finally:
+        await monday_async.aclose()
+
+
+if __name__ == "__main__":
+    fake = FakeMonday()
+    threading.Thread(target=fake.serve_forever, name="fake-monday", daemon=True).start()
+    monday_client.MONDAY_API_URL = f"http://127.0.0.1:{fake.server_address[1]}/"
+    try:
+        asyncio.run(run_checks(fake))
+        check_sessions()
+        logger.info("✅ All async client checks passed")
+    except AssertionError as e:
+        logger.exception("❌ FAILED: %s", e)
+        sys.exit(1)
+    finally:
+        fake.shutdown()
+        fake.server_close()
@@ -0,0 +1,350 @@
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Roughly estimate the memory footprint of a board snapshot in bytes.
+
+    Walks nested dicts, lists and tuples (the shape of Monday API responses)
+    and adds up sys.getsizeof for every container and leaf value.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple)):
+            stack.extend(current)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "size", "extra")
+
+    def __init__(self, value: Any, size: int, extra: int = 0) -> None:
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.size = size
+        # Bytes of derived data kept alongside the value (e.g. a search index)
+        self.extra = extra
+
+
+class BoardSnapshotCache:
+    """
+    In-process TTL cache for board snapshots with stale-while-revalidate.
+
+    - Fresh entries (younger than ttl) are returned directly.
+    - Stale entries are returned immediately while a background thread
+      reloads them.
+    - Concurrent misses for the same key share a single load.
+    - Entries are evicted least-recently-used once the estimated total
+      size (including bytes charged for derived data) exceeds max_bytes;
+      on_evict is then called with the evicted key.
+    - on_store is called with the key and the new value whenever an entry
+      is loaded, stored or updated, e.g. to refresh data derived from it.
+    - invalidate() drops entries like an eviction (on_evict is called), and
+      a load that was already running for an invalidated key does not store
+      its result, which may predate the invalidation.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int,
+        size_fn: Callable[[Any], int] = estimate_size,
+        on_evict: Optional[Callable[[Hashable], None]] = None,
+        on_store: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size_fn = size_fn
+        self._on_evict = on_evict
+        self._on_store = on_store
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        # Bumped by invalidate(); a load only stores its value if the generation is unchanged
+        self._generations: Dict[Hashable, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "shared_loads": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, loading it with loader() on a miss.
+
+        Raises:
+            Whatever loader() raises when there is no cached value to fall back on
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if time.monotonic() - entry.fetched_at < self.ttl:
+                    self._stats["hits"] += 1
+                else:
+                    self._stats["stale_hits"] += 1
+                    self._start_refresh_locked(key, loader)
+                return entry.value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = future
+                generation = self._generations.get(key, 0)
+            else:
+                self._stats["shared_loads"] += 1
+
+        if owner:
+            self._load(key, loader, future, generation)
+        return future.result()
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (fresh or stale) without loading, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def prefetch(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        """Load key in the background unless it is already cached or loading."""
+        with self._lock:
+            if key in self._entries or key in self._inflight:
+                return
+            self._start_refresh_locked(key, loader)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value loaded elsewhere (e.g. by the async client) as a fresh entry."""
+        self._store(key, value)
+
+    def charge(self, key: Hashable, extra: int) -> bool:
+        """
+        Account `extra` bytes of data derived from an entry (replacing any
+        earlier charge), evicting other entries if the cache is now too big.
+
+        Returns:
+            True if the entry exists and was charged
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._total_bytes += extra - entry.extra
+            entry.extra = extra
+            evicted = self._evict_locked(keep=key)
+        self._notify_evicted(evicted)
+        return True
+
+    def keys(self, loading: bool = False) -> List[Hashable]:
+        """Return the keys of all cached entries (and of those being loaded, if `loading`)."""
+        with self._lock:
+            keys = list(self._entries)
+            if loading:
+                keys += [key for key in self._inflight if key not in self._entries]
+            return keys
+
+    def update(self, key: Hashable, fn: Callable[[Any], Any]) -> bool:
+        """
+        Replace a cached value with fn(old_value), keeping its age.
+
+        fn runs outside the lock and must not modify its argument; if the
+        entry is replaced concurrently the update is retried on the new value.
+
+        Returns:
+            True if the entry existed and was updated
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return False
+                current = entry.value
+
+            value = fn(current)
+            size = self._size_fn(value)
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return False
+                if entry.value is not current:
+                    continue
+                self._total_bytes += size - entry.size
+                entry.value = value
+                entry.size = size
+            self._notify_stored(key, value)
+            return True
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one entry, or every entry when key is None, calling on_evict for
+        each. A load of the key already running will not store its result.
+        """
+        removed = []
+        with self._lock:
+            keys = list(self._entries) + list(self._inflight) if key is None else [key]
+            for k in keys:
+                self._generations[k] = self._generations.get(k, 0) + 1
+                # The next get() starts a fresh load instead of joining the outdated one
+                self._inflight.pop(k, None)
+                entry = self._entries.pop(k, None)
+                if entry is not None:
+                    self._total_bytes -= entry.size + entry.extra
+                    removed.append(k)
+        self._notify_evicted(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters plus current entry count and size."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._total_bytes
+            return stats
+
+    # -- internals -------------------------------------------------------
+
+    def _start_refresh_locked(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        if key in self._inflight:
+            return
+        future: Future = Future()
+        self._inflight[key] = future
+        self._stats["refreshes"] += 1
+        thread = threading.Thread(
+            target=self._load,
+            args=(key, loader, future, self._generations.get(key, 0)),
+            name=f"snapshot-refresh-{key}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future, generation: int) -> None:
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                if key in self._entries:
+                    self._stats["refresh_errors"] += 1
+            logger.warning("Loading snapshot %s failed: %s", key, e)
+            future.set_exception(e)
+            return
+
+        self._store(key, value, generation)
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+
+    def _store(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        size = self._size_fn(value)
+        if size > self.max_bytes:
+            logger.warning(
+                "Snapshot %s (%d bytes) exceeds cache limit of %d bytes, not caching",
+                key, size, self.max_bytes,
+            )
+            return
+
+        with self._lock:
+            if generation is not None and self._generations.get(key, 0) != generation:
+                # Invalidated while loading: the value may predate the invalidation
+                logger.info("Snapshot %s was invalidated while loading, not caching it", key)
+                return
+            old = self._entries.pop(key, None)
+            # Derived data (e.g. a search index advanced to the new value) stays charged
+            extra = old.extra if old is not None else 0
+            if old is not None:
+                self._total_bytes -= old.size + old.extra
+            self._entries[key] = _Entry(value, size, extra)
+            self._total_bytes += size + extra
+            evicted = self._evict_locked(keep=key)
+        self._notify_evicted(evicted)
+        self._notify_stored(key, value)
+
+    def _evict_locked(self, keep: Hashable) -> List[Hashable]:
+        """Evict least-recently-used entries other than `keep` until the cache fits."""
+        evicted_keys = []
+        for candidate in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if candidate == keep:
+                continue
+            evicted = self._entries.pop(candidate)
+            self._total_bytes -= evicted.size + evicted.extra
+            self._stats["evictions"] += 1
+            evicted_keys.append(candidate)
+            logger.info("Evicted snapshot %s from cache (%d bytes)", candidate, evicted.size + evicted.extra)
+        return evicted_keys
+
+    def _notify_evicted(self, keys: List[Hashable]) -> None:
+        if self._on_evict is not None:
+            for key in keys:
+                self._on_evict(key)
+
+    def _notify_stored(self, key: Hashable, value: Any) -> None:
+        if self._on_store is not None:
+            self._on_store(key, value)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: while a call for a key is in
+    flight, further callers with the same key wait for it and receive the
+    same result (or exception) instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executed": 0, "deduplicated": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless an identical call is already in flight, and return its result."""
+        with self._lock:
+            self._stats["calls"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._stats["executed"] += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._stats["deduplicated"] += 1
+
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        """Return call, executed and deduplicated counters."""
+        with self._lock:
+            return dict(self._stats)
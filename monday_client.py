@@ -1,9 +1,38 @@
 import os
+import re
+import sys
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import contextvars
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, List, Iterable, Iterator, Sequence, Set, Tuple
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+from monday_cache import BoardSnapshotCache, SingleFlight
+import monday_metrics
+from monday_json import STREAMING_AVAILABLE, loads, stream_items
+from monday_metrics import CallRecord
+from monday_fuzzy import FuzzyMatcher
+from monday_index import SnapshotIndex
+from monday_snapshot import BoardSnapshot, ItemRecord
+from monday_resilience import (
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    backoff_delay,
+    parse_retry_after,
+)
+from monday_ratelimit import (
+    ComplexityBudget,
+    ComplexityBudgetExceeded,
+    reset_seconds_from_error,
+    with_complexity,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -16,11 +45,166 @@ load_dotenv()
 MONDAY_API_KEY = os.getenv("MONDAY_API_KEY")
 MONDAY_API_URL = os.getenv("MONDAY_API_URL", "https://api.monday.com/v2")
 TIMEOUT = int(os.getenv("MONDAY_API_TIMEOUT", "30"))
+# Separate connect/read timeouts; connect defaults to 5 s, read falls back to MONDAY_API_TIMEOUT
+CONNECT_TIMEOUT = float(os.getenv("MONDAY_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("MONDAY_READ_TIMEOUT", str(TIMEOUT)))
+# Keep-alive pool size; should cover the number of concurrent Slack handlers
+POOL_SIZE = int(os.getenv("MONDAY_POOL_SIZE", "10"))
+# Items per items_page request (Monday caps this at 500)
+PAGE_SIZE = int(os.getenv("MONDAY_PAGE_SIZE", "500"))
+# 'server' pushes search filtering to Monday via query_params, 'client' scans the board
+SEARCH_MODE = os.getenv("MONDAY_SEARCH_MODE", "server").strip().lower()
+# Text/email column IDs matched server-side in addition to the item name (company and
+# email by default); a server search without matches falls back to scanning every column
+SEARCH_COLUMNS = [c.strip() for c in os.getenv("MONDAY_SEARCH_COLUMNS", "company,email").split(",") if c.strip()]
+# Board snapshot cache: seconds before a snapshot is refreshed (0 disables) and size cap
+CACHE_TTL = float(os.getenv("MONDAY_CACHE_TTL", "60"))
+CACHE_MAX_BYTES = int(float(os.getenv("MONDAY_CACHE_MAX_MB", "64")) * 1024 * 1024)
+# Keep cached snapshots column-wise (monday_snapshot.BoardSnapshot) instead of as item dicts
+COMPACT_SNAPSHOTS = os.getenv("MONDAY_COMPACT_SNAPSHOTS", "true").strip().lower() in ("1", "true", "yes")
+# Answer cached-snapshot searches from a trigram/token index (needs MONDAY_COMPACT_SNAPSHOTS)
+SEARCH_INDEX_ENABLED = os.getenv("MONDAY_SEARCH_INDEX", "true").strip().lower() in ("1", "true", "yes")
+# Typo-tolerant fallback when a search finds no exact match
+FUZZY_ENABLED = os.getenv("MONDAY_FUZZY_SEARCH", "true").strip().lower() in ("1", "true", "yes")
+FUZZY_MIN_SCORE = float(os.getenv("MONDAY_FUZZY_MIN_SCORE", "0.45"))
+FUZZY_LIMIT = int(os.getenv("MONDAY_FUZZY_LIMIT", "5"))
+# Columns holding company names, matched fuzzily besides the item name
+COMPANY_COLUMNS = [c.strip() for c in os.getenv("MONDAY_COMPANY_COLUMNS", "company").split(",") if c.strip()]
+# Maximum number of (ranked) search results returned; 0 disables the cap
+SEARCH_MAX_RESULTS = int(os.getenv("MONDAY_SEARCH_MAX_RESULTS", "25"))
+# Answer searches from the local SQLite mirror (see monday_mirror.py) once it is populated
+MIRROR_ENABLED = os.getenv("MONDAY_MIRROR_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+# 'delta' refreshes snapshots/mirror with only items changed since the last sync, 'full' refetches everything
+SYNC_MODE = os.getenv("MONDAY_SYNC_MODE", "delta").strip().lower()
+# Even in delta mode, do a full refetch this often (seconds) to correct any drift
+FULL_RESYNC_INTERVAL = float(os.getenv("MONDAY_FULL_RESYNC_INTERVAL", "3600"))
+DELTA_OVERLAP_SECONDS = 5
+# Share one HTTP request between concurrent identical queries
+COALESCE_ENABLED = os.getenv("MONDAY_COALESCE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+# Decode item pages incrementally while they download (needs ijson)
+STREAM_DECODE = os.getenv("MONDAY_STREAM_DECODE", "false").strip().lower() in ("1", "true", "yes")
+# Retries for timeouts, connection errors, 429 and 5xx responses
+MAX_RETRIES = int(os.getenv("MONDAY_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("MONDAY_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("MONDAY_RETRY_MAX_DELAY", "8"))
+RETRY_MAX_ELAPSED = float(os.getenv("MONDAY_RETRY_MAX_ELAPSED", "20"))
+# Circuit breaker: open after this many failed calls in a row, probe again after the reset time
+BREAKER_THRESHOLD = int(os.getenv("MONDAY_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("MONDAY_BREAKER_RESET", "30"))
+# Client-side view of Monday's per-minute complexity budget
+RATE_LIMIT_ENABLED = os.getenv("MONDAY_RATE_LIMIT_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+COMPLEXITY_BUDGET = int(os.getenv("MONDAY_COMPLEXITY_BUDGET", "10000000"))
+# Budget kept free for interactive calls, and how long a call may wait for the window to reset
+COMPLEXITY_RESERVE = int(os.getenv("MONDAY_COMPLEXITY_RESERVE", "100000"))
+COMPLEXITY_MAX_WAIT = float(os.getenv("MONDAY_COMPLEXITY_MAX_WAIT", "10"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_budget: Optional[ComplexityBudget] = (
+    ComplexityBudget(
+        limit=COMPLEXITY_BUDGET,
+        reserve=COMPLEXITY_RESERVE,
+        max_wait=COMPLEXITY_MAX_WAIT,
+        default_cost=30000,
+    )
+    if RATE_LIMIT_ENABLED
+    else None
+)
+_singleflight = SingleFlight()
+# When the retries of the call being made in this context must be done (monotonic time)
+_retry_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("monday_retry_deadline", default=None)
+_breaker = CircuitBreaker("monday", failure_threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET)
+_OPERATION_RE = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+_FIRST_FIELD_RE = re.compile(r"\{\s*(\w+)")
+
+_search_stats: Dict[str, Dict[str, float]] = {}
+_search_stats_lock = threading.Lock()
+
+# Search indexes are charged to their snapshot's entry and dropped when it is evicted;
+# fuzzy matchers are rebuilt off the request path when a snapshot they came from changes
+_snapshot_cache = BoardSnapshotCache(
+    ttl=CACHE_TTL,
+    max_bytes=CACHE_MAX_BYTES,
+    on_evict=lambda key: _snapshot_evicted(key),
+    on_store=lambda key, value: _snapshot_stored(key, value),
+)
+# Per-snapshot sync bookkeeping: high-water mark and time of the last full load
+_snapshot_sync_state: Dict[Any, Dict[str, Any]] = {}
+_snapshot_sync_lock = threading.Lock()
+# Search indexes of cached full-board snapshots, by snapshot key
+_search_indexes: Dict[Any, SnapshotIndex] = {}
+_search_index_builds: Set[Any] = set()
+_search_index_lock = threading.Lock()
+# Boards being downloaded by a background multi-board prefetch (see _prefetch_multi)
+_prefetching_boards: Set[int] = set()
+_prefetching_lock = threading.Lock()
+# Fuzzy matchers by board, with the version of the local copy each was built from
+# (see _fuzzy_source); stale ones answer while their replacement is built
+_fuzzy_matchers: Dict[int, Tuple[Tuple[Any, ...], FuzzyMatcher]] = {}
+_fuzzy_builds: Set[int] = set()
+_fuzzy_lock = threading.Lock()
+# Board names learned from multi-board queries, used to tag items served from the cache
+_board_names: Dict[int, str] = {}
+
+
+def _get_session() -> requests.Session:
+    """
+    Return the shared keep-alive session used for all Monday API calls.
+
+    The session is created lazily with a connection pool sized by
+    MONDAY_POOL_SIZE so concurrent handlers reuse TCP/TLS connections
+    instead of paying a fresh handshake per call.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def get_connection_stats() -> Dict[str, int]:
+    """
+    Return connection-reuse counters for the shared Monday session.
+
+    Returns:
+        Dictionary with 'requests' (HTTP requests sent), 'connections'
+        (new connections opened) and 'reused' (requests served on an
+        already-open keep-alive connection).
+    """
+    stats = {"requests": 0, "connections": 0, "reused": 0}
+    if _session is None:
+        return stats
+
+    for adapter in set(_session.adapters.values()):
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["requests"] += getattr(pool, "num_requests", 0)
+            stats["connections"] += getattr(pool, "num_connections", 0)
+
+    stats["reused"] = max(stats["requests"] - stats["connections"], 0)
+    return stats
 
 
 def _call_monday(query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     """
     Low-level helper: call Monday GraphQL API and return data['data'].
+
+    Every call reserves its expected cost from the shared complexity budget
+    first and may wait briefly for the budget window to reset. Concurrent
+    identical queries (same document and variables) share one HTTP request
+    and all receive the same result object, which must not be modified.
     
     Args:
         query: GraphQL query string
@@ -31,76 +215,940 @@ def _call_monday(query: str, variables: Optional[Dict[str, Any]] = None) -> Opti
         
     Raises:
         RuntimeError: If API key is missing or API returns errors
-        requests.RequestException: If the HTTP request fails
+        ComplexityBudgetExceeded: If the call was shed to stay within Monday's budget
+        MondayUnavailableError: If the circuit breaker is open
+        requests.RequestException: If the HTTP request fails after retries
     """
+    if not COALESCE_ENABLED or query.lstrip().startswith("mutation"):
+        return _execute_monday(query, variables)
+    key = (query, json.dumps(variables or {}, sort_keys=True, default=str))
+    executed = False
+
+    def execute() -> Optional[Dict[str, Any]]:
+        nonlocal executed
+        executed = True
+        return _execute_monday(query, variables)
+
+    call = monday_metrics.new_call(_operation_name(query))
+    started = time.perf_counter()
+    try:
+        result = _singleflight.do(key, execute)
+        call.items = monday_metrics.count_items(result)
+        return result
+    finally:
+        # The executing caller recorded the request itself; a waiter records its wait
+        if not executed:
+            call.outcome = "coalesced"
+            monday_metrics.finish_call(call, started)
+
+
+def get_coalescing_stats() -> Dict[str, int]:
+    """Return how many Monday calls were made, executed and deduplicated by coalescing."""
+    return _singleflight.stats()
+
+
+def _execute_monday(
+    query: str,
+    variables: Optional[Dict[str, Any]] = None,
+    send: Optional[Callable[[str, Optional[Dict[str, Any]]], Any]] = None,
+    call: Optional[CallRecord] = None,
+) -> Any:
+    """
+    Send a GraphQL request to Monday through the circuit breaker, retrying
+    timeouts, connection errors, 429 and 5xx with jittered exponential
+    backoff (honouring Retry-After) within MONDAY_RETRY_MAX_ELAPSED seconds.
+
+    `send` performs one attempt (default: _send_monday). The call is
+    recorded in monday_metrics, unless the caller passes its own `call`
+    record and emits it itself.
+
+    Raises:
+        MondayUnavailableError: Immediately, while the circuit breaker is open
+    """
+    with monday_metrics.track_call(_operation_name(query), call) as call:
+        result = _execute_with_retries(query, variables, send or _send_monday, call)
+        call.items = monday_metrics.count_items(result)
+        return result
+
+
+def _execute_with_retries(
+    query: str,
+    variables: Optional[Dict[str, Any]],
+    send: Callable[[str, Optional[Dict[str, Any]]], Any],
+    call: CallRecord,
+) -> Any:
+    """The breaker and retry loop of _execute_monday."""
     if not MONDAY_API_KEY:
+        # A configuration error says nothing about Monday's health, so it stays out of the breaker
         raise RuntimeError("MONDAY_API_KEY is missing in .env")
+    _breaker.before_call()
+    started = time.monotonic()
+    deadline = _retry_deadline.set(started + RETRY_MAX_ELAPSED)
+    attempt = 0
+    try:
+        while True:
+            call.attempts = attempt + 1
+            try:
+                result = send(query, variables)
+            except ComplexityBudgetExceeded:
+                # Shed locally; says nothing about Monday's health
+                _breaker.release_probe()
+                raise
+            except requests.RequestException as e:
+                response = getattr(e, "response", None)
+                status = response.status_code if response is not None else None
+                if not isinstance(e, (requests.ConnectionError, requests.Timeout)) and status not in RETRYABLE_STATUSES:
+                    # Monday answered; the request itself was rejected
+                    _breaker.record_success()
+                    raise
+
+                if attempt < MAX_RETRIES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+                    delay = backoff_delay(attempt, RETRY_BASE_DELAY, RETRY_MAX_DELAY, retry_after)
+                    if time.monotonic() - started + delay <= RETRY_MAX_ELAPSED:
+                        attempt += 1
+                        logger.warning(
+                            "Monday call failed (%s), retry %d/%d in %.2f s", e, attempt, MAX_RETRIES, delay
+                        )
+                        time.sleep(delay)
+                        continue
+
+                _breaker.record_failure()
+                raise
+            except RuntimeError:
+                # GraphQL-level error: Monday is up
+                _breaker.record_success()
+                raise
+            except Exception:
+                _breaker.release_probe()
+                raise
+
+            _breaker.record_success()
+            return result
+    finally:
+        _retry_deadline.reset(deadline)
+
+
+def _read_timeout() -> float:
+    """
+    Read timeout of one attempt: READ_TIMEOUT, capped at what is left of
+    the MONDAY_RETRY_MAX_ELAPSED budget of the call being made, so a slow
+    attempt cannot overrun it (but at least 1 s).
+    """
+    deadline = _retry_deadline.get()
+    if deadline is None:
+        return READ_TIMEOUT
+    return max(1.0, min(READ_TIMEOUT, deadline - time.monotonic()))
+
+
+def get_breaker_stats() -> Dict[str, Any]:
+    """Return the Monday circuit breaker state and its transition counters."""
+    return _breaker.stats()
+
+
+def get_call_metrics() -> List[Dict[str, Any]]:
+    """
+    Return per-call metrics aggregated by operation and labels (e.g. intent).
+
+    Returns:
+        One entry per series with count, outcomes, bytes, items, complexity,
+        p50_ms and p95_ms (empty if the histogram sink is disabled)
+    """
+    sink = monday_metrics.get_sink("histogram")
+    return sink.snapshot() if sink is not None else []
+
 
+def _send_monday(query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Send exactly one GraphQL request to Monday (see _call_monday)."""
     headers = {
         "Authorization": MONDAY_API_KEY,
-        "Content-Type": "application/json",
     }
 
+    operation = _operation_name(query)
     payload = {
-        "query": query,
+        "query": with_complexity(query) if _budget is not None or monday_metrics.enabled() else query,
         "variables": variables or {},
     }
 
+    reserved = _budget.acquire(operation) if _budget is not None else 0
+    resp: Optional[requests.Response] = None
     try:
-        resp = requests.post(MONDAY_API_URL, json=payload, headers=headers, timeout=TIMEOUT)
+        resp = _get_session().post(
+            MONDAY_API_URL,
+            json=payload,
+            headers=headers,
+            timeout=(CONNECT_TIMEOUT, _read_timeout()),
+        )
         resp.raise_for_status()
-        data = resp.json()
+        data = loads(resp.content)
+        result = data.get("data") or None
+        complexity = result.pop("complexity", None) if isinstance(result, dict) else None
+        if _budget is not None:
+            _budget.observe(operation, reserved, complexity)
+            reserved = 0
+        call = monday_metrics.current_call()
+        if call is not None:
+            call.note_response(len(resp.content), complexity)
 
         if "errors" in data:
+            _note_complexity_error(data["errors"])
             error_msg = f"Monday API error: {data['errors']}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
-        return data.get("data")
+        return result
     except requests.RequestException as e:
+        if resp is not None and resp.status_code == 429:
+            _note_complexity_error(resp.text)
         logger.error("Request to Monday API failed: %s", e)
         raise
+    finally:
+        if _budget is not None and reserved:
+            _budget.release(reserved)
+
+
+def _operation_name(query: str) -> str:
+    """Name of a GraphQL document: its operation name, or else its first top-level field."""
+    match = _OPERATION_RE.search(query)
+    if match:
+        return match.group(1)
+    match = _FIRST_FIELD_RE.search(query)
+    return match.group(1) if match else "unknown"
 
 
-def get_all_items(board_id: int, limit: int = 500) -> List[Dict[str, Any]]:
+def _note_complexity_error(errors: Any) -> None:
+    """Tell the budget tracker when Monday rejected a call for exceeding the complexity budget."""
+    reset_in = reset_seconds_from_error(errors)
+    if reset_in is not None and _budget is not None:
+        _budget.exhausted(reset_in)
+
+
+def get_budget_stats() -> Dict[str, Any]:
     """
-    Fetch items from a given board.
-    
-    Args:
-        board_id: The Monday.com board ID
-        limit: Maximum number of items to fetch (default: 500)
-        
-    Returns:
-        List of item dictionaries, each containing id, name, and column_values
-        
-    Raises:
-        RuntimeError: If API call fails
+    Return the tracked Monday complexity budget: limit, remaining, headroom
+    (0-1), seconds until reset and wait/shed counters.
     """
-    query = """
-    query($board_id: [ID!]!, $limit: Int!) {
-      boards(ids: $board_id) {
-        items_page(limit: $limit) {
-          items {
+    if _budget is None:
+        return {"enabled": False}
+    stats = _budget.stats()
+    stats["enabled"] = True
+    return stats
+
+
+ITEM_FIELDS_TEMPLATE = """
             id
             name
-            column_values {
+            updated_at
+            column_values%(column_args)s {
               id
               text
             }
-          }
-        }
-      }
+"""
+
+FIRST_PAGE_TEMPLATE = """
+query($board_id: [ID!]!, $limit: Int!, $query_params: ItemsQuery%(column_vars)s) {
+  boards(ids: $board_id) {
+    items_page(limit: $limit, query_params: $query_params) {
+      cursor
+      items {%(fields)s}
+    }
+  }
+}
+"""
+
+NEXT_PAGE_TEMPLATE = """
+query($cursor: String!, $limit: Int!%(column_vars)s) {
+  next_items_page(cursor: $cursor, limit: $limit) {
+    cursor
+    items {%(fields)s}
+  }
+}
+"""
+
+ITEM_FIELDS = ITEM_FIELDS_TEMPLATE % {"column_args": ""}
+# Same fields, restricted to the column IDs passed as $columns
+PROJECTED_ITEM_FIELDS = ITEM_FIELDS_TEMPLATE % {"column_args": "(ids: $columns)"}
+
+FIRST_PAGE_QUERY = FIRST_PAGE_TEMPLATE % {"column_vars": "", "fields": ITEM_FIELDS}
+NEXT_PAGE_QUERY = NEXT_PAGE_TEMPLATE % {"column_vars": "", "fields": ITEM_FIELDS}
+PROJECTED_FIRST_PAGE_QUERY = FIRST_PAGE_TEMPLATE % {
+    "column_vars": ", $columns: [String!]",
+    "fields": PROJECTED_ITEM_FIELDS,
+}
+PROJECTED_NEXT_PAGE_QUERY = NEXT_PAGE_TEMPLATE % {
+    "column_vars": ", $columns: [String!]",
+    "fields": PROJECTED_ITEM_FIELDS,
+}
+
+
+def project_item(item: Dict[str, Any], columns: Optional[List[str]]) -> Dict[str, Any]:
+    """Return a copy of an item keeping only the given column IDs (None keeps all)."""
+    if columns is None:
+        return item
+    wanted = set(columns)
+    projected = dict(item)
+    projected["column_values"] = [cv for cv in item.get("column_values") or [] if cv.get("id") in wanted]
+    return projected
+
+
+def _page_queries(columns: Optional[List[str]]) -> Tuple[str, str, Dict[str, Any]]:
+    """First-page query, next-page query and extra variables for a (projected) board download."""
+    if columns is None:
+        return FIRST_PAGE_QUERY, NEXT_PAGE_QUERY, {}
+    return PROJECTED_FIRST_PAGE_QUERY, PROJECTED_NEXT_PAGE_QUERY, {"columns": list(columns)}
+
+
+def iter_item_pages(
+    board_id: int,
+    page_size: int = PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the items of a board one page at a time, following the cursor.
+
+    Only one page is held in memory at a time, and no further pages are
+    requested once the caller stops iterating.
+
+    Args:
+        board_id: The Monday.com board ID
+        page_size: Number of items to request per page (Monday allows max 500)
+        query_params: Optional Monday ItemsQuery used to filter items server-side
+        columns: Optional column IDs to fetch (default: all columns)
+
+    Yields:
+        Lists of item dictionaries, each containing id, name, and column_values
+
+    Raises:
+        RuntimeError: If API call fails
+    """
+    first_query, next_query, extra = _page_queries(columns)
+    variables: Dict[str, Any] = {"board_id": [board_id], "limit": page_size, **extra}
+    if query_params:
+        variables["query_params"] = query_params
+    data = _call_monday(first_query, variables=variables)
+    boards = (data or {}).get("boards") or []
+    if not boards:
+        logger.warning("No boards found for board_id: %d", board_id)
+        return
+
+    page = boards[0].get("items_page") or {}
+    pages = 0
+    while True:
+        items = page.get("items") or []
+        pages += 1
+        if items:
+            yield items
+
+        cursor = page.get("cursor")
+        if not cursor:
+            logger.debug("Board %d exhausted after %d page(s)", board_id, pages)
+            return
+
+        data = _call_monday(next_query, variables={"cursor": cursor, "limit": page_size, **extra})
+        page = (data or {}).get("next_items_page") or {}
+
+
+def iter_items(
+    board_id: int,
+    page_size: int = PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item on a board, fetching pages lazily via the cursor.
+
+    Args:
+        board_id: The Monday.com board ID
+        page_size: Number of items to request per page (Monday allows max 500)
+        query_params: Optional Monday ItemsQuery used to filter items server-side
+        columns: Optional column IDs to fetch (default: all columns)
+
+    With MONDAY_STREAM_DECODE (and ijson installed) each page is decoded
+    incrementally, so items are yielded while the page is still downloading.
+
+    Yields:
+        Item dictionaries, each containing id, name, and column_values
+    """
+    if STREAM_DECODE and STREAMING_AVAILABLE:
+        yield from _iter_items_streamed(board_id, page_size, query_params, columns)
+        return
+    for page in iter_item_pages(board_id, page_size=page_size, query_params=query_params, columns=columns):
+        yield from page
+
+
+def _open_monday_stream(query: str, variables: Optional[Dict[str, Any]] = None) -> Tuple[requests.Response, int]:
+    """
+    Send one GraphQL request and return the response with its body still unread.
+
+    Returns:
+        The streamed response and the complexity budget reserved for it,
+        to be passed to _budget.observe() once the body is consumed
+    """
+    payload = {
+        "query": with_complexity(query) if _budget is not None or monday_metrics.enabled() else query,
+        "variables": variables or {},
     }
+    reserved = _budget.acquire(_operation_name(query)) if _budget is not None else 0
+    resp: Optional[requests.Response] = None
+    try:
+        resp = _get_session().post(
+            MONDAY_API_URL,
+            json=payload,
+            headers={"Authorization": MONDAY_API_KEY},
+            timeout=(CONNECT_TIMEOUT, _read_timeout()),
+            stream=True,
+        )
+        if resp.status_code == 429:
+            _note_complexity_error(resp.text)
+        resp.raise_for_status()
+        return resp, reserved
+    except BaseException as e:
+        if resp is not None:
+            resp.close()
+        if _budget is not None and reserved:
+            _budget.release(reserved)
+        if isinstance(e, requests.RequestException):
+            logger.error("Request to Monday API failed: %s", e)
+        raise
+
+
+def _stream_monday(
+    query: str,
+    variables: Dict[str, Any],
+    items_prefix: str,
+    captured: Dict[str, Any],
+    capture: Dict[str, str],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Call Monday (through the breaker and retries) and yield the items at
+    items_prefix while the response body is being read; see stream_items.
+
+    Bypasses query coalescing, as a stream cannot be shared. Errors
+    reported by Monday arrive after the data, so RuntimeError is raised
+    only after any items in the response were yielded.
     """
+    call = monday_metrics.new_call(_operation_name(query))
+    started = time.perf_counter()
+    error: Optional[BaseException] = None
     try:
-        data = _call_monday(query, variables={"board_id": [board_id], "limit": limit})
-        boards = (data or {}).get("boards") or []
+        resp, reserved = _execute_monday(query, variables, send=_open_monday_stream, call=call)
+        capture = dict(capture, complexity="data.complexity", errors="errors")
+        body = _CountingReader(resp.raw)
+        try:
+            resp.raw.decode_content = True
+            for item in stream_items(body, items_prefix, captured, capture):
+                call.items += 1
+                yield item
+        except Exception as e:
+            logger.error("Reading streamed Monday response failed: %s", e)
+            raise
+        finally:
+            resp.close()
+            call.note_response(body.count, captured.get("complexity"))
+            if _budget is not None:
+                # Without a complexity block (stream cut short) this just returns the reservation
+                _budget.observe(_operation_name(query), reserved, captured.get("complexity"))
+
+        if captured.get("errors"):
+            _note_complexity_error(captured["errors"])
+            error_msg = f"Monday API error: {captured['errors']}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+    except GeneratorExit:
+        # The caller stopped reading early
+        call.outcome = "closed"
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        monday_metrics.finish_call(call, started, error)
+
+
+class _CountingReader:
+    """File-like wrapper that counts the (decoded) bytes read from a response body."""
+
+    def __init__(self, raw: Any) -> None:
+        self._raw = raw
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self.count += len(chunk)
+        return chunk
+
+
+def _iter_items_streamed(
+    board_id: int,
+    page_size: int,
+    query_params: Optional[Dict[str, Any]],
+    columns: Optional[List[str]],
+) -> Iterator[Dict[str, Any]]:
+    """iter_items with every page decoded incrementally (MONDAY_STREAM_DECODE)."""
+    first_query, next_query, extra = _page_queries(columns)
+    query = first_query
+    variables: Dict[str, Any] = {"board_id": [board_id], "limit": page_size, **extra}
+    if query_params:
+        variables["query_params"] = query_params
+    page_prefix = "data.boards.item.items_page"
+
+    while True:
+        captured: Dict[str, Any] = {}
+        yield from _stream_monday(
+            query, variables, f"{page_prefix}.items.item", captured, {"cursor": f"{page_prefix}.cursor"}
+        )
+        cursor = captured.get("cursor")
+        if not cursor:
+            return
+        query = next_query
+        variables = {"cursor": cursor, "limit": page_size, **extra}
+        page_prefix = "data.next_items_page"
+
+
+# -------------------------------------------------------------------
+# Multi-board fan-out
+# -------------------------------------------------------------------
+
+MULTI_FIRST_PAGE_FIELD = """
+  b%(index)d: boards(ids: $b%(index)d) {
+    id
+    name
+    items_page(limit: $limit, query_params: $query_params) {
+      cursor
+      items {%(fields)s}
+    }
+  }
+"""
+
+MULTI_NEXT_PAGE_FIELD = """
+  p%(index)d: next_items_page(cursor: $c%(index)d, limit: $limit) {
+    cursor
+    items {%(fields)s}
+  }
+"""
+
+
+def _multi_board_query(operation: str, field: str, variable: str, indexes: List[int], columns: Optional[List[str]]) -> str:
+    """
+    Build one GraphQL document with an aliased copy of `field` per board index.
+
+    The aliases carry the position in the caller's board list, so each
+    board's part of the response can be told apart and paginated on its own.
+    """
+    fields = ITEM_FIELDS if columns is None else PROJECTED_ITEM_FIELDS
+    declared = ["$limit: Int!"]
+    if operation == "MultiBoardFirstPage":
+        declared.append("$query_params: ItemsQuery")
+    if columns is not None:
+        declared.append("$columns: [String!]")
+    declared += [variable % {"index": index} for index in indexes]
+    body = "".join(field % {"index": index, "fields": fields} for index in indexes)
+    return f"query {operation}({', '.join(declared)}) {{{body}}}\n"
+
+
+def tag_item(item: Dict[str, Any], board_id: int, board_name: Optional[str] = None) -> Dict[str, Any]:
+    """Return a copy of an item tagged with the board it came from."""
+    tagged = dict(item)
+    tagged["board_id"] = board_id
+    tagged["board_name"] = board_name if board_name is not None else _board_names.get(board_id)
+    return tagged
+
+
+def iter_multi_board_pages(
+    board_ids: List[int],
+    page_size: int = PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Yield pages of several boards, fetching all boards in one request per round.
+
+    The first round asks for the first page of every board through aliased
+    boards(...) fields; each following round asks for the next page of only
+    the boards that still have a cursor, again in a single document. N
+    boards therefore cost one round trip per page depth instead of N.
+
+    Args:
+        board_ids: Monday.com board IDs
+        page_size: Number of items to request per board and page (Monday allows max 500)
+        query_params: Optional Monday ItemsQuery applied to every board
+        columns: Optional column IDs to fetch (default: all columns)
+
+    Yields:
+        (board_id, items) tuples; use tag_item() to label items with their board
+
+    Raises:
+        RuntimeError: If API call fails
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    if not board_ids:
+        return
+
+    extra: Dict[str, Any] = {"limit": page_size}
+    if columns is not None:
+        extra["columns"] = list(columns)
+
+    indexes = list(range(len(board_ids)))
+    variables: Dict[str, Any] = dict(extra, **{f"b{i}": [board_ids[i]] for i in indexes})
+    if query_params:
+        variables["query_params"] = query_params
+    query = _multi_board_query("MultiBoardFirstPage", MULTI_FIRST_PAGE_FIELD, "$b%(index)d: [ID!]!", indexes, columns)
+    data = _call_monday(query, variables=variables) or {}
+
+    cursors: Dict[int, str] = {}
+    for i in indexes:
+        boards = data.get(f"b{i}") or []
         if not boards:
-            logger.warning("No boards found for board_id: %d", board_id)
-            return []
+            logger.warning("No boards found for board_id: %d", board_ids[i])
+            continue
+        board_name = boards[0].get("name")
+        if board_name:
+            _board_names[board_ids[i]] = board_name
+        page = boards[0].get("items_page") or {}
+        items = page.get("items") or []
+        if items:
+            yield board_ids[i], items
+        if page.get("cursor"):
+            cursors[i] = page["cursor"]
+
+    while cursors:
+        indexes = sorted(cursors)
+        variables = dict(extra, **{f"c{i}": cursors[i] for i in indexes})
+        query = _multi_board_query("MultiBoardNextPage", MULTI_NEXT_PAGE_FIELD, "$c%(index)d: String!", indexes, columns)
+        data = _call_monday(query, variables=variables) or {}
+
+        cursors = {}
+        for i in indexes:
+            page = data.get(f"p{i}") or {}
+            items = page.get("items") or []
+            if items:
+                yield board_ids[i], items
+            if page.get("cursor"):
+                cursors[i] = page["cursor"]
+
+
+def iter_items_multi(
+    board_ids: List[int],
+    page_size: int = PAGE_SIZE,
+    query_params: Optional[Dict[str, Any]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield every item on several boards (see iter_multi_board_pages), tagged with its board."""
+    pages = iter_multi_board_pages(board_ids, page_size=page_size, query_params=query_params, columns=columns)
+    for board_id, page in pages:
+        for item in page:
+            yield tag_item(item, board_id)
+
+
+ACTIVITY_LOG_QUERY = """
+query($board_id: [ID!]!, $from: ISO8601DateTime!, $limit: Int!, $page: Int!) {
+  boards(ids: $board_id) {
+    activity_logs(from: $from, limit: $limit, page: $page) {
+      event
+      data
+    }
+  }
+}
+"""
+
+# Activity log events after which an item is no longer on the board
+REMOVAL_EVENTS = {"delete_pulse", "archive_pulse", "move_pulse_from_board"}
+
+
+def high_water_mark(items: Iterable[Dict[str, Any]], current: Optional[str] = None) -> Optional[str]:
+    """Return the latest updated_at among the items (ISO8601 strings compare chronologically)."""
+    mark = current
+    for item in items:
+        updated_at = item.get("updated_at")
+        if updated_at and (mark is None or updated_at > mark):
+            mark = updated_at
+    return mark
+
+
+def _rewind(timestamp: str, seconds: float) -> str:
+    """Move an ISO8601 timestamp back by the given number of seconds."""
+    try:
+        moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return timestamp
+    return (moment - timedelta(seconds=seconds)).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def iter_items_updated_since(
+    board_id: int,
+    since: str,
+    page_size: int = PAGE_SIZE,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield only the items whose updated_at is after the given timestamp,
+    oldest change first. The window is rewound by DELTA_OVERLAP_SECONDS so
+    items changed within the same second as the high-water mark are not
+    missed; re-applying an unchanged item is harmless.
+
+    Args:
+        board_id: The Monday.com board ID
+        since: ISO8601 timestamp (the previous high-water mark)
+        page_size: Number of items to request per page
+        columns: Optional column IDs to fetch (default: all columns)
+
+    Yields:
+        Changed item dictionaries
+    """
+    query_params = {
+        "rules": [
+            {
+                "column_id": "__last_updated__",
+                "compare_value": ["EXACT", _rewind(since, DELTA_OVERLAP_SECONDS)],
+                "compare_attribute": "UPDATED_AT",
+                "operator": "greater_than",
+            }
+        ],
+        "order_by": [{"column_id": "__last_updated__", "direction": "asc"}],
+    }
+    yield from iter_items(board_id, page_size=page_size, query_params=query_params, columns=columns)
+
+
+def get_removed_item_ids_since(board_id: int, since: str, page_size: int = 1000) -> Set[str]:
+    """
+    Return IDs of items deleted, archived or moved off the board since the
+    given timestamp, read from the board's activity log.
+
+    Args:
+        board_id: The Monday.com board ID
+        since: ISO8601 timestamp (the previous high-water mark)
+        page_size: Activity log entries per request
+
+    Returns:
+        Set of item IDs (as strings)
+    """
+    removed: Set[str] = set()
+    page = 1
+    while True:
+        data = _call_monday(
+            ACTIVITY_LOG_QUERY,
+            variables={"board_id": [board_id], "from": since, "limit": page_size, "page": page},
+        )
+        boards = (data or {}).get("boards") or []
+        logs = (boards[0].get("activity_logs") if boards else None) or []
+        for log in logs:
+            if log.get("event") not in REMOVAL_EVENTS:
+                continue
+            try:
+                payload = json.loads(log.get("data") or "{}")
+            except ValueError:
+                continue
+            pulse_id = payload.get("pulse_id") or payload.get("item_id")
+            if pulse_id:
+                removed.add(str(pulse_id))
+        if len(logs) < page_size:
+            return removed
+        page += 1
+
+
+def merge_items(
+    items: List[Dict[str, Any]],
+    changed: List[Dict[str, Any]],
+    removed: Set[str],
+) -> List[Dict[str, Any]]:
+    """
+    Apply a delta to a snapshot: replace changed items in place, append new
+    ones and drop removed ones. The input list is not modified.
+    """
+    if isinstance(items, BoardSnapshot):
+        return items.merge(changed, removed)
+    changed_by_id = {str(item.get("id")): item for item in changed}
+    merged = []
+    for item in items:
+        item_id = str(item.get("id"))
+        if item_id in removed:
+            continue
+        merged.append(changed_by_id.pop(item_id, item))
+    merged.extend(item for item_id, item in changed_by_id.items() if item_id not in removed)
+    return merged
+
+
+def _compact(items: Iterable[Dict[str, Any]]) -> Sequence[Dict[str, Any]]:
+    """Turn downloaded items into the representation kept in the snapshot cache."""
+    return BoardSnapshot.from_items(items) if COMPACT_SNAPSHOTS else list(items)
+
+
+def _merge_snapshot(
+    key: Any,
+    items: Sequence[Dict[str, Any]],
+    changed: List[Dict[str, Any]],
+    removed: Set[str],
+) -> Sequence[Dict[str, Any]]:
+    """merge_items for a cached snapshot, moving its search index along with it."""
+    merged = merge_items(items, changed, removed)
+    with _search_index_lock:
+        index = _search_indexes.get(key)
+    if index is not None and isinstance(merged, BoardSnapshot):
+        index.advance(items, merged, changed, removed)
+    return merged
+
+
+def _snapshot_key(board_id: int, columns: Optional[List[str]] = None) -> Tuple[int, Optional[Tuple[str, ...]]]:
+    """Cache key for a board snapshot: board ID plus the projected column IDs (None = all)."""
+    return (board_id, tuple(sorted(columns)) if columns else None)
+
+
+def _load_snapshot(board_id: int, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Snapshot cache loader: download the board, or in delta mode patch the
+    previous snapshot with only the items changed since its high-water mark.
+    """
+    key = _snapshot_key(board_id, columns)
+    previous = _snapshot_cache.peek(key)
+    with _snapshot_sync_lock:
+        state = dict(_snapshot_sync_state.get(key) or {})
+
+    full_due = time.monotonic() - state.get("full_at", 0.0) >= FULL_RESYNC_INTERVAL
+    if SYNC_MODE == "delta" and previous is not None and state.get("hwm") and not full_due:
+        since = state["hwm"]
+        changed = list(iter_items_updated_since(board_id, since, columns=columns))
+        removed = get_removed_item_ids_since(board_id, since)
+        items = _merge_snapshot(key, previous, changed, removed) if changed or removed else previous
+        state["hwm"] = high_water_mark(changed, since)
+        logger.info(
+            "Delta-refreshed board %d snapshot: %d changed, %d removed, %d total",
+            board_id, len(changed), len(removed), len(items),
+        )
+    else:
+        items = _compact(iter_items(board_id, columns=columns))
+        state = {"hwm": high_water_mark(items), "full_at": time.monotonic()}
+        logger.info("Loaded snapshot of board %d with %d items", board_id, len(items))
+
+    with _snapshot_sync_lock:
+        _snapshot_sync_state[key] = state
+    return items
+
+
+ITEM_QUERY = """
+query($item_id: [ID!]) {
+  items(ids: $item_id) {%s            board {
+              id
+            }
+  }
+}
+""" % ITEM_FIELDS
+
 
-        items_page = boards[0].get("items_page") or {}
-        items = items_page.get("items") or []
+def get_item(item_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single item by ID.
+
+    Returns:
+        The item dictionary, with the ID of its board under "board" (as
+        {"id": ...}), or None if it does not exist (e.g. deleted)
+    """
+    data = _call_monday(ITEM_QUERY, variables={"item_id": [item_id]})
+    items = (data or {}).get("items") or []
+    return items[0] if items else None
+
+
+def apply_item_change(board_id: int, item: Optional[Dict[str, Any]] = None, removed_id: Optional[str] = None) -> int:
+    """
+    Patch every cached snapshot of a board with one upserted or removed item,
+    without refetching the board (used by the webhook receiver).
+
+    The delta high-water mark is left alone: a webhook only covers this one
+    item, so moving the mark past it could skip earlier changes to other
+    items that never arrived by webhook.
+
+    Args:
+        board_id: The Monday.com board ID
+        item: Fresh item dictionary to insert or replace
+        removed_id: ID of an item that no longer belongs to the board
+
+    Returns:
+        Number of cached snapshots that were patched
+    """
+    removed = {str(removed_id)} if removed_id else set()
+    patched = 0
+    for key in _snapshot_cache.keys():
+        if key[0] != board_id:
+            continue
+        changed = [project_item(item, list(key[1]) if key[1] else None)] if item else []
+        if _snapshot_cache.update(key, lambda items: _merge_snapshot(key, items, changed, removed)):
+            patched += 1
+    return patched
+
+
+def store_snapshot(board_id: int, items: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> None:
+    """Cache a full board download made outside get_all_items (e.g. by the async client)."""
+    if not _snapshot_cache.enabled:
+        return
+    key = _snapshot_key(board_id, columns)
+    with _snapshot_sync_lock:
+        _snapshot_sync_state[key] = {"hwm": high_water_mark(items), "full_at": time.monotonic()}
+    _snapshot_cache.put(key, _compact(items))
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss/refresh counters and size of the board snapshot cache."""
+    return _snapshot_cache.stats()
+
+
+def invalidate_board_cache(board_id: Optional[int] = None) -> None:
+    """Drop the cached snapshots (every column projection) of one board, or of all boards when board_id is None."""
+    if board_id is None:
+        _snapshot_cache.invalidate()
+    else:
+        for key in _snapshot_cache.keys(loading=True):
+            if key[0] == board_id:
+                _snapshot_cache.invalidate(key)
+    with _search_index_lock:
+        for key in list(_search_indexes):
+            if board_id is None or key[0] == board_id:
+                del _search_indexes[key]
+
+
+def get_all_items(
+    board_id: int,
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all items from a given board, following pagination.
+
+    Unless use_cache is False, the board is served from the in-process
+    snapshot cache; a stale snapshot is returned immediately while it is
+    refreshed in the background. A column projection is answered from a
+    cached full snapshot when there is one, otherwise only the requested
+    columns are downloaded and cached separately.
+    
+    Args:
+        board_id: The Monday.com board ID
+        limit: Optional maximum number of items to return (default: no limit)
+        use_cache: Serve from / populate the board snapshot cache (default: True)
+        columns: Optional column IDs to include (default: all columns)
+        
+    Returns:
+        List of item dictionaries, each containing id, name, and column_values.
+        Items may be shared with the cache and must not be modified; from
+        a compact snapshot they are read-only ItemRecord mappings.
+        
+    Raises:
+        RuntimeError: If API call fails
+    """
+    try:
+        if use_cache and _snapshot_cache.enabled:
+            full = _snapshot_cache.peek(_snapshot_key(board_id)) if columns is not None else None
+            if full is not None:
+                items = [project_item(item, columns) for item in islice(full, limit)]
+            else:
+                snapshot = _snapshot_cache.get(
+                    _snapshot_key(board_id, columns), lambda: _load_snapshot(board_id, columns)
+                )
+                items = list(islice(snapshot, limit))
+            logger.info("Served %d items from board %d snapshot", len(items), board_id)
+            return items
+
+        page_size = min(limit, PAGE_SIZE) if limit else PAGE_SIZE
+        items = list(islice(iter_items(board_id, page_size=page_size, columns=columns), limit))
         logger.info("Fetched %d items from board %d", len(items), board_id)
         return items
     except Exception as e:
@@ -108,52 +1156,725 @@ def get_all_items(board_id: int, limit: int = 500) -> List[Dict[str, Any]]:
         raise
 
 
-def search_items_by_text(board_id: int, text: str) -> List[Dict[str, Any]]:
+def _item_matches(item: Dict[str, Any], term: str) -> bool:
+    """Return True if the lower-cased term occurs in the item name or any column text."""
+    if isinstance(item, ItemRecord):
+        return item.matches(term)
+
+    # Match on item name
+    if term in (item.get("name") or "").lower():
+        return True
+
+    # Or match on any column text
+    for cv in item.get("column_values") or []:
+        if term in (cv.get("text") or "").lower():
+            return True
+    return False
+
+
+class SearchResults(list):
+    """
+    List of search results that also reports how many items matched.
+
+    Attributes:
+        total: Number of matching items before the cap
+        truncated: Number of matching items left out by the cap
+    """
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = (), total: Optional[int] = None) -> None:
+        super().__init__(items)
+        self.total = len(self) if total is None else total
+        self.truncated = self.total - len(self)
+
+
+def match_rank(item: Dict[str, Any], term: str) -> int:
+    """
+    Rank how well an item matches a lower-cased search term (lower is better).
+
+    Returns:
+        0 for an exact name match, 1 if the name starts with the term,
+        2 if the name contains it and 3 if only a column text does
+    """
+    name = (item.get("name") or "").strip().lower()
+    if name == term:
+        return 0
+    if name.startswith(term):
+        return 1
+    if term in name:
+        return 2
+    return 3
+
+
+def rank_results(items: List[Dict[str, Any]], term: str, limit: Optional[int] = None) -> SearchResults:
+    """
+    Order matches by match_rank and keep the best `limit` of them.
+
+    The sort is stable, so items of the same rank keep their order (board
+    order, or BM25 order from the mirror).
+
+    Args:
+        items: Matching items
+        term: Lower-cased search term
+        limit: Maximum number of results (default: MONDAY_SEARCH_MAX_RESULTS, 0 for no cap)
+
+    Returns:
+        SearchResults with the ranked items and the total number of matches
+    """
+    limit = SEARCH_MAX_RESULTS if limit is None else limit
+    ranked = sorted(items, key=lambda item: match_rank(item, term))
+    return SearchResults(ranked[:limit] if limit > 0 else ranked, total=len(ranked))
+
+
+def _record_search(path: str, elapsed_ms: float) -> None:
+    """Accumulate latency numbers for one search path ('mirror', 'cache', 'server' or 'client')."""
+    with _search_stats_lock:
+        stats = _search_stats.setdefault(path, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def get_search_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Return per-path search latency numbers.
+
+    Returns:
+        Dictionary keyed by search path ('mirror', 'cache', 'server', 'client') with count,
+        total_ms, avg_ms and max_ms
+    """
+    with _search_stats_lock:
+        result = {}
+        for path, stats in _search_stats.items():
+            entry = dict(stats)
+            entry["avg_ms"] = entry["total_ms"] / entry["count"] if entry["count"] else 0.0
+            result[path] = entry
+        return result
+
+
+def build_search_query_params(term: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build a Monday ItemsQuery matching items whose name (or one of the
+    given text/email columns) contains the term.
+
+    Args:
+        term: Search term
+        columns: Extra column IDs to match with contains_text (default: SEARCH_COLUMNS)
+
+    Returns:
+        ItemsQuery dictionary suitable for items_page(query_params: ...)
+    """
+    column_ids = ["name"] + [c for c in (SEARCH_COLUMNS if columns is None else columns) if c != "name"]
+    return {
+        "rules": [
+            {"column_id": column_id, "compare_value": [term], "operator": "contains_text"}
+            for column_id in column_ids
+        ],
+        "operator": "or",
+    }
+
+
+def _search_rejected(e: Exception) -> bool:
+    """
+    True if Monday turned down a server-side search request itself (a 4xx
+    other than 429), e.g. because a rule targets a column type it cannot
+    filter; the search can then still be answered by a client-side scan.
+    """
+    # requests exposes the status on e.response, aiohttp on e.status
+    status = getattr(getattr(e, "response", None), "status_code", None) or getattr(e, "status", None)
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+def _search_server_side(board_id: int, term: str, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Let Monday filter the board with query_params and return only matching items."""
+    # The searched columns are fetched too so the local re-check can see them
+    fetch_columns = None if columns is None else sorted(set(columns) | set(SEARCH_COLUMNS))
+    results = iter_items(board_id, query_params=build_search_query_params(term), columns=fetch_columns)
+    # Re-check locally, as Monday's contains_text is looser than a substring match for
+    # some column types. Only the name and SEARCH_COLUMNS are searched here, so an item
+    # matching another column is missed; callers fall back to a full scan on no matches.
+    return [project_item(item, columns) for item in results if _item_matches(item, term)]
+
+
+def _search_client_side(board_id: int, term: str) -> List[Dict[str, Any]]:
+    """Load the whole board (via the snapshot cache) and filter by name or any column text."""
+    if _snapshot_cache.enabled:
+        snapshot = _snapshot_cache.get(_snapshot_key(board_id), lambda: _load_snapshot(board_id))
+        if isinstance(snapshot, BoardSnapshot):
+            return _search_snapshot(_snapshot_key(board_id), snapshot, term)
+        return [item for item in snapshot if _item_matches(item, term)]
+    return [item for item in get_all_items(board_id) if _item_matches(item, term)]
+
+
+def _search_snapshot(key: Any, snapshot: BoardSnapshot, term: str) -> List[Dict[str, Any]]:
+    """
+    Search a cached snapshot through its search index.
+
+    Until the index for this snapshot exists it is built on a background
+    thread and the snapshot is scanned instead, so a search never waits
+    for indexing.
+    """
+    if not SEARCH_INDEX_ENABLED:
+        return snapshot.search(term)
+
+    with _search_index_lock:
+        index = _search_indexes.get(key)
+        if index is not None and index.covers(snapshot):
+            ready = True
+        else:
+            ready = False
+            if key not in _search_index_builds:
+                _search_index_builds.add(key)
+                threading.Thread(
+                    target=_build_search_index, args=(key, snapshot), name=f"search-index-{key[0]}", daemon=True
+                ).start()
+
+    return index.search(term) if ready else snapshot.search(term)
+
+
+def _build_search_index(key: Any, snapshot: BoardSnapshot) -> None:
+    """Index a snapshot and publish the index if the snapshot is still cached."""
+    try:
+        started = time.perf_counter()
+        index = SnapshotIndex(snapshot)
+        logger.info(
+            "Built search index for board %d: %d items in %.0f ms",
+            key[0], len(snapshot), (time.perf_counter() - started) * 1000,
+        )
+        cached = set(_snapshot_cache.keys())
+        with _search_index_lock:
+            # Drop indexes of snapshots that were evicted meanwhile
+            for stale in [k for k in _search_indexes if k not in cached]:
+                del _search_indexes[stale]
+            if key in cached:
+                _search_indexes[key] = index
+        # Count the index against MONDAY_CACHE_MAX_MB (may evict other snapshots)
+        if key in cached and not _snapshot_cache.charge(key, sys.getsizeof(index)):
+            _drop_search_index(key)
+    except Exception as e:
+        logger.warning("Building search index for board %d failed: %s", key[0], e)
+    finally:
+        with _search_index_lock:
+            _search_index_builds.discard(key)
+
+
+def _drop_search_index(key: Any) -> None:
+    """Forget the search index of a snapshot that left the cache."""
+    with _search_index_lock:
+        _search_indexes.pop(key, None)
+
+
+def get_search_index_stats() -> Dict[Any, Dict[str, int]]:
+    """Return document, trigram and token counts of every board search index, by board ID."""
+    with _search_index_lock:
+        indexes = dict(_search_indexes)
+    return {key[0]: index.stats() for key, index in indexes.items()}
+
+
+def _mirror_ready(board_id: int) -> bool:
+    """True if the local SQLite mirror is enabled and holds a synced copy of the board."""
+    if not MIRROR_ENABLED:
+        return False
+    try:
+        from monday_mirror import get_mirror
+
+        return get_mirror().is_populated(board_id)
+    except Exception as e:
+        logger.warning("Mirror unavailable, falling back to Monday: %s", e)
+        return False
+
+
+def _search_mirror(board_id: int, term: str) -> Optional[List[Dict[str, Any]]]:
+    """Search the local SQLite mirror, or return None if it is disabled or not yet synced."""
+    if not _mirror_ready(board_id):
+        return None
+    try:
+        from monday_mirror import get_mirror
+
+        return get_mirror().search(board_id, term)
+    except Exception as e:
+        logger.warning("Mirror search failed, falling back to Monday: %s", e)
+        return None
+
+
+def _fuzzy_source(board_id: int) -> Optional[Tuple[Tuple[Any, ...], Callable[[], Sequence[Any]]]]:
+    """
+    The local copy of a board to fuzzy-match against: the mirror if it
+    holds the board, else the cached snapshot (a stale one is refreshed in
+    the background).
+
+    Returns:
+        (version, load) or None if there is no local copy yet; the version
+        changes whenever the copy does
     """
-    Search items by text: load items from the board and filter in Python
-    by name or any column text containing the search string.
+    if _mirror_ready(board_id):
+        from monday_mirror import get_mirror
+
+        mirror = get_mirror()
+        return ("mirror",) + mirror.revision(board_id), lambda: mirror.get_items(board_id)
+
+    key = _snapshot_key(board_id)
+    if _snapshot_cache.enabled and _snapshot_cache.peek(key) is not None:
+        snapshot = _snapshot_cache.get(key, lambda: _load_snapshot(board_id))
+        # The matcher keeps its snapshot alive, so the id cannot be reused while it is compared
+        return ("snapshot", id(snapshot)), lambda: snapshot
+    return None
+
+
+def _build_fuzzy_matcher(board_id: int, version: Tuple[Any, ...], load: Callable[[], Sequence[Any]]) -> FuzzyMatcher:
+    """Build and publish the fuzzy matcher of a board from one local copy."""
+    started = time.perf_counter()
+    matcher = FuzzyMatcher(load(), COMPANY_COLUMNS)
+    with _fuzzy_lock:
+        _fuzzy_matchers[board_id] = (version, matcher)
+    logger.info(
+        "Built fuzzy matcher of board %d from its %s in %.1f ms",
+        board_id, version[0], (time.perf_counter() - started) * 1000,
+    )
+    return matcher
+
+
+def _refresh_fuzzy_matcher(board_id: int, version: Tuple[Any, ...], load: Callable[[], Sequence[Any]]) -> None:
+    """Rebuild the fuzzy matcher of a board on a background thread, one build per board at a time."""
+    with _fuzzy_lock:
+        if board_id in _fuzzy_builds:
+            return
+        _fuzzy_builds.add(board_id)
+
+    def build() -> None:
+        try:
+            _build_fuzzy_matcher(board_id, version, load)
+        except Exception as e:
+            logger.warning("Building the fuzzy matcher of board %d failed: %s", board_id, e)
+        finally:
+            with _fuzzy_lock:
+                _fuzzy_builds.discard(board_id)
+
+    threading.Thread(target=build, name=f"fuzzy-matcher-{board_id}", daemon=True).start()
+
+
+def _snapshot_stored(key: Any, snapshot: Any) -> None:
+    """
+    Cache hook: re-charge the search index that was advanced along with a
+    changed snapshot, and rebuild the fuzzy matcher of a board whose full
+    snapshot changed.
+    """
+    with _search_index_lock:
+        index = _search_indexes.get(key)
+    # advance() grows the index in place, so its charge against MONDAY_CACHE_MAX_MB is redone
+    if index is not None and index.covers(snapshot) and not _snapshot_cache.charge(key, sys.getsizeof(index)):
+        _drop_search_index(key)
+
+    board_id, columns = key
+    if columns is not None or not FUZZY_ENABLED:
+        return
+    with _fuzzy_lock:
+        current = _fuzzy_matchers.get(board_id)
+    # Only boards that have been fuzzy-searched, and whose matcher is not built from the mirror
+    if current is not None and current[0][0] == "snapshot" and current[0][1] != id(snapshot):
+        _refresh_fuzzy_matcher(board_id, ("snapshot", id(snapshot)), lambda: snapshot)
+
+
+def _snapshot_evicted(key: Any) -> None:
+    """Cache hook: drop the data derived from a snapshot that left the cache."""
+    _drop_search_index(key)
+    board_id, columns = key
+    if columns is None:
+        with _fuzzy_lock:
+            current = _fuzzy_matchers.get(board_id)
+            if current is not None and current[0][0] == "snapshot":
+                del _fuzzy_matchers[board_id]
+
+
+def fuzzy_search_items(
+    board_id: int,
+    text: str,
+    limit: int = FUZZY_LIMIT,
+    min_score: float = FUZZY_MIN_SCORE,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rank the items of a board by how closely their name or company column
+    (MONDAY_COMPANY_COLUMNS) resembles the text, tolerating typos and
+    æ/ø/å written as ae/oe/aa.
+
+    Only local data is used: the mirror's rows when the mirror holds the
+    board, else the cached snapshot. Without either, the snapshot is
+    loaded in the background and no candidates are returned this time
+    (with the snapshot cache disabled, the board is downloaded instead).
+    The matcher is built on the first fuzzy search of a board; after that
+    it is rebuilt in the background when the snapshot or mirror changes,
+    and the previous one answers until the new one is ready.
+
+    Args:
+        board_id: The Monday.com board ID
+        text: Customer name as the user wrote it
+        limit: Maximum number of candidates to return
+        min_score: Minimum trigram similarity (0-1) of a candidate
+        columns: Optional column IDs to include in the results (default: all)
+
+    Returns:
+        Up to `limit` items, best first, each with a 'match_score' key
+
+    Raises:
+        RuntimeError: If the board had to be downloaded and that failed
+    """
+    source = _fuzzy_source(board_id)
+    if source is None and not _snapshot_cache.enabled:
+        # Nowhere to keep a copy of the board, so match against a fresh download
+        matcher = FuzzyMatcher(get_all_items(board_id, use_cache=False), COMPANY_COLUMNS)
+    elif source is None:
+        _snapshot_cache.prefetch(_snapshot_key(board_id), lambda: _load_snapshot(board_id))
+        logger.info("No local copy of board %d to fuzzy-match against yet", board_id)
+        return []
+    else:
+        version, load = source
+        with _fuzzy_lock:
+            current = _fuzzy_matchers.get(board_id)
+        if current is None:
+            # First fuzzy search of this board: there is no older matcher to answer with
+            matcher = _build_fuzzy_matcher(board_id, version, load)
+        else:
+            matcher = current[1]
+            if current[0] != version:
+                _refresh_fuzzy_matcher(board_id, version, load)
+
+    return [
+        dict(project_item(item, columns), match_score=score)
+        for item, score in matcher.match(text, limit=limit, min_score=min_score)
+    ]
+
+
+def search_items_by_text(
+    board_id: int,
+    text: str,
+    columns: Optional[List[str]] = None,
+    fuzzy: bool = True,
+    limit: Optional[int] = None,
+) -> SearchResults:
+    """
+    Search items by text on a board.
+
+    With MONDAY_MIRROR_ENABLED and a synced mirror, the search is answered
+    from the local SQLite FTS5 index, ranked by BM25. If a snapshot of the
+    board is cached (fresh or stale), it is scanned locally without any API
+    call. Otherwise the filtering is pushed down to
+    Monday (item name plus the columns listed in MONDAY_SEARCH_COLUMNS), so
+    only matching items are transferred, and the requested columns of the
+    board are cached in the background (unless they already are) for
+    get_all_items with the same columns. If that finds nothing, the board is
+    scanned on every column, as an item may match a column that Monday did
+    not search. If the server-side query fails or Monday rejects it (a
+    4xx other than 429), e.g. because a configured column type cannot be
+    filtered by the API, or MONDAY_SEARCH_MODE is 'client', the whole
+    board is loaded and filtered in Python on name or any column text
+    instead.
+
+    Matches are ranked (exact name, name prefix, name substring, column
+    text; see match_rank) and capped at MONDAY_SEARCH_MAX_RESULTS, so a
+    generic term does not return hundreds of items. If nothing matches
+    exactly, the closest names are returned instead (see
+    fuzzy_search_items), marked with a 'match_score' key.
     
     Args:
         board_id: The Monday.com board ID
         text: Search term to match against item names and column values
+        columns: Optional column IDs to include in the results (default: all).
+            Matching always considers every column available on the path.
+        fuzzy: Fall back to fuzzy matching when there is no exact match
+            (default: True, disabled globally by MONDAY_FUZZY_SEARCH=false)
+        limit: Maximum number of results (default: MONDAY_SEARCH_MAX_RESULTS,
+            0 for no cap)
         
     Returns:
-        List of matching item dictionaries
-        
-    Note:
-        This is a simple client-side search. For better performance with large
-        datasets, consider using Monday.com's native search API.
+        SearchResults (a list of item dictionaries, best match first) whose
+        total and truncated attributes tell how many items matched in all
+        and how many were left out
+
+    Raises:
+        MondayUnavailableError: If Monday is down (circuit breaker open)
+        RuntimeError: If Monday could not be searched, so callers can tell
+            "no matches" apart from "Monday unavailable"
     """
     term = (text or "").strip().lower()
     if not term:
         logger.warning("Empty search term provided")
-        return []
+        return SearchResults()
 
     try:
-        items = get_all_items(board_id)
-        results = []
+        path = "client"
+        started = time.perf_counter()
+        results = _search_mirror(board_id, term)
+        snapshot = None
+        if results is None and _snapshot_cache.enabled:
+            snapshot = _snapshot_cache.peek(_snapshot_key(board_id))
 
-        for item in items:
-            name = (item.get("name") or "").lower()
-            cols = item.get("column_values") or []
+        if results is not None:
+            path = "mirror"
+        elif snapshot is not None:
+            # Goes through the cache again so a stale snapshot triggers a refresh
+            results = _search_client_side(board_id, term)
+            path = "cache"
+        elif SEARCH_MODE == "server":
+            try:
+                results = _search_server_side(board_id, term, columns)
+                path = "server"
+                if not results:
+                    logger.info("No server-side match for '%s', scanning every column", term)
+                    results = None
+                    path = "client"
+                elif _snapshot_cache.enabled:
+                    # Just the requested columns (the full board is what this path avoids), if not cached yet
+                    _snapshot_cache.prefetch(
+                        _snapshot_key(board_id, columns), lambda: _load_snapshot(board_id, columns)
+                    )
+            except ComplexityBudgetExceeded:
+                raise
+            except (RuntimeError, requests.HTTPError) as e:
+                if isinstance(e, requests.HTTPError) and not _search_rejected(e):
+                    raise
+                logger.warning("Server-side search failed, falling back to client-side scan: %s", e)
+                started = time.perf_counter()
 
-            # Match on item name
-            if term in name:
-                results.append(item)
-                continue
+        if results is None:
+            results = _search_client_side(board_id, term)
+
+        results = rank_results(results, term, limit)
+        if path != "server":
+            results[:] = [project_item(item, columns) for item in results]
 
-            # Or match on any column text
-            for cv in cols:
-                cv_text = (cv.get("text") or "").lower()
-                if term in cv_text:
-                    results.append(item)
-                    break
+        if not results and fuzzy and FUZZY_ENABLED:
+            results = SearchResults(fuzzy_search_items(board_id, term, columns=columns))
+            path = "fuzzy"
 
-        logger.info("Found %d matching items for search term '%s'", len(results), term)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _record_search(path, elapsed_ms)
+        logger.info(
+            "Found %d matching items for search term '%s' (path=%s, %.1f ms, %d returned)",
+            results.total, term, path, elapsed_ms, len(results),
+        )
         return results
     except Exception as e:
         logger.error("Failed to search items: %s", e)
-        return []
+        raise
+
+
+def _is_cached(board_id: int, columns: Optional[List[str]] = None) -> bool:
+    """True if a snapshot usable for these columns is cached (fresh or stale)."""
+    if not _snapshot_cache.enabled:
+        return False
+    if _snapshot_cache.peek(_snapshot_key(board_id)) is not None:
+        return True
+    return columns is not None and _snapshot_cache.peek(_snapshot_key(board_id, columns)) is not None
+
+
+def get_all_items_multi(
+    board_ids: List[int],
+    use_cache: bool = True,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all items from several boards, each tagged with board_id and board_name.
+
+    Boards with a cached snapshot are served from the cache; all other
+    boards are downloaded together through one aliased query per page
+    round (see iter_multi_board_pages) and cached per board.
+
+    Args:
+        board_ids: Monday.com board IDs
+        use_cache: Serve from / populate the board snapshot caches (default: True)
+        columns: Optional column IDs to include (default: all columns)
+
+    Returns:
+        Items of all boards, in board order
+
+    Raises:
+        RuntimeError: If API call fails
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    try:
+        by_board: Dict[int, List[Dict[str, Any]]] = {board_id: [] for board_id in board_ids}
+        remote = [board_id for board_id in board_ids if not (use_cache and _is_cached(board_id, columns))]
+        for board_id in board_ids:
+            if board_id not in remote:
+                by_board[board_id] = get_all_items(board_id, columns=columns)
+
+        if remote:
+            for board_id, page in iter_multi_board_pages(remote, columns=columns):
+                by_board[board_id].extend(page)
+            if use_cache:
+                for board_id in remote:
+                    store_snapshot(board_id, by_board[board_id], columns)
+
+        items = [tag_item(item, board_id) for board_id in board_ids for item in by_board[board_id]]
+        logger.info(
+            "Fetched %d items from %d boards (%d in one multi-board download)",
+            len(items), len(board_ids), len(remote),
+        )
+        return items
+    except Exception as e:
+        logger.error("Failed to get items from boards %s: %s", board_ids, e)
+        raise
+
+
+def _prefetch_multi(board_ids: List[int]) -> None:
+    """
+    Warm the snapshot cache of several boards in the background with one
+    fan-out download. Boards that are cached or already being prefetched
+    are left out, so concurrent cold searches download each board once.
+    """
+    with _prefetching_lock:
+        boards = [b for b in board_ids if b not in _prefetching_boards and not _is_cached(b)]
+        _prefetching_boards.update(boards)
+    if not boards:
+        return
+
+    def load() -> None:
+        try:
+            get_all_items_multi(boards)
+        except Exception as e:
+            logger.warning("Prefetching boards %s failed: %s", boards, e)
+        finally:
+            with _prefetching_lock:
+                _prefetching_boards.difference_update(boards)
+
+    threading.Thread(target=load, name="snapshot-prefetch-multi", daemon=True).start()
+
+
+def fuzzy_search_items_multi(
+    board_ids: List[int],
+    text: str,
+    limit: int = FUZZY_LIMIT,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    fuzzy_search_items across several boards, ranked together.
+
+    Only the boards held locally (mirror or cached snapshot) are matched;
+    the others are loaded in the background by one multi-board download
+    and take part from the next search on (with the snapshot cache
+    disabled, each board is downloaded instead).
+
+    Returns:
+        Up to `limit` items, best first, each tagged with board_id and
+        board_name and with a 'match_score' key
+    """
+    local = board_ids
+    if _snapshot_cache.enabled:
+        local = [board_id for board_id in board_ids if _mirror_ready(board_id) or _is_cached(board_id)]
+        _prefetch_multi([board_id for board_id in board_ids if board_id not in local])
+    candidates = [
+        tag_item(item, board_id)
+        for board_id in local
+        for item in fuzzy_search_items(board_id, text, columns=columns)
+    ]
+    return sorted(candidates, key=lambda item: -item["match_score"])[:limit]
+
+
+def search_items_multi(
+    board_ids: List[int],
+    text: str,
+    columns: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> SearchResults:
+    """
+    Search items by text on several boards at once.
+
+    Boards answerable locally (mirror or cached snapshot) are searched via
+    search_items_by_text without API calls. The remaining boards are
+    searched server-side together, one aliased query per page round, and
+    their snapshots are then warmed in the background by a single
+    multi-board download. With MONDAY_SEARCH_MODE=client, if the
+    server-side query fails, or if it finds nothing (see
+    search_items_by_text), the remaining boards are loaded together and
+    filtered locally on every column instead.
+
+    Args:
+        board_ids: Monday.com board IDs
+        text: Search term to match against item names and column values
+        columns: Optional column IDs to include in the results (default: all)
+        limit: Maximum number of results (default: MONDAY_SEARCH_MAX_RESULTS,
+            0 for no cap)
+
+    Returns:
+        SearchResults with the matching items of all boards, ranked across
+        boards as in search_items_by_text (board order within a rank), each
+        tagged with board_id and board_name; without exact matches, the
+        closest names across the boards held locally, best first, with a
+        'match_score' key (see fuzzy_search_items_multi)
+
+    Raises:
+        MondayUnavailableError: If Monday is down (circuit breaker open)
+        RuntimeError: If Monday could not be searched
+    """
+    term = (text or "").strip().lower()
+    board_ids = list(dict.fromkeys(board_ids))
+    if not term or not board_ids:
+        logger.warning("Empty search term or board list provided")
+        return SearchResults()
+
+    try:
+        by_board: Dict[int, List[Dict[str, Any]]] = {}
+        remote = []
+        for board_id in board_ids:
+            if _is_cached(board_id) or _mirror_ready(board_id):
+                by_board[board_id] = search_items_by_text(board_id, term, columns=columns, fuzzy=False, limit=0)
+            else:
+                remote.append(board_id)
+
+        if remote:
+            path = "client"
+            started = time.perf_counter()
+            matches: Optional[Dict[int, List[Dict[str, Any]]]] = None
+            if SEARCH_MODE == "server":
+                fetch_columns = None if columns is None else sorted(set(columns) | set(SEARCH_COLUMNS))
+                try:
+                    matches = {board_id: [] for board_id in remote}
+                    pages = iter_multi_board_pages(
+                        remote, query_params=build_search_query_params(term), columns=fetch_columns
+                    )
+                    for board_id, page in pages:
+                        matches[board_id].extend(
+                            project_item(item, columns) for item in page if _item_matches(item, term)
+                        )
+                    path = "server"
+                    if not any(matches.values()):
+                        logger.info("No server-side match for '%s', scanning every column", term)
+                        matches = None
+                        path = "client"
+                    elif _snapshot_cache.enabled:
+                        _prefetch_multi(remote)
+                except ComplexityBudgetExceeded:
+                    raise
+                except (RuntimeError, requests.HTTPError) as e:
+                    if isinstance(e, requests.HTTPError) and not _search_rejected(e):
+                        raise
+                    logger.warning("Server-side multi-board search failed, falling back to client-side scan: %s", e)
+                    matches = None
+                    started = time.perf_counter()
+
+            if matches is None:
+                matches = {board_id: [] for board_id in remote}
+                for item in get_all_items_multi(remote):
+                    if _item_matches(item, term):
+                        matches[item["board_id"]].append(project_item(item, columns))
+
+            by_board.update(matches)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _record_search(path, elapsed_ms)
+            logger.info(
+                "Searched %d boards in one multi-board query for '%s' (path=%s, %.1f ms)",
+                len(remote), term, path, elapsed_ms,
+            )
+
+        results = rank_results(
+            [tag_item(item, board_id) for board_id in board_ids for item in by_board[board_id]], term, limit
+        )
+        if not results and FUZZY_ENABLED:
+            results = SearchResults(fuzzy_search_items_multi(board_ids, term, columns=columns))
+        return results
+    except Exception as e:
+        logger.error("Failed to search items on boards %s: %s", board_ids, e)
+        raise
 
 
 # Optional: quick CLI test if you run `python3 monday_client.py`
@@ -167,5 +1888,6 @@ if __name__ == "__main__":
             logger.info("✅ OK! Logged in as: %s (%s)", me.get("name"), me.get("email"))
         else:
             logger.error("❌ Failed to get user info")
+        logger.info("Connection stats: %s", get_connection_stats())
     except Exception as e:
         logger.error("❌ Error testing Monday: %s", e)
@@ -0,0 +1,121 @@
+"""Typo-tolerant, ranked matching of customer names.
+
+Used when a search finds no exact substring match, e.g. because the name
+taken from the Slack message is slightly off ("Vocst", "Sorensen Byg" for
+"Sørensen Byg ApS"). Names are normalized (case, accents, æ/ø/å spelled as
+ae/oe/aa, legal forms such as ApS and A/S dropped) and compared by trigram
+similarity; a trigram index keeps each query to the candidates that share
+at least one trigram with it.
+"""
+import re
+import heapq
+import unicodedata
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+_DANISH = str.maketrans({"æ": "ae", "ø": "oe", "å": "aa"})
+_SEPARATORS_RE = re.compile(r"[^\w]+")
+_DROPPED_RE = re.compile(r"[/.'’]")
+
+# Legal forms that say nothing about which customer is meant
+LEGAL_FORMS = {"aps", "as", "ivs", "is", "ks", "ps", "amba", "smba", "fmba", "ab", "gmbh", "ltd", "inc"}
+
+# Token variants score slightly lower than a match on the whole name
+TOKEN_WEIGHT = 0.9
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a name for fuzzy comparison.
+
+    'Sørensen & Søn A/S' -> 'soerensen soen', 'Café Åen ApS' -> 'cafe aaen'
+    """
+    text = _DROPPED_RE.sub("", (text or "").lower().translate(_DANISH))
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    words = [w for w in _SEPARATORS_RE.split(text.replace("_", " ")) if w]
+    kept = [w for w in words if w not in LEGAL_FORMS]
+    return " ".join(kept or words)
+
+
+def _trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram (Dice) similarity of two names between 0 and 1, after normalization."""
+    grams_a, grams_b = _trigrams(normalize(a)), _trigrams(normalize(b))
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class FuzzyMatcher:
+    """
+    Ranked fuzzy lookup over the names (and company columns) of board items.
+
+    Every item contributes its normalized name and company texts as keys,
+    plus their single words for multi-word names, so 'vocast' still finds
+    'Vocast Nordic ApS'.
+    """
+
+    def __init__(self, items: Sequence[Mapping[str, Any]], columns: Optional[List[str]] = None) -> None:
+        self.items = items
+        wanted = set(columns or [])
+        self._key_item: List[int] = []
+        self._key_size: List[int] = []
+        self._key_weight: List[float] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for position, item in enumerate(items):
+            texts = [item.get("name") or ""]
+            if wanted:
+                texts += [cv.get("text") or "" for cv in item.get("column_values") or [] if cv.get("id") in wanted]
+            keys: Dict[str, float] = {}
+            for text in texts:
+                normalized = normalize(text)
+                if not normalized:
+                    continue
+                keys[normalized] = 1.0
+                words = normalized.split()
+                if len(words) > 1:
+                    for word in words:
+                        if len(word) >= 3:
+                            keys.setdefault(word, TOKEN_WEIGHT)
+            for key, weight in keys.items():
+                self._add_key(position, key, weight)
+
+    def _add_key(self, position: int, key: str, weight: float) -> None:
+        key_id = len(self._key_item)
+        grams = _trigrams(key)
+        self._key_item.append(position)
+        self._key_size.append(len(grams))
+        self._key_weight.append(weight)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def match(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[Tuple[Mapping[str, Any], float]]:
+        """
+        Return up to `limit` items most similar to the query, best first.
+
+        Returns:
+            (item, score) tuples with scores between min_score and 1
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        grams = _trigrams(normalized)
+
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for key_id in self._postings.get(gram, ()):
+                shared[key_id] = shared.get(key_id, 0) + 1
+
+        best: Dict[int, float] = {}
+        for key_id, count in shared.items():
+            score = 2 * count / (len(grams) + self._key_size[key_id]) * self._key_weight[key_id]
+            position = self._key_item[key_id]
+            if score >= min_score and score > best.get(position, 0.0):
+                best[position] = score
+
+        top = heapq.nlargest(limit, best.items(), key=lambda entry: (entry[1], -entry[0]))
+        return [(self.items[position], round(score, 3)) for position, score in top]
@@ -0,0 +1,279 @@
+"""Prebuilt search index over compact board snapshots.
+
+Answers the substring searches of search_items_by_text without scanning
+every item: a trigram index narrows a query down to a few candidate items,
+which are then checked against the snapshot, so results are exactly those
+of a full scan. A token index covers one- and two-letter queries.
+
+Usage:
+    python3 monday_index.py benchmark [--sizes 1000 10000 100000] [--columns 12]
+"""
+import re
+import sys
+import time
+import logging
+import argparse
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from monday_snapshot import BoardSnapshot, ItemRecord
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+_WORD_RE = re.compile(r"^\w+$")
+
+# Rebuild instead of patching once this share of indexed documents is dead
+REBUILD_DEAD_RATIO = 0.5
+
+
+def trigrams(text: str) -> Set[Tuple[str, str, str]]:
+    """Return the set of three-character substrings of a lower-cased text, as tuples."""
+    # zip builds the tuples in C, which makes indexing a large board several times faster
+    return set(zip(text, text[1:], text[2:]))
+
+
+class SnapshotIndex:
+    """
+    Trigram and token index over the items of a BoardSnapshot.
+
+    Items are numbered as documents in the order they were indexed;
+    postings are arrays of document numbers. Snapshots are immutable, so
+    the index follows a board through its versions: advance() moves it
+    from one snapshot to the next by indexing the changed items as new
+    documents and marking replaced and removed ones dead, instead of
+    rebuilding. Stale postings left behind are harmless because every
+    candidate is checked against the current snapshot.
+    """
+
+    def __init__(self, snapshot: BoardSnapshot) -> None:
+        self._lock = threading.Lock()
+        self._build(snapshot)
+
+    def _build(self, snapshot: BoardSnapshot) -> None:
+        self.snapshot = snapshot
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_of: Dict[str, int] = {}
+        self._trigrams: Dict[Tuple[str, str, str], array] = {}
+        self._tokens: Dict[str, array] = {}
+        self._dead = 0
+        for row, item in enumerate(snapshot):
+            self._add(str(item["id"]), snapshot.texts(row))
+
+    def _add(self, item_id: str, texts: Iterable[str]) -> None:
+        doc = len(self._doc_ids)
+        self._doc_ids.append(item_id)
+        self._doc_of[item_id] = doc
+
+        # No per-text cache: keeping a set alive per distinct text makes the
+        # garbage collector's full passes dominate on large boards.
+        doc_grams: Set[Tuple[str, str, str]] = set()
+        doc_tokens: Set[str] = set()
+        for text in texts:
+            lowered = text.lower()
+            doc_grams.update(trigrams(lowered))
+            doc_tokens.update(_TOKEN_RE.findall(lowered))
+
+        for gram in doc_grams:
+            postings = self._trigrams.get(gram)
+            if postings is None:
+                postings = self._trigrams[gram] = array("I")
+            postings.append(doc)
+        for token in doc_tokens:
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = array("I")
+            postings.append(doc)
+
+    def covers(self, snapshot: BoardSnapshot) -> bool:
+        """True if the index is up to date with this snapshot."""
+        return self.snapshot is snapshot
+
+    def advance(
+        self,
+        previous: BoardSnapshot,
+        snapshot: BoardSnapshot,
+        changed: List[Mapping[str, Any]],
+        removed: Set[str],
+    ) -> bool:
+        """
+        Move the index from `previous` to `snapshot`, which is `previous`
+        with the given delta merged in.
+
+        Returns:
+            False if the index was not at `previous` (it is then left alone
+            and rebuilt by the caller when next needed)
+        """
+        with self._lock:
+            if self.snapshot is not previous:
+                return False
+            for item_id in set(removed) | {str(item.get("id")) for item in changed}:
+                doc = self._doc_of.pop(item_id, None)
+                if doc is not None:
+                    self._doc_ids[doc] = None
+                    self._dead += 1
+
+            if self._dead > len(self._doc_ids) * REBUILD_DEAD_RATIO:
+                self._build(snapshot)
+                return True
+
+            for item in changed:
+                item_id = str(item.get("id"))
+                row = snapshot.row_of(item_id)
+                if row is not None:
+                    self._add(item_id, snapshot.texts(row))
+            self.snapshot = snapshot
+            return True
+
+    def _candidates(self, term: str) -> Optional[Set[int]]:
+        """Documents that may contain the term, or None if the index cannot narrow it down."""
+        if len(term) >= 3:
+            postings = []
+            for gram in trigrams(term):
+                docs = self._trigrams.get(gram)
+                if docs is None:
+                    return set()
+                postings.append(docs)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            # Intersect while it pays off; the substring check does the rest
+            for docs in postings[1:]:
+                if len(candidates) < 64 or len(docs) > 8 * len(postings[0]):
+                    break
+                candidates.intersection_update(docs)
+            return candidates
+
+        if _WORD_RE.match(term):
+            # A match of a word-only term always lies inside a single token
+            in_tokens: Set[int] = set()
+            for token, docs in self._tokens.items():
+                if term in token:
+                    in_tokens.update(docs)
+            return in_tokens
+        return None
+
+    def search(self, term: str) -> List[ItemRecord]:
+        """
+        Return the items whose name or any column text contains the
+        lower-cased term, in board order (same result as BoardSnapshot.search).
+        """
+        with self._lock:
+            snapshot = self.snapshot
+            candidates = self._candidates(term)
+            if candidates is None:
+                return snapshot.search(term)
+            item_ids = [self._doc_ids[doc] for doc in candidates]
+
+        rows = []
+        for item_id in item_ids:
+            row = snapshot.row_of(item_id) if item_id is not None else None
+            if row is not None and ItemRecord(snapshot, row).matches(term):
+                rows.append(row)
+        return [ItemRecord(snapshot, row) for row in sorted(rows)]
+
+    def lookup_token(self, token: str) -> List[ItemRecord]:
+        """Return the items containing the whole word `token`, in board order."""
+        with self._lock:
+            snapshot = self.snapshot
+            item_ids = [self._doc_ids[doc] for doc in self._tokens.get(token.lower(), ())]
+        rows = {snapshot.row_of(item_id) for item_id in item_ids if item_id is not None}
+        return [ItemRecord(snapshot, row) for row in sorted(rows - {None})]
+
+    def __sizeof__(self) -> int:
+        # Deep size of the postings, so the snapshot cache can count the index against its limit
+        with self._lock:
+            size = object.__sizeof__(self) + sys.getsizeof(self._doc_ids) + sys.getsizeof(self._doc_of)
+            size += sum(sys.getsizeof(item_id) for item_id in self._doc_of)
+            for postings in (self._trigrams, self._tokens):
+                size += sys.getsizeof(postings)
+                size += sum(sys.getsizeof(key) + sys.getsizeof(docs) for key, docs in postings.items())
+            return size
+
+    def stats(self) -> Dict[str, int]:
+        """Return document, dead document, trigram and token counts."""
+        with self._lock:
+            return {
+                "documents": len(self._doc_ids) - self._dead,
+                "dead": self._dead,
+                "trigrams": len(self._trigrams),
+                "tokens": len(self._tokens),
+                "postings": sum(len(docs) for docs in self._trigrams.values()),
+            }
+
+
+def run_benchmark(sizes: List[int], columns: int, terms: List[str], repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Time searches on synthetic boards of growing size: a per-item scan of
+    item dicts (the old path), a column scan of the snapshot, and the index.
+
+    Returns:
+        One row per size and term with dict_ms, snapshot_ms, index_ms, build_ms and matches
+    """
+    import json
+
+    from monday_snapshot import _synthetic_board
+
+    def per_query_ms(fn: Any) -> float:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+    def dict_scan(items: List[Dict[str, Any]], term: str) -> List[Dict[str, Any]]:
+        return [
+            item for item in items
+            if term in (item.get("name") or "").lower()
+            or any(term in (cv.get("text") or "").lower() for cv in item.get("column_values") or [])
+        ]
+
+    results = []
+    for count in sizes:
+        items = json.loads(_synthetic_board(count, columns))
+        snapshot = BoardSnapshot.from_items(items)
+        started = time.perf_counter()
+        index = SnapshotIndex(snapshot)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for term in terms:
+            matches = len(index.search(term))
+            assert matches == len(snapshot.search(term)) == len(dict_scan(items, term))
+            results.append({
+                "items": count,
+                "term": term,
+                "matches": matches,
+                "dict_ms": per_query_ms(lambda: dict_scan(items, term)),
+                "snapshot_ms": per_query_ms(lambda: snapshot.search(term)),
+                "index_ms": per_query_ms(lambda: index.search(term)),
+                "build_ms": build_ms,
+            })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point for the search index benchmark."""
+    parser = argparse.ArgumentParser(description="Search index over Monday board snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench_cmd = sub.add_parser("benchmark", help="Compare query time of full scans and the index")
+    bench_cmd.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    bench_cmd.add_argument("--columns", type=int, default=12)
+    bench_cmd.add_argument("--terms", nargs="+", default=["lead 4711", "kontakt42@", "firma 9", "zz"])
+
+    args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        print(f"{'items':>8}  {'term':<12} {'matches':>7}  {'dicts ms':>9}  {'scan ms':>8}  {'index ms':>8}  {'build ms':>8}")
+        for row in run_benchmark(args.sizes, args.columns, args.terms):
+            print(
+                f"{row['items']:>8}  {row['term']:<12} {row['matches']:>7}  {row['dict_ms']:>9.2f}"
+                f"  {row['snapshot_ms']:>8.2f}  {row['index_ms']:>8.3f}  {row['build_ms']:>8.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import json
+import logging
+from typing import IO, Any, Dict, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+# Optional: orjson parses large Monday responses several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ijson decodes a response incrementally while it is being downloaded
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+STREAMING_AVAILABLE = ijson is not None
+
+_SCALAR_EVENTS = {"string", "number", "boolean", "null"}
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the fastest available decoder."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def stream_items(
+    fp: IO[bytes],
+    items_prefix: str,
+    captured: Dict[str, Any],
+    capture: Dict[str, str],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of one array of a JSON document while it is being read.
+
+    Only one item is held in memory at a time. Values elsewhere in the
+    document that the caller needs (cursor, complexity, errors) are stored
+    in `captured` as the parser passes them; values after the array are
+    only there once the generator is exhausted.
+
+    Args:
+        fp: Binary file-like object with the JSON body (e.g. a streamed HTTP response)
+        items_prefix: ijson prefix of the array's items, e.g. 'data.next_items_page.items.item'
+        captured: Dictionary that receives the captured values by name
+        capture: Names mapped to the ijson prefix of the value to capture
+
+    Yields:
+        The array's items as dictionaries
+
+    Raises:
+        RuntimeError: If ijson is not installed
+        ValueError: If the body is not valid JSON
+    """
+    if ijson is None:
+        raise RuntimeError("Streaming JSON decoding needs the 'ijson' package")
+
+    targets = {prefix: name for name, prefix in capture.items()}
+    builder = None
+    building = None
+    for prefix, event, value in ijson.parse(fp, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == building and event in ("end_map", "end_array"):
+                if building == items_prefix:
+                    yield builder.value
+                else:
+                    captured[targets[building]] = builder.value
+                builder = building = None
+        elif prefix == items_prefix and event == "start_map":
+            builder, building = ijson.ObjectBuilder(), prefix
+            builder.event(event, value)
+        elif prefix in targets:
+            if event in _SCALAR_EVENTS:
+                captured[targets[prefix]] = value
+            elif event in ("start_map", "start_array"):
+                builder, building = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
@@ -0,0 +1,383 @@
+"""Per-call instrumentation of Monday API requests.
+
+Every Monday call produces one CallRecord: operation name, wall time
+(including retries), response bytes, item count, complexity consumed,
+outcome and the labels of the caller (e.g. the Slack intent, set with
+labels()). A caller that waited for an identical call already in flight
+(see SingleFlight) gets a record of its own with outcome 'coalesced'.
+Records go to pluggable sinks:
+
+    histogram   in-process histograms and counters (get_sink("histogram").snapshot())
+    log         one structured JSON log line per call
+    prometheus  the histogram sink, exposed in Prometheus text format on
+                MONDAY_METRICS_PORT (see start_exporter)
+
+Custom sinks are any object with a record(call) method, added with add_sink.
+"""
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from monday_ratelimit import ComplexityBudgetExceeded
+from monday_resilience import MondayUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated sinks to enable: histogram, log (empty = record nothing)
+METRICS_SINKS = [s.strip().lower() for s in os.getenv("MONDAY_METRICS_SINKS", "histogram").split(",") if s.strip()]
+# Serve the histograms in Prometheus text format on this port (0 = off)
+METRICS_PORT = int(os.getenv("MONDAY_METRICS_PORT", "0"))
+# Local only by default; scrape through a proxy (or set 0.0.0.0 deliberately)
+METRICS_HOST = os.getenv("MONDAY_METRICS_HOST", "127.0.0.1")
+
+# Upper bounds (seconds) of the call duration histogram buckets
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_call: contextvars.ContextVar[Optional["CallRecord"]] = contextvars.ContextVar("monday_call", default=None)
+_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("monday_labels", default={})
+
+
+class CallRecord:
+    """Measurements of one Monday call, filled in while the call runs."""
+
+    __slots__ = ("operation", "labels", "duration_ms", "bytes", "items", "complexity", "attempts", "outcome")
+
+    def __init__(self, operation: str, labels: Dict[str, str]) -> None:
+        self.operation = operation
+        self.labels = labels
+        self.duration_ms = 0.0
+        self.bytes = 0
+        self.items = 0
+        # Complexity points charged by Monday (None if the response had no complexity block)
+        self.complexity: Optional[int] = None
+        self.attempts = 0
+        self.outcome = "ok"
+
+    def note_response(self, size: int, complexity: Optional[Dict[str, Any]]) -> None:
+        """Add the body size and complexity of one HTTP response to the record."""
+        self.bytes += size
+        cost = (complexity or {}).get("query")
+        if cost is not None:
+            self.complexity = (self.complexity or 0) + int(cost)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the record as a flat dictionary (labels merged in)."""
+        record = {name: getattr(self, name) for name in self.__slots__ if name != "labels"}
+        record.update(self.labels)
+        return record
+
+
+def outcome_of(exc: BaseException) -> str:
+    """Classify the exception that ended a call as a short outcome label."""
+    if isinstance(exc, ComplexityBudgetExceeded):
+        return "shed"
+    if isinstance(exc, MondayUnavailableError):
+        return "breaker_open"
+    # requests exposes the status on e.response, aiohttp on e.status
+    status = getattr(getattr(exc, "response", None), "status_code", None) or getattr(exc, "status", None)
+    if isinstance(status, int):
+        return f"http_{status}"
+    if isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__:
+        return "timeout"
+    if "Connection" in type(exc).__name__ or "Connector" in type(exc).__name__:
+        return "connection_error"
+    if isinstance(exc, RuntimeError):
+        return "graphql_error"
+    return "error"
+
+
+def count_items(data: Any) -> int:
+    """Count the items in a GraphQL 'data' payload (every list under an 'items' key)."""
+    if isinstance(data, dict):
+        return sum(
+            len(value) if key == "items" and isinstance(value, list) else count_items(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return sum(count_items(value) for value in data if isinstance(value, (dict, list)))
+    return 0
+
+
+@contextmanager
+def labels(**values: str) -> Iterator[None]:
+    """
+    Attach labels (e.g. intent='email_followup') to every Monday call made
+    in this context, including threads and tasks started from it that copy
+    the context (asyncio tasks, asyncio.to_thread).
+    """
+    token = _labels.set({**_labels.get(), **{name: str(value) for name, value in values.items()}})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+def enabled() -> bool:
+    """True if at least one sink is registered."""
+    return bool(_sinks)
+
+
+def new_call(operation: str) -> CallRecord:
+    """Start a record for a call, with the labels of the current context."""
+    return CallRecord(operation, _labels.get())
+
+
+def finish_call(call: CallRecord, started: float, error: Optional[BaseException] = None) -> None:
+    """Complete a record started at perf_counter() time `started` and emit it."""
+    call.duration_ms = (time.perf_counter() - started) * 1000
+    if error is not None:
+        call.outcome = outcome_of(error)
+    emit(call)
+
+
+@contextmanager
+def track_call(operation: str, call: Optional[CallRecord] = None) -> Iterator[CallRecord]:
+    """
+    Measure one Monday call and emit its record to the sinks when it ends.
+
+    The record is available to the code sending the request through
+    current_call(). If `call` is given, it is yielded as is and neither
+    timed nor emitted here: the caller owns it (used for streamed
+    responses, whose body is read after the call returns).
+    """
+    if call is not None:
+        yield call
+        return
+
+    call = new_call(operation)
+    token = _current_call.set(call)
+    started = time.perf_counter()
+    error: Optional[BaseException] = None
+    try:
+        yield call
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_call.reset(token)
+        finish_call(call, started, error)
+
+
+def current_call() -> Optional[CallRecord]:
+    """Return the record of the Monday call being made in this context, if any."""
+    return _current_call.get()
+
+
+class HistogramSink:
+    """
+    In-process aggregation of call records: a duration histogram per
+    operation and label set, plus totals of calls (per outcome), bytes,
+    items and complexity.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+
+    def record(self, call: CallRecord) -> None:
+        key = (("operation", call.operation),) + tuple(sorted(call.labels.items()))
+        seconds = call.duration_ms / 1000
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum_seconds": 0.0,
+                    "outcomes": {},
+                    "bytes": 0,
+                    "items": 0,
+                    "complexity": 0,
+                }
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["buckets"][index] += 1
+            series["count"] += 1
+            series["sum_seconds"] += seconds
+            series["outcomes"][call.outcome] = series["outcomes"].get(call.outcome, 0) + 1
+            series["bytes"] += call.bytes
+            series["items"] += call.items
+            series["complexity"] += call.complexity or 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return a copy of every series with its labels, counters and estimated p50/p95 in ms."""
+        with self._lock:
+            series = [
+                (dict(key), dict(values, buckets=list(values["buckets"]), outcomes=dict(values["outcomes"])))
+                for key, values in self._series.items()
+            ]
+        result = []
+        for key, values in series:
+            values.update(key)
+            values["p50_ms"] = self._quantile(values, 0.5)
+            values["p95_ms"] = self._quantile(values, 0.95)
+            result.append(values)
+        return result
+
+    def _quantile(self, series: Dict[str, Any], q: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the q-quantile, None if above the last bucket."""
+        rank = q * series["count"]
+        for bound, cumulative in zip(self.buckets, series["buckets"]):
+            if cumulative >= rank:
+                return bound * 1000
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class LogSink:
+    """Writes one structured JSON line per call to the 'monday_metrics' logger."""
+
+    def __init__(self, level: int = logging.INFO) -> None:
+        self.level = level
+
+    def record(self, call: CallRecord) -> None:
+        if logger.isEnabledFor(self.level):
+            logger.log(self.level, "monday_call %s", json.dumps(call.as_dict(), sort_keys=True))
+
+
+_SINK_TYPES = {"histogram": HistogramSink, "log": LogSink}
+_sinks: Dict[str, Any] = {}
+_sinks_lock = threading.Lock()
+_exporter: Optional[ThreadingHTTPServer] = None
+# Extra metrics for the exporter: name -> function returning Prometheus text lines
+_collectors: Dict[str, Callable[[], List[str]]] = {}
+
+
+def add_sink(name: str, sink: Any) -> None:
+    """Register a sink (any object with a record(call) method) under a name."""
+    with _sinks_lock:
+        _sinks[name] = sink
+
+
+def remove_sink(name: str) -> None:
+    """Unregister a sink; a no-op if it is not registered."""
+    with _sinks_lock:
+        _sinks.pop(name, None)
+
+
+def add_collector(name: str, collect: Callable[[], List[str]]) -> None:
+    """Register a function whose Prometheus text lines are appended to every /metrics scrape."""
+    with _sinks_lock:
+        _collectors[name] = collect
+
+
+def get_sink(name: str) -> Optional[Any]:
+    """Return a registered sink by name."""
+    return _sinks.get(name)
+
+
+def emit(call: CallRecord) -> None:
+    """Pass a record to every sink; a failing sink never fails the Monday call."""
+    for name, sink in list(_sinks.items()):
+        try:
+            sink.record(call)
+        except Exception as e:
+            logger.warning("Metrics sink '%s' failed: %s", name, e)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(sink: Optional[HistogramSink] = None) -> str:
+    """Render the histogram sink, plus any registered collectors, in the Prometheus text exposition format."""
+    sink = sink or get_sink("histogram")
+    lines = [] if sink is None else _histogram_lines(sink)
+    for name, collect in list(_collectors.items()):
+        try:
+            lines += collect()
+        except Exception as e:
+            logger.warning("Metrics collector '%s' failed: %s", name, e)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _histogram_lines(sink: HistogramSink) -> List[str]:
+    """Prometheus text lines of the call duration histogram and the call counters."""
+
+    def label_text(series: Dict[str, Any], extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = {name: value for name, value in series.items() if isinstance(value, str)}
+        pairs.update(extra or {})
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in sorted(pairs.items())) + "}"
+
+    lines = [
+        "# HELP monday_call_duration_seconds Wall time of Monday API calls, including retries.",
+        "# TYPE monday_call_duration_seconds histogram",
+    ]
+    snapshot = sink.snapshot()
+    for series in snapshot:
+        for bound, cumulative in zip(sink.buckets, series["buckets"]):
+            lines.append(f"monday_call_duration_seconds_bucket{label_text(series, {'le': str(bound)})} {cumulative}")
+        lines.append(f"monday_call_duration_seconds_bucket{label_text(series, {'le': '+Inf'})} {series['count']}")
+        lines.append(f"monday_call_duration_seconds_sum{label_text(series)} {series['sum_seconds']:.6f}")
+        lines.append(f"monday_call_duration_seconds_count{label_text(series)} {series['count']}")
+
+    lines += ["# HELP monday_calls_total Monday API calls by outcome.", "# TYPE monday_calls_total counter"]
+    for series in snapshot:
+        for outcome, count in sorted(series["outcomes"].items()):
+            lines.append(f"monday_calls_total{label_text(series, {'outcome': outcome})} {count}")
+
+    for field, help_text in (
+        ("bytes", "Response bytes received from Monday."),
+        ("items", "Items returned by Monday."),
+        ("complexity", "Complexity points charged by Monday."),
+    ):
+        name = f"monday_response_{field}_total" if field == "bytes" else f"monday_{field}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f"{name}{label_text(series)} {series[field]}" for series in snapshot]
+    return lines
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("Metrics scrape: " + format, *args)
+
+
+def start_exporter(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics in Prometheus text format from a background thread.
+
+    Enables the histogram sink if needed. Does nothing if port is 0 or the
+    exporter is already running.
+
+    Returns:
+        The HTTP server, or None if not started
+    """
+    global _exporter
+    if not port or _exporter is not None:
+        return _exporter
+    if get_sink("histogram") is None:
+        add_sink("histogram", HistogramSink())
+    _exporter = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=_exporter.serve_forever, name="monday-metrics", daemon=True).start()
+    logger.info("Serving Monday metrics on http://%s:%d/metrics", host, port)
+    return _exporter
+
+
+for _name in METRICS_SINKS:
+    if _name in _SINK_TYPES:
+        add_sink(_name, _SINK_TYPES[_name]())
+    elif _name == "prometheus":
+        add_sink("histogram", _sinks.get("histogram") or HistogramSink())
+    else:
+        logger.warning("Unknown metrics sink '%s' in MONDAY_METRICS_SINKS", _name)
@@ -0,0 +1,464 @@
+"""Local SQLite mirror of a Monday.com board with FTS5 full-text search.
+
+Usage:
+    python3 monday_mirror.py resync [--board BOARD_ID]
+    python3 monday_mirror.py delta [--board BOARD_ID]
+    python3 monday_mirror.py stats
+    python3 monday_mirror.py search "vocast" [--board BOARD_ID] [--limit N]
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+MIRROR_PATH = os.getenv("MONDAY_MIRROR_PATH", "monday_mirror.db")
+SYNC_MODE = os.getenv("MONDAY_SYNC_MODE", "delta").strip().lower()
+FULL_RESYNC_INTERVAL = float(os.getenv("MONDAY_FULL_RESYNC_INTERVAL", "3600"))
+CUSTOMER_BOARD_ID = int(os.getenv("MONDAY_CUSTOMER_BOARD_ID", "5085798849"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    board_id INTEGER NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    updated_at TEXT,
+    position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_items_board ON items(board_id, position);
+
+CREATE TABLE IF NOT EXISTS column_values (
+    item_id INTEGER NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    column_id TEXT NOT NULL,
+    text TEXT,
+    PRIMARY KEY (item_id, column_id)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    name,
+    body,
+    tokenize = 'unicode61 remove_diacritics 0',
+    prefix = '2 3'
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    board_id INTEGER PRIMARY KEY,
+    last_full_sync TEXT,
+    last_delta_sync TEXT,
+    high_water_mark TEXT,
+    item_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added after the first release of the mirror: (table, column, definition)
+MIGRATIONS = [
+    ("items", "updated_at", "TEXT"),
+    ("sync_state", "last_delta_sync", "TEXT"),
+    ("sync_state", "high_water_mark", "TEXT"),
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every token must match as a prefix."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+class MondayMirror:
+    """
+    SQLite mirror of Monday board items.
+
+    Items and their column values live in normalized tables; the FTS5
+    table items_fts (rowid = item ID) indexes the item name and the
+    concatenated column texts for BM25-ranked search.
+    """
+
+    def __init__(self, path: str = MIRROR_PATH) -> None:
+        self.path = path
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            for table, column, definition in MIGRATIONS:
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # -- writes ----------------------------------------------------------
+
+    def _insert_item(self, conn: sqlite3.Connection, board_id: int, item: Dict[str, Any], position: int) -> None:
+        item_id = int(item["id"])
+        name = item.get("name") or ""
+        cols = [(cv.get("id"), cv.get("text")) for cv in (item.get("column_values") or []) if cv.get("id")]
+
+        conn.execute(
+            "INSERT OR REPLACE INTO items (id, board_id, name, updated_at, position) VALUES (?, ?, ?, ?, ?)",
+            (item_id, board_id, name, item.get("updated_at"), position),
+        )
+        conn.execute("DELETE FROM column_values WHERE item_id = ?", (item_id,))
+        conn.executemany(
+            "INSERT INTO column_values (item_id, column_id, text) VALUES (?, ?, ?)",
+            [(item_id, column_id, text) for column_id, text in cols],
+        )
+        body = "\n".join(text for _, text in cols if text)
+        conn.execute("DELETE FROM items_fts WHERE rowid = ?", (item_id,))
+        conn.execute("INSERT INTO items_fts (rowid, name, body) VALUES (?, ?, ?)", (item_id, name, body))
+
+    def resync(self, board_id: int = CUSTOMER_BOARD_ID) -> int:
+        """
+        Replace the mirrored copy of a board with a fresh full download.
+
+        Pages are written as they stream in, inside one transaction, so
+        readers keep seeing the previous copy until the resync commits.
+
+        Returns:
+            Number of items mirrored
+
+        Raises:
+            RuntimeError: If the Monday API call fails (the old copy is kept)
+        """
+        from monday_client import iter_item_pages, high_water_mark
+
+        started = time.perf_counter()
+        count = 0
+        mark: Optional[str] = None
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM items_fts WHERE rowid IN (SELECT id FROM items WHERE board_id = ?)",
+                (board_id,),
+            )
+            conn.execute("DELETE FROM items WHERE board_id = ?", (board_id,))
+            for page in iter_item_pages(board_id):
+                for item in page:
+                    self._insert_item(conn, board_id, item, count)
+                    count += 1
+                mark = high_water_mark(page, mark)
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(board_id, last_full_sync, last_delta_sync, high_water_mark, item_count) "
+                "VALUES (?, ?, NULL, ?, ?)",
+                (board_id, _utcnow(), mark, count),
+            )
+
+        logger.info(
+            "Mirrored %d items from board %d in %.1f s", count, board_id, time.perf_counter() - started
+        )
+        return count
+
+    def delta_sync(self, board_id: int = CUSTOMER_BOARD_ID) -> int:
+        """
+        Patch the mirror with only the items changed since the stored
+        high-water mark, and drop items removed from the board since then.
+
+        Falls back to a full resync when the board has never been synced.
+
+        Returns:
+            Number of items upserted or removed
+
+        Raises:
+            RuntimeError: If the Monday API call fails (the mirror is left unchanged)
+        """
+        from monday_client import iter_items_updated_since, get_removed_item_ids_since, high_water_mark
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT high_water_mark FROM sync_state WHERE board_id = ?", (board_id,)
+            ).fetchone()
+        since = row["high_water_mark"] if row else None
+        if not since:
+            logger.info("No high-water mark for board %d, doing a full resync", board_id)
+            return self.resync(board_id)
+
+        started = time.perf_counter()
+        changed = list(iter_items_updated_since(board_id, since))
+        removed = get_removed_item_ids_since(board_id, since)
+
+        self.apply_changes(board_id, changed, removed)
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE sync_state SET last_delta_sync = ?, high_water_mark = ? WHERE board_id = ?",
+                (_utcnow(), high_water_mark(changed, since), board_id),
+            )
+
+        logger.info(
+            "Delta-synced board %d: %d changed, %d removed in %.1f s",
+            board_id, len(changed), len(removed), time.perf_counter() - started,
+        )
+        return len(changed) + len(removed)
+
+    def apply_changes(
+        self,
+        board_id: int,
+        changed: List[Dict[str, Any]],
+        removed: Optional[Set[str]] = None,
+    ) -> None:
+        """
+        Upsert changed items (new ones are appended) and delete removed item
+        IDs in one transaction, keeping the board's item count current.
+        """
+        removed = removed or set()
+        with self._write_lock, self._connect() as conn:
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM items WHERE board_id = ?", (board_id,)
+            ).fetchone()[0]
+            for item in changed:
+                if str(item.get("id")) in removed:
+                    continue
+                existing = conn.execute("SELECT position FROM items WHERE id = ?", (int(item["id"]),)).fetchone()
+                if existing is not None:
+                    self._insert_item(conn, board_id, item, existing["position"])
+                else:
+                    self._insert_item(conn, board_id, item, position)
+                    position += 1
+            for item_id in removed:
+                conn.execute("DELETE FROM items_fts WHERE rowid = ?", (int(item_id),))
+                conn.execute("DELETE FROM items WHERE id = ? AND board_id = ?", (int(item_id), board_id))
+            count = conn.execute("SELECT COUNT(*) FROM items WHERE board_id = ?", (board_id,)).fetchone()[0]
+            conn.execute("UPDATE sync_state SET item_count = ? WHERE board_id = ?", (count, board_id))
+
+    def sync(self, board_id: int = CUSTOMER_BOARD_ID) -> int:
+        """
+        Bring the mirror up to date according to MONDAY_SYNC_MODE: a delta
+        sync, unless the mode is 'full' or the last full resync is older
+        than MONDAY_FULL_RESYNC_INTERVAL.
+        """
+        if SYNC_MODE == "delta":
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT last_full_sync FROM sync_state WHERE board_id = ?", (board_id,)
+                ).fetchone()
+            if row and row["last_full_sync"]:
+                last_full = datetime.strptime(row["last_full_sync"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+                if (datetime.now(timezone.utc) - last_full).total_seconds() < FULL_RESYNC_INTERVAL:
+                    return self.delta_sync(board_id)
+        return self.resync(board_id)
+
+    # -- reads -----------------------------------------------------------
+
+    def _load_items(self, conn: sqlite3.Connection, ids: List[int]) -> List[Dict[str, Any]]:
+        """Rebuild API-shaped item dicts for the given IDs, preserving their order."""
+        if not ids:
+            return []
+        items: Dict[int, Dict[str, Any]] = {}
+        for chunk_start in range(0, len(ids), 500):
+            chunk = ids[chunk_start:chunk_start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT id, name FROM items WHERE id IN ({marks})", chunk):
+                items[row["id"]] = {"id": str(row["id"]), "name": row["name"], "column_values": []}
+            for row in conn.execute(
+                f"SELECT item_id, column_id, text FROM column_values WHERE item_id IN ({marks}) "
+                "ORDER BY item_id, rowid",
+                chunk,
+            ):
+                items[row["item_id"]]["column_values"].append({"id": row["column_id"], "text": row["text"]})
+        return [items[i] for i in ids if i in items]
+
+    def is_populated(self, board_id: int) -> bool:
+        """True once the board has completed at least one full resync."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_full_sync FROM sync_state WHERE board_id = ?", (board_id,)
+            ).fetchone()
+            return bool(row and row["last_full_sync"])
+
+    def revision(self, board_id: int) -> Tuple[Any, ...]:
+        """
+        A value that changes whenever the mirrored copy of a board does
+        (resyncs, delta syncs and applied webhook changes), for callers
+        that keep data derived from get_items.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_full_sync, last_delta_sync, item_count, "
+                "(SELECT MAX(updated_at) FROM items WHERE board_id = ?) "
+                "FROM sync_state WHERE board_id = ?",
+                (board_id, board_id),
+            ).fetchone()
+            return tuple(row) if row else ()
+
+    def get_items(self, board_id: int) -> List[Dict[str, Any]]:
+        """Return every mirrored item of a board in Monday order."""
+        with self._connect() as conn:
+            ids = [
+                row["id"]
+                for row in conn.execute(
+                    "SELECT id FROM items WHERE board_id = ? ORDER BY position", (board_id,)
+                )
+            ]
+            return self._load_items(conn, ids)
+
+    def search(self, board_id: int, text: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Full-text search over item names and text columns, best match first.
+
+        Every token of the search text must match (as a word prefix); results
+        are ranked with BM25, weighting the item name above column texts. If
+        the token query finds nothing, a plain substring match is tried so
+        mid-word fragments still resolve.
+
+        Args:
+            board_id: The Monday.com board ID
+            text: Search term
+            limit: Optional maximum number of results
+
+        Returns:
+            List of matching item dictionaries (same shape as the API)
+        """
+        term = (text or "").strip()
+        if not term:
+            return []
+
+        sql_limit = -1 if limit is None else limit
+        with self._connect() as conn:
+            ids: List[int] = []
+            match = _fts_query(term)
+            if match:
+                ids = [
+                    row["rowid"]
+                    for row in conn.execute(
+                        "SELECT items_fts.rowid AS rowid FROM items_fts "
+                        "JOIN items ON items.id = items_fts.rowid "
+                        "WHERE items_fts MATCH ? AND items.board_id = ? "
+                        "ORDER BY bm25(items_fts, 10.0, 1.0) LIMIT ?",
+                        (match, board_id, sql_limit),
+                    )
+                ]
+            if not ids:
+                pattern = "%" + term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                ids = [
+                    row["id"]
+                    for row in conn.execute(
+                        "SELECT DISTINCT items.id AS id FROM items "
+                        "LEFT JOIN column_values ON column_values.item_id = items.id "
+                        "WHERE items.board_id = ? AND (lower(items.name) LIKE ? ESCAPE '\\' "
+                        "OR lower(column_values.text) LIKE ? ESCAPE '\\') "
+                        "ORDER BY items.position LIMIT ?",
+                        (board_id, pattern, pattern, sql_limit),
+                    )
+                ]
+            return self._load_items(conn, ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-board item counts and sync timestamps plus the database size."""
+        with self._connect() as conn:
+            boards = [dict(row) for row in conn.execute("SELECT * FROM sync_state ORDER BY board_id")]
+            column_count = conn.execute("SELECT COUNT(*) FROM column_values").fetchone()[0]
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"path": self.path, "bytes": size, "column_values": column_count, "boards": boards}
+
+
+_mirror: Optional[MondayMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> MondayMirror:
+    """Return the process-wide mirror at MONDAY_MIRROR_PATH."""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = MondayMirror(MIRROR_PATH)
+    return _mirror
+
+
+def start_background_sync(board_id: int, interval: float) -> threading.Thread:
+    """
+    Keep the mirror of a board up to date from a daemon thread.
+
+    Syncs immediately and then every `interval` seconds (delta or full,
+    see MondayMirror.sync); failures are logged and retried on the next tick.
+    """
+    def _run() -> None:
+        mirror = get_mirror()
+        while True:
+            try:
+                mirror.sync(board_id)
+            except Exception as e:
+                logger.error("Background mirror sync of board %d failed: %s", board_id, e)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_run, name=f"mirror-sync-{board_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point for resyncing and inspecting the mirror."""
+    parser = argparse.ArgumentParser(description="Local SQLite mirror of a Monday.com board")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    resync_cmd = sub.add_parser("resync", help="Download the full board into the mirror")
+    resync_cmd.add_argument("--board", type=int, default=CUSTOMER_BOARD_ID)
+
+    delta_cmd = sub.add_parser("delta", help="Apply only the items changed since the last sync")
+    delta_cmd.add_argument("--board", type=int, default=CUSTOMER_BOARD_ID)
+
+    sub.add_parser("stats", help="Show what is stored in the mirror")
+
+    search_cmd = sub.add_parser("search", help="Search the mirror")
+    search_cmd.add_argument("text")
+    search_cmd.add_argument("--board", type=int, default=CUSTOMER_BOARD_ID)
+    search_cmd.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args(argv)
+    mirror = get_mirror()
+
+    if args.command in ("resync", "delta"):
+        try:
+            if args.command == "resync":
+                mirror.resync(args.board)
+            else:
+                mirror.delta_sync(args.board)
+        except Exception as e:
+            logger.error("❌ %s failed: %s", args.command.capitalize(), e)
+            return 1
+    elif args.command == "stats":
+        print(json.dumps(mirror.stats(), indent=2))
+    elif args.command == "search":
+        started = time.perf_counter()
+        results = mirror.search(args.board, args.text, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for item in results:
+            print(f"{item['id']}\t{item['name']}")
+        logger.info("%d result(s) in %.1f ms", len(results), elapsed_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
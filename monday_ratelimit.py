@@ -0,0 +1,167 @@
+import re
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Added to every query so Monday reports the budget alongside the data
+COMPLEXITY_FIELD = "complexity { before after reset_in_x_seconds query }"
+
+_RESET_IN_RE = re.compile(r"reset in (\d+) seconds?", re.IGNORECASE)
+
+
+class ComplexityBudgetExceeded(RuntimeError):
+    """Raised when a Monday call is shed because the complexity budget is exhausted."""
+
+
+def with_complexity(query: str) -> str:
+    """Add the complexity field to the top level of a GraphQL query document."""
+    if "complexity" in query:
+        return query
+    end = query.rfind("}")
+    if end == -1:
+        return query
+    return f"{query[:end]}  {COMPLEXITY_FIELD}\n{query[end:]}"
+
+
+def reset_seconds_from_error(errors: Any) -> Optional[float]:
+    """Extract 'reset in N seconds' from a Monday ComplexityException, if present."""
+    for error in errors if isinstance(errors, list) else [errors]:
+        text = str(error)
+        if "complexity" not in text.lower():
+            continue
+        match = _RESET_IN_RE.search(text)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class ComplexityBudget:
+    """
+    Client-side token bucket mirroring Monday's per-minute complexity budget.
+
+    Every call reserves its estimated cost (the running average of what the
+    same operation cost before) from the locally tracked remaining budget;
+    the server-reported 'after' value then replaces the estimate. When a
+    call would dip below `reserve`, it waits for the budget window to reset
+    if that is within `max_wait` seconds, and is shed otherwise.
+    """
+
+    def __init__(self, limit: int, reserve: int, max_wait: float, default_cost: int) -> None:
+        self.limit = limit
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.default_cost = default_cost
+        self._remaining: Optional[int] = None
+        self._reset_at = 0.0
+        self._outstanding = 0
+        self._costs: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._stats = {"calls": 0, "waits": 0, "wait_seconds": 0.0, "shed": 0, "exhausted": 0}
+
+    def _refill_locked(self) -> None:
+        if self._remaining is not None and time.monotonic() >= self._reset_at:
+            self._remaining = self.limit
+
+    def estimate(self, operation: str) -> int:
+        """Expected cost of an operation, learned from earlier responses."""
+        return int(self._costs.get(operation, self.default_cost))
+
+    def acquire(self, operation: str) -> int:
+        """
+        Reserve budget for one call, waiting for the window to reset if needed.
+
+        Returns:
+            The reserved cost, to be passed back to observe() or release()
+
+        Raises:
+            ComplexityBudgetExceeded: If the budget will not recover within max_wait
+        """
+        with self._cond:
+            cost = self.estimate(operation)
+            waited = 0.0
+            while True:
+                self._refill_locked()
+                if self._remaining is None or self._remaining - cost >= self.reserve:
+                    break
+
+                wait = self._reset_at - time.monotonic()
+                if wait + waited > self.max_wait:
+                    self._stats["shed"] += 1
+                    raise ComplexityBudgetExceeded(
+                        f"Monday complexity budget exhausted ({self._remaining} left, "
+                        f"{operation} needs ~{cost}); resets in {max(wait, 0):.0f} s"
+                    )
+                if waited == 0.0:
+                    self._stats["waits"] += 1
+                    logger.info("Waiting %.1f s for Monday complexity budget (%s)", wait, operation)
+                started = time.monotonic()
+                self._cond.wait(max(wait, 0.05))
+                waited += time.monotonic() - started
+
+            self._stats["wait_seconds"] += waited
+            self._stats["calls"] += 1
+            self._outstanding += cost
+            if self._remaining is not None:
+                self._remaining -= cost
+            return cost
+
+    def release(self, reserved: int) -> None:
+        """Give back a reservation for a call that never reached Monday's budget accounting."""
+        with self._cond:
+            self._outstanding -= reserved
+            if self._remaining is not None:
+                self._remaining += reserved
+            self._cond.notify_all()
+
+    def observe(self, operation: str, reserved: int, complexity: Optional[Dict[str, Any]]) -> None:
+        """Reconcile a reservation with the complexity block Monday returned."""
+        with self._cond:
+            self._outstanding -= reserved
+            if not complexity:
+                self._cond.notify_all()
+                return
+
+            cost = complexity.get("query")
+            if cost is not None:
+                previous = self._costs.get(operation)
+                self._costs[operation] = cost if previous is None else 0.7 * previous + 0.3 * cost
+
+            before = complexity.get("before")
+            if before is not None and before > self.limit:
+                self.limit = int(before)
+
+            after = complexity.get("after")
+            if after is not None:
+                # Other calls still in flight have reserved budget the server has not charged yet
+                self._remaining = int(after) - self._outstanding
+            reset_in = complexity.get("reset_in_x_seconds")
+            if reset_in is not None:
+                self._reset_at = time.monotonic() + float(reset_in)
+
+            if self._remaining is not None and self._remaining < self.limit * 0.2:
+                logger.warning(
+                    "Monday complexity budget low: %d of %d left, resets in %s s",
+                    self._remaining, self.limit, reset_in,
+                )
+            self._cond.notify_all()
+
+    def exhausted(self, reset_in: float) -> None:
+        """Record that Monday rejected a call because the budget ran out."""
+        with self._cond:
+            self._stats["exhausted"] += 1
+            self._remaining = 0
+            self._reset_at = time.monotonic() + reset_in
+
+    def stats(self) -> Dict[str, Any]:
+        """Return remaining budget, headroom ratio and wait/shed counters."""
+        with self._cond:
+            self._refill_locked()
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["limit"] = self.limit
+            stats["remaining"] = self._remaining
+            stats["headroom"] = 1.0 if self._remaining is None else max(self._remaining, 0) / self.limit
+            stats["reset_in"] = max(self._reset_at - time.monotonic(), 0.0)
+            return stats
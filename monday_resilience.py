@@ -0,0 +1,130 @@
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class MondayUnavailableError(RuntimeError):
+    """Raised without calling Monday while the circuit breaker is open."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+
+    Uses full-jitter exponential backoff; a server-provided Retry-After
+    takes precedence, bounded by `cap`.
+    """
+    if retry_after is not None:
+        return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls pass; `failure_threshold` failures in a row open it
+    open      -> calls fail fast with MondayUnavailableError for `reset_timeout` s
+    half_open -> one probe call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0, "failures": 0, "successes": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state_locked()
+
+    def _current_state_locked(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._transition_locked("half_open")
+        return self._state
+
+    def _transition_locked(self, state: str) -> None:
+        if state == self._state:
+            return
+        log = logger.warning if state == "open" else logger.info
+        log("Circuit breaker '%s': %s -> %s", self.name, self._state, state)
+        self._state = state
+        if state == "open":
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Raise MondayUnavailableError if the call must not go out.
+
+        Raises:
+            MondayUnavailableError: While open, or while a half-open probe is running
+        """
+        with self._lock:
+            state = self._current_state_locked()
+            if state == "closed":
+                return
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._stats["rejected"] += 1
+            retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0)
+        raise MondayUnavailableError(
+            f"Monday API is unavailable (circuit '{self.name}' open, retry in {retry_in:.0f} s)"
+        )
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot for a call that never reached Monday."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            self._failures = 0
+            self._transition_locked("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                self._transition_locked("open")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current state, consecutive failures and transition counters."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["state"] = self._current_state_locked()
+            stats["consecutive_failures"] = self._failures
+            return stats
@@ -0,0 +1,139 @@
+"""Checks for the multi-board search of the Monday client against a fake GraphQL server.
+
+A small HTTP server on 127.0.0.1 answers the aliased multi-board queries
+of monday_client and records them, so no API key or network access is
+needed. Covers the fuzzy fallback of search_items_multi: boards held in
+the snapshot cache are fuzzy-matched locally, and cold boards are only
+queued for a background download, never fetched on the request path;
+search_items_multi downloads nothing beyond its own all-column scan,
+which also answers a search Monday rejects with a 4xx.
+
+Usage:
+    python3 monday_search_test.py
+"""
+import os
+import sys
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+# The client reads its settings at import: snapshot cache on, no mirror or complexity budget
+os.environ.update(
+    MONDAY_API_KEY="test-key",
+    MONDAY_CACHE_TTL="600",
+    MONDAY_MIRROR_ENABLED="false",
+    MONDAY_RATE_LIMIT_ENABLED="false",
+    MONDAY_SEARCH_MODE="server",
+    MONDAY_FUZZY_SEARCH="true",
+)
+
+import monday_client
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WARM_BOARD = 1
+COLD_BOARDS = [2, 3]
+
+WARM_ITEMS = [
+    {"id": "1", "name": "Vocast ApS", "updated_at": "2026-01-01T10:00:00Z", "column_values": []},
+    {"id": "2", "name": "Firma B", "updated_at": "2026-01-01T09:00:00Z", "column_values": []},
+]
+
+
+class FakeMonday(ThreadingHTTPServer):
+    """
+    Answers every aliased multi-board query with empty boards and records
+    the request bodies; `failures` holds HTTP statuses to answer the next
+    requests with.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeMondayHandler)
+        self.requests: List[Dict[str, Any]] = []
+        self.failures: List[int] = []
+        self.lock = threading.Lock()
+
+
+class FakeMondayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeMonday
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = body.get("variables") or {}
+        with self.server.lock:
+            self.server.requests.append(body)
+            failure = self.server.failures.pop(0) if self.server.failures else None
+
+        if failure is not None:
+            self.send_response(failure)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        boards = {
+            name: [{"name": f"Board {value[0]}", "items_page": {"cursor": None, "items": []}}]
+            for name, value in variables.items() if name.startswith("b")
+        }
+        payload = json.dumps({"data": boards}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def check_cold_fuzzy_search(fake: FakeMonday) -> None:
+    monday_client.store_snapshot(WARM_BOARD, [dict(item) for item in WARM_ITEMS])
+    prefetched: List[List[int]] = []
+    monday_client._prefetch_multi = lambda board_ids: prefetched.append(list(board_ids))
+
+    results = monday_client.fuzzy_search_items_multi([WARM_BOARD] + COLD_BOARDS, "vocats")
+
+    # The warm board is matched locally; the cold ones are only queued for a background download
+    assert not fake.requests, fake.requests
+    assert prefetched == [COLD_BOARDS], prefetched
+    assert [(item["id"], item["board_id"]) for item in results] == [("1", WARM_BOARD)], results
+    assert results[0]["match_score"] > 0
+
+
+def check_search_fallback(fake: FakeMonday) -> None:
+    # Nothing matches: the cold boards are searched server-side, then scanned on every
+    # column (which caches them), and the fuzzy fallback downloads nothing more
+    del fake.requests[:]
+    results = monday_client.search_items_multi([WARM_BOARD] + COLD_BOARDS, "vocats")
+    assert [request["variables"].get("query_params") is not None for request in fake.requests] == [True, False]
+    assert [(item["id"], item["board_id"]) for item in results] == [("1", WARM_BOARD)], results
+
+
+def check_rejected_search(fake: FakeMonday) -> None:
+    # Monday turns the search down (e.g. a rule on a column type it cannot filter): scan instead of failing
+    monday_client.invalidate_board_cache()
+    del fake.requests[:]
+    fake.failures[:] = [400]
+    assert monday_client.search_items_multi(COLD_BOARDS, "vocast") == []
+    assert [request["variables"].get("query_params") is not None for request in fake.requests] == [True, False]
+
+
+if __name__ == "__main__":
+    fake = FakeMonday()
+    threading.Thread(target=fake.serve_forever, name="fake-monday", daemon=True).start()
+    monday_client.MONDAY_API_URL = f"http://127.0.0.1:{fake.server_address[1]}/"
+    try:
+        check_cold_fuzzy_search(fake)
+        check_search_fallback(fake)
+        check_rejected_search(fake)
+        logger.info("✅ All multi-board search checks passed")
+    except AssertionError as e:
+        logger.exception("❌ FAILED: %s", e)
+        sys.exit(1)
+    finally:
+        fake.shutdown()
+        fake.server_close()
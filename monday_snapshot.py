@@ -0,0 +1,343 @@
+"""Compact, array-backed board snapshots for the in-process snapshot cache.
+
+A board is stored column-wise: one list per field (ids, names, updated_at)
+and one list of texts per Monday column, with interned column IDs and
+repeated texts (statuses, owners, ...) shared within a column. Items are
+read through ItemRecord, a small read-only Mapping that behaves like the
+item dictionaries returned by the API.
+
+Usage:
+    python3 monday_snapshot.py benchmark [--sizes 10000 100000] [--columns 12]
+"""
+import gc
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Marks a column the item does not have (as opposed to a column with empty text)
+_MISSING = object()
+
+
+class ItemRecord(Mapping):
+    """
+    Read-only, dict-compatible view of one item in a BoardSnapshot.
+
+    Supports item["name"], item.get("column_values"), dict(item) and so on;
+    column_values is built on access as a list of {"id", "text"} dicts.
+    """
+
+    __slots__ = ("_snapshot", "_row")
+
+    _KEYS = ("id", "name", "updated_at", "column_values")
+
+    def __init__(self, snapshot: "BoardSnapshot", row: int) -> None:
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        snapshot, row = self._snapshot, self._row
+        if key == "id":
+            return snapshot._ids[row]
+        if key == "name":
+            return snapshot._names[row]
+        if key == "updated_at":
+            return snapshot._updated[row]
+        if key == "column_values":
+            return [
+                {"id": column_id, "text": texts[row]}
+                for column_id, texts in snapshot._columns.items()
+                if texts[row] is not _MISSING
+            ]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def matches(self, term: str) -> bool:
+        """True if the lower-cased term occurs in the item name or any column text."""
+        snapshot, row = self._snapshot, self._row
+        if term in (snapshot._names[row] or "").lower():
+            return True
+        for texts in snapshot._columns.values():
+            text = texts[row]
+            if isinstance(text, str) and term in text.lower():
+                return True
+        return False
+
+    def __repr__(self) -> str:
+        return f"ItemRecord({dict(self)!r})"
+
+
+class BoardSnapshot(Sequence):
+    """
+    Immutable, column-oriented list of board items.
+
+    Indexing and iteration yield ItemRecord views, so a snapshot can be
+    used wherever a list of item dictionaries is read. Updates return a new
+    snapshot (see merge), which keeps snapshots safe to share between
+    threads and with the cache.
+    """
+
+    __slots__ = ("_ids", "_names", "_updated", "_columns", "_rows")
+
+    def __init__(
+        self,
+        ids: List[Any],
+        names: List[Optional[str]],
+        updated: List[Optional[str]],
+        columns: Dict[str, List[Any]],
+    ) -> None:
+        self._ids = ids
+        self._names = names
+        self._updated = updated
+        self._columns = columns
+        self._rows: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_items(cls, items: Iterable[Mapping]) -> "BoardSnapshot":
+        """
+        Build a snapshot from item dictionaries (or records of another snapshot).
+
+        Only id, name, updated_at and column_values are kept.
+        """
+        ids: List[Any] = []
+        names: List[Optional[str]] = []
+        updated: List[Optional[str]] = []
+        columns: Dict[str, List[Any]] = {}
+        shared: Dict[str, Dict[str, str]] = {}
+        for row, item in enumerate(items):
+            ids.append(item.get("id"))
+            names.append(item.get("name"))
+            updated.append(item.get("updated_at"))
+            for cv in item.get("column_values") or []:
+                column_id = sys.intern(str(cv.get("id")))
+                texts = columns.get(column_id)
+                if texts is None:
+                    texts = columns[column_id] = [_MISSING] * row
+                    shared[column_id] = {}
+                text = cv.get("text")
+                if isinstance(text, str):
+                    text = shared[column_id].setdefault(text, text)
+                texts.append(text)
+            for texts in columns.values():
+                if len(texts) == row:
+                    texts.append(_MISSING)
+        return cls(ids, names, updated, columns)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [ItemRecord(self, row) for row in range(len(self._ids))[index]]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("snapshot index out of range")
+        return ItemRecord(self, index)
+
+    def __iter__(self) -> Iterator[ItemRecord]:
+        for row in range(len(self._ids)):
+            yield ItemRecord(self, row)
+
+    def column_ids(self) -> List[str]:
+        """Return the IDs of all columns present in the snapshot."""
+        return list(self._columns)
+
+    def row_of(self, item_id: Any) -> Optional[int]:
+        """Return the row of an item ID, or None if the item is not in the snapshot."""
+        rows = self._rows
+        if rows is None:
+            rows = self._rows = {str(item_id): row for row, item_id in enumerate(self._ids)}
+        return rows.get(str(item_id))
+
+    def texts(self, row: int) -> Iterator[str]:
+        """Yield the name and every non-empty column text of a row."""
+        name = self._names[row]
+        if name:
+            yield name
+        for texts in self._columns.values():
+            text = texts[row]
+            if text and isinstance(text, str):
+                yield text
+
+    def merge(self, changed: List[Mapping], removed: Set[str]) -> "BoardSnapshot":
+        """
+        Return a new snapshot with a delta applied: changed items replaced in
+        place, new ones appended and removed ones dropped.
+        """
+        changed_by_id = {str(item.get("id")): item for item in changed}
+        keep: List[int] = []
+        # Position in the merged snapshot -> fresh item replacing the old row
+        replaced: Dict[int, Mapping] = {}
+        for row, item_id in enumerate(self._ids):
+            item_id = str(item_id)
+            if item_id in removed:
+                continue
+            item = changed_by_id.pop(item_id, None)
+            if item is not None:
+                replaced[len(keep)] = item
+            keep.append(row)
+        appended = [item for item_id, item in changed_by_id.items() if item_id not in removed]
+
+        patch = BoardSnapshot.from_items(list(replaced.values()) + appended)
+        patch_rows = {position: index for index, position in enumerate(replaced)}
+        offset = len(replaced)
+
+        def rebuild(old: List[Any], new: List[Any]) -> List[Any]:
+            merged = [old[row] for row in keep]
+            for position, index in patch_rows.items():
+                merged[position] = new[index]
+            merged.extend(new[offset:])
+            return merged
+
+        missing = [_MISSING] * len(self._ids)
+        patch_missing = [_MISSING] * len(patch)
+        columns = {
+            column_id: rebuild(self._columns.get(column_id, missing), patch._columns.get(column_id, patch_missing))
+            for column_id in list(self._columns) + [c for c in patch._columns if c not in self._columns]
+        }
+        return BoardSnapshot(
+            rebuild(self._ids, patch._ids),
+            rebuild(self._names, patch._names),
+            rebuild(self._updated, patch._updated),
+            columns,
+        )
+
+    def search(self, term: str) -> List[ItemRecord]:
+        """
+        Return the items whose name or any column text contains the
+        lower-cased term, in board order.
+
+        Scans column by column and lower-cases each distinct text once, so
+        low-cardinality columns (status, owner, ...) cost almost nothing.
+        """
+        matched = bytearray(len(self._ids))
+        for texts in [self._names, *self._columns.values()]:
+            hits = {text for text in set(texts) if text.__class__ is str and term in text.lower()}
+            if hits:
+                for row, text in enumerate(texts):
+                    if text in hits:
+                        matched[row] = 1
+        return [ItemRecord(self, row) for row, hit in enumerate(matched) if hit]
+
+    def __sizeof__(self) -> int:
+        # Deep size, so the snapshot cache can account for it with sys.getsizeof
+        size = object.__sizeof__(self)
+        seen: Set[int] = set()
+        for values in [self._ids, self._names, self._updated, *self._columns.values()]:
+            size += sys.getsizeof(values)
+            for value in values:
+                if value is not _MISSING and id(value) not in seen:
+                    seen.add(id(value))
+                    size += sys.getsizeof(value)
+        if self._rows is not None:
+            size += sys.getsizeof(self._rows)
+        return size + sys.getsizeof(self._columns)
+
+    def __repr__(self) -> str:
+        return f"BoardSnapshot({len(self)} items, {len(self._columns)} columns)"
+
+
+def _synthetic_board(count: int, columns: int) -> bytes:
+    """A Monday-shaped items_page body with `count` items, for benchmarking."""
+    statuses = ["Lead", "Kunde", "Tabt", "Kontaktet", "Møde booket"]
+    owners = [f"Sælger {i}" for i in range(8)]
+    items = []
+    for i in range(count):
+        values = [
+            {"id": "status", "text": statuses[i % len(statuses)]},
+            {"id": "owner", "text": owners[i % len(owners)]},
+            {"id": "email", "text": f"kontakt{i}@firma{i}.dk"},
+            {"id": "company", "text": f"Firma {i} ApS"},
+        ]
+        values += [
+            {"id": f"text{c}", "text": f"Note {c} for lead {i}" if (i + c) % 3 else ""}
+            for c in range(max(columns - len(values), 0))
+        ]
+        items.append({
+            "id": str(5_000_000_000 + i),
+            "name": f"Lead {i}",
+            "updated_at": f"2026-01-{i % 28 + 1:02d}T10:{i % 60:02d}:00Z",
+            "column_values": values,
+        })
+    return json.dumps(items).encode()
+
+
+def run_benchmark(sizes: List[int], columns: int) -> List[Dict[str, Any]]:
+    """
+    Measure the memory of a board as decoded item dictionaries versus a
+    BoardSnapshot, with tracemalloc.
+
+    Returns:
+        One row per size with dict_bytes, snapshot_bytes, ratio and build_ms
+    """
+    results = []
+    for count in sizes:
+        body = _synthetic_board(count, columns)
+        gc.collect()
+        tracemalloc.start()
+
+        base = tracemalloc.get_traced_memory()[0]
+        items = json.loads(body)
+        dict_bytes = tracemalloc.get_traced_memory()[0] - base
+
+        snapshot = BoardSnapshot.from_items(items)
+        del items
+        gc.collect()
+        snapshot_bytes = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        # Timed again without tracemalloc, which slows allocation down a lot
+        items = json.loads(body)
+        started = time.perf_counter()
+        BoardSnapshot.from_items(items)
+        build_ms = (time.perf_counter() - started) * 1000
+        del items
+        results.append({
+            "items": count,
+            "dict_bytes": dict_bytes,
+            "snapshot_bytes": snapshot_bytes,
+            "ratio": dict_bytes / snapshot_bytes if snapshot_bytes else 0.0,
+            "build_ms": build_ms,
+        })
+        del snapshot
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point for the snapshot memory benchmark."""
+    parser = argparse.ArgumentParser(description="Compact Monday board snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench_cmd = sub.add_parser("benchmark", help="Compare memory of item dicts and BoardSnapshot")
+    bench_cmd.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    bench_cmd.add_argument("--columns", type=int, default=12)
+
+    args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        print(f"{'items':>8}  {'dicts MB':>9}  {'snapshot MB':>11}  {'ratio':>6}  {'build ms':>8}")
+        for row in run_benchmark(args.sizes, args.columns):
+            print(
+                f"{row['items']:>8}  {row['dict_bytes'] / 1e6:>9.1f}  {row['snapshot_bytes'] / 1e6:>11.1f}"
+                f"  {row['ratio']:>5.1f}x  {row['build_ms']:>8.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Checks for the Monday webhook receiver, without a Monday account.
+
+monday_client.get_item is replaced by a stub, so no API key or network
+access is needed. Covers signature checking, the challenge echo, and
+upsert/remove patching of a cached board snapshot (which must leave the
+delta high-water mark alone).
+
+Usage:
+    python3 monday_webhook_test.py
+"""
+import sys
+import json
+import hmac
+import time
+import base64
+import hashlib
+import logging
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+import monday_client
+import monday_webhooks
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BOARD_ID = 5085798849
+OTHER_BOARD_ID = 5085798850
+SECRET = "test-signing-secret"
+
+CACHED_ITEMS = [
+    {"id": "1", "name": "Vocast ApS", "updated_at": "2026-01-01T10:00:00Z",
+     "column_values": [{"id": "status", "text": "Lead"}]},
+    {"id": "2", "name": "Firma B", "updated_at": "2026-01-01T09:00:00Z",
+     "column_values": [{"id": "status", "text": "Kunde"}]},
+]
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def sign(secret: str = SECRET, exp: Optional[float] = None) -> str:
+    """Authorization header value with an HS256 JWT, as Monday sends it."""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps({"exp": exp if exp is not None else time.time() + 60}).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def post(url: str, payload: Dict[str, Any], authorization: Optional[str] = None) -> Tuple[int, Dict[str, Any]]:
+    """POST one JSON payload and return the status code and decoded response."""
+    headers = {"Content-Type": "application/json"}
+    if authorization:
+        headers["Authorization"] = authorization
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def cached_board() -> Dict[str, Dict[str, Any]]:
+    """The cached snapshot of BOARD_ID, by item ID."""
+    snapshot = monday_client._snapshot_cache.peek(monday_client._snapshot_key(BOARD_ID))
+    return {str(item["id"]): dict(item) for item in snapshot}
+
+
+def high_water_mark() -> Optional[str]:
+    state = monday_client._snapshot_sync_state.get(monday_client._snapshot_key(BOARD_ID)) or {}
+    return state.get("hwm")
+
+
+def check_signatures() -> None:
+    assert monday_webhooks.verify_signature(sign(), SECRET)
+    assert monday_webhooks.verify_signature("Bearer " + sign(), SECRET)
+    assert not monday_webhooks.verify_signature(sign("wrong-secret"), SECRET)
+    assert not monday_webhooks.verify_signature(sign(exp=time.time() - 10), SECRET)
+    assert not monday_webhooks.verify_signature(None, SECRET)
+    assert not monday_webhooks.verify_signature("not.a.jwt", SECRET)
+
+
+def check_secret_required() -> None:
+    try:
+        monday_webhooks.WebhookServer(("127.0.0.1", 0), secret=None)
+    except ValueError:
+        return
+    raise AssertionError("receiver started without a signing secret")
+
+
+def check_http(url: str, server: monday_webhooks.WebhookServer) -> None:
+    challenge = {"challenge": "3eZbrw1aBm2rZgRNFdxV2595E9CY3gmdALWMmHkvFXO7tYXAYM8P"}
+    assert post(url, challenge)[0] == 401
+    assert post(url, challenge, sign("wrong-secret"))[0] == 401
+    assert post(url, challenge, sign()) == (200, challenge)
+
+    event = {"event": {"type": "delete_pulse", "boardId": BOARD_ID, "itemId": 2}}
+    assert post(url, event)[0] == 401
+    assert post(url, event, sign()) == (200, {"status": "accepted"})
+    deadline = time.monotonic() + 5
+    while server.stats().get("remove", 0) < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stats = server.stats()
+    assert stats["remove"] == 1 and stats["rejected"] == 3, stats
+    assert "2" not in cached_board()
+
+
+def check_patching() -> None:
+    monday_client.store_snapshot(BOARD_ID, [dict(item) for item in CACHED_ITEMS])
+    hwm = high_water_mark()
+    assert hwm == "2026-01-01T10:00:00Z"
+
+    fetched = {
+        "1": {"id": "1", "name": "Vocast ApS", "updated_at": "2026-02-01T12:00:00Z",
+              "column_values": [{"id": "status", "text": "Kunde"}], "board": {"id": str(BOARD_ID)}},
+        "3": {"id": "3", "name": "Nyt Lead", "updated_at": "2026-02-01T12:05:00Z",
+              "column_values": [{"id": "status", "text": "Lead"}], "board": {"id": str(BOARD_ID)}},
+        "9": {"id": "9", "name": "Fremmed", "updated_at": "2026-02-01T12:10:00Z",
+              "column_values": [], "board": {"id": str(OTHER_BOARD_ID)}},
+    }
+    monday_client.get_item = lambda item_id: dict(fetched[str(item_id)]) if str(item_id) in fetched else None
+
+    event = {"type": "update_column_value", "boardId": BOARD_ID, "pulseId": 1, "columnId": "status"}
+    assert monday_webhooks.apply_event(event) == "upsert"
+    assert monday_webhooks.apply_event({"type": "create_pulse", "boardId": BOARD_ID, "pulseId": 3}) == "upsert"
+    items = cached_board()
+    assert items["1"]["column_values"] == [{"id": "status", "text": "Kunde"}]
+    assert items["3"]["name"] == "Nyt Lead" and "board" not in items["3"]
+
+    # An item of another board must not reach this board's snapshot
+    assert monday_webhooks.apply_event({"type": "create_pulse", "boardId": BOARD_ID, "pulseId": 9}) == "ignored"
+    assert "9" not in cached_board()
+
+    # An upserted item that is gone by the time it is fetched is removed
+    del fetched["3"]
+    assert monday_webhooks.apply_event({"type": "change_name", "boardId": BOARD_ID, "pulseId": 3}) == "remove"
+    assert "3" not in cached_board()
+    assert monday_webhooks.apply_event({"type": "no_such_event", "boardId": BOARD_ID, "pulseId": 1}) == "ignored"
+
+    # Webhooks cover single items only, so the delta sync must still start from the old mark
+    assert high_water_mark() == hwm, high_water_mark()
+
+
+if __name__ == "__main__":
+    if not monday_client._snapshot_cache.enabled:
+        logger.error("❌ The snapshot cache is disabled (MONDAY_CACHE_TTL/MONDAY_CACHE_MAX_MB); nothing to patch.")
+        sys.exit(1)
+
+    server = None
+    try:
+        check_signatures()
+        check_secret_required()
+        check_patching()
+        server = monday_webhooks.start_webhook_server(host="127.0.0.1", port=0, secret=SECRET)
+        check_http(f"http://127.0.0.1:{server.server_address[1]}/", server)
+        logger.info("✅ All webhook checks passed")
+    except AssertionError as e:
+        logger.exception("❌ FAILED: %s", e)
+        sys.exit(1)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
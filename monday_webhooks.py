@@ -0,0 +1,262 @@
+"""Monday.com webhook receiver for push-based cache invalidation.
+
+Monday posts board events to this listener, which patches the cached board
+snapshot (and the local mirror, if enabled) for the one affected item, so
+lead statuses stay current without polling.
+"""
+import os
+import hmac
+import json
+import base64
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Local only by default; expose it through a TLS reverse proxy (or set 0.0.0.0 deliberately)
+WEBHOOK_HOST = os.getenv("MONDAY_WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("MONDAY_WEBHOOK_PORT", "0"))
+# Signing secret of the Monday app; required, every request must carry a valid JWT
+WEBHOOK_SECRET = os.getenv("MONDAY_WEBHOOK_SECRET")
+MAX_BODY_BYTES = 1024 * 1024
+
+# Event types (as sent in event.type) that add or change an item
+UPSERT_EVENTS = {
+    "create_item", "create_pulse",
+    "change_column_value", "update_column_value",
+    "change_name", "update_name",
+    "move_pulse_into_board", "restore_pulse",
+}
+# Event types after which the item is no longer on the board
+REMOVE_EVENTS = {
+    "item_deleted", "delete_pulse",
+    "item_archived", "archive_pulse",
+    "move_pulse_from_board",
+}
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def verify_signature(authorization: Optional[str], secret: str) -> bool:
+    """
+    Check the HS256 JWT Monday puts in the Authorization header of webhook
+    requests against the app's signing secret.
+    """
+    if not authorization:
+        return False
+    token = authorization.split(" ", 1)[-1].strip()
+    parts = token.split(".")
+    if len(parts) != 3:
+        return False
+
+    header_b64, payload_b64, signature_b64 = parts
+    try:
+        header = json.loads(_b64url_decode(header_b64))
+        payload = json.loads(_b64url_decode(payload_b64))
+        signature = _b64url_decode(signature_b64)
+    except (ValueError, TypeError):
+        return False
+    if header.get("alg") != "HS256":
+        return False
+
+    expected = hmac.new(secret.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        return False
+
+    exp = payload.get("exp")
+    return exp is None or float(exp) >= time.time()
+
+
+def apply_event(event: Dict[str, Any]) -> str:
+    """
+    Apply one Monday webhook event to the cached snapshot and the mirror.
+
+    Upserts refetch just the affected item; removals drop it locally. An
+    item that turns out to belong to another board than the event's is
+    ignored, so a forged or misrouted event cannot leak it into this
+    board's data.
+
+    Returns:
+        'upsert', 'remove' or 'ignored'
+    """
+    import monday_client
+
+    event_type = event.get("type")
+    board_id = event.get("boardId")
+    item_id = event.get("pulseId") or event.get("itemId")
+    if not board_id or not item_id:
+        return "ignored"
+    board_id = int(board_id)
+
+    if event_type in UPSERT_EVENTS:
+        item = monday_client.get_item(int(item_id))
+        if item is None:
+            # Gone again by the time we looked it up
+            action, changed, removed = "remove", [], {str(item_id)}
+        else:
+            item_board = str((item.pop("board", None) or {}).get("id"))
+            if item_board != str(board_id):
+                logger.warning(
+                    "Webhook %s names item %s on board %d, but the item is on board %s; ignoring",
+                    event_type, item_id, board_id, item_board,
+                )
+                return "ignored"
+            action, changed, removed = "upsert", [item], set()
+    elif event_type in REMOVE_EVENTS:
+        action, changed, removed = "remove", [], {str(item_id)}
+    else:
+        return "ignored"
+
+    patched = monday_client.apply_item_change(
+        board_id,
+        item=changed[0] if changed else None,
+        removed_id=next(iter(removed), None),
+    )
+
+    if monday_client.MIRROR_ENABLED:
+        from monday_mirror import get_mirror
+
+        mirror = get_mirror()
+        if mirror.is_populated(board_id):
+            mirror.apply_changes(board_id, changed, removed)
+
+    logger.info(
+        "Webhook %s for item %s on board %d: %s (%d cached snapshot(s) patched)",
+        event_type, item_id, board_id, action, patched,
+    )
+    return action
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """HTTP handler for Monday webhook POSTs; events are applied off the request thread."""
+
+    server: "WebhookServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, status: int, body: Optional[Dict[str, Any]] = None) -> None:
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._reply(200, {"status": "ok", "stats": self.server.stats()})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._reply(400, {"error": "invalid body"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._reply(400, {"error": "invalid json"})
+            return
+
+        # Without a secret nothing can be verified, so nothing is accepted
+        if not self.server.secret or not verify_signature(self.headers.get("Authorization"), self.server.secret):
+            self.server.count("rejected")
+            self._reply(401, {"error": "invalid signature"})
+            return
+
+        # Monday verifies a new webhook URL by posting a challenge to echo back
+        if "challenge" in body:
+            self._reply(200, {"challenge": body["challenge"]})
+            return
+
+        event = body.get("event")
+        if not isinstance(event, dict):
+            self._reply(400, {"error": "missing event"})
+            return
+
+        self.server.count("received")
+        self.server.submit(event)
+        self._reply(200, {"status": "accepted"})
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that applies webhook events in arrival order on a worker thread.
+
+    Raises:
+        ValueError: If no signing secret is given (MONDAY_WEBHOOK_SECRET)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, secret: Optional[str] = WEBHOOK_SECRET, workers: int = 1) -> None:
+        if not secret:
+            raise ValueError("MONDAY_WEBHOOK_SECRET is not set; refusing to accept unauthenticated webhooks")
+        super().__init__(address, WebhookHandler)
+        self.secret = secret
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="monday-webhook")
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"received": 0, "rejected": 0, "upsert": 0, "remove": 0, "ignored": 0, "failed": 0}
+
+    def count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] = self._stats.get(name, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def submit(self, event: Dict[str, Any]) -> None:
+        self._executor.submit(self._process, event)
+
+    def _process(self, event: Dict[str, Any]) -> None:
+        try:
+            self.count(apply_event(event))
+        except Exception as e:
+            self.count("failed")
+            logger.error("Failed to apply Monday webhook event %s: %s", event.get("type"), e)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+
+def start_webhook_server(
+    host: str = WEBHOOK_HOST, port: int = WEBHOOK_PORT, secret: Optional[str] = WEBHOOK_SECRET
+) -> WebhookServer:
+    """
+    Start the webhook listener on a daemon thread and return the server.
+
+    Raises:
+        ValueError: If no signing secret is configured
+    """
+    server = WebhookServer((host, port), secret=secret)
+    thread = threading.Thread(target=server.serve_forever, name="monday-webhooks", daemon=True)
+    thread.start()
+    logger.info("Monday webhook receiver listening on %s:%d", host, server.server_address[1])
+    return server
+
+
+if __name__ == "__main__":
+    if not WEBHOOK_PORT:
+        logger.error("Set MONDAY_WEBHOOK_PORT to run the webhook receiver.")
+    elif not WEBHOOK_SECRET:
+        logger.error("Set MONDAY_WEBHOOK_SECRET to run the webhook receiver.")
+    else:
+        server = WebhookServer((WEBHOOK_HOST, WEBHOOK_PORT))
+        logger.info("Monday webhook receiver listening on %s:%d", WEBHOOK_HOST, WEBHOOK_PORT)
+        server.serve_forever()
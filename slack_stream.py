@@ -0,0 +1,194 @@
+"""Progressive Slack replies: one message edited in place while the LLM writes.
+
+The "thinking" placeholder is updated with chat.update as text streams in,
+and finally replaced by the complete answer. Slack rate-limits chat.update
+per workspace, so all streams share one budget: each stream updates at
+most once per interval times the number of streams writing at the same
+time, and a rate limit (HTTP 429) pauses the intermediate updates of every
+stream for the Retry-After period; final updates wait for it and are
+retried.
+"""
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shown at the end of the text while the answer is still being written
+CURSOR = " ▌"
+
+# Attempts of the final update before falling back to a new message
+FINAL_ATTEMPTS = 3
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds Slack asked us to wait, if the error is a rate limit (HTTP 429)."""
+    response = getattr(error, "response", None)
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class _SharedThrottle:
+    """The Slack rate-limit pause and the set of unfinished streams, shared by all streams."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Weak, so a stream that is never finished stops counting once it is collected
+        self._streams: "weakref.WeakSet[SlackReplyStream]" = weakref.WeakSet()
+        self._paused_until = 0.0
+
+    def opened(self, stream: "SlackReplyStream") -> None:
+        with self._lock:
+            self._streams.add(stream)
+
+    def closed(self, stream: "SlackReplyStream") -> None:
+        with self._lock:
+            self._streams.discard(stream)
+
+    def active(self) -> int:
+        """Number of streams still writing (at least 1)."""
+        with self._lock:
+            return max(1, len(self._streams))
+
+    def pause(self, seconds: float) -> None:
+        """Hold back intermediate updates of all streams for the given time."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_until(self) -> float:
+        with self._lock:
+            return self._paused_until
+
+
+_throttle = _SharedThrottle()
+
+
+class SlackReplyStream:
+    """
+    Edits one Slack message while a reply is being generated.
+
+    Args:
+        client: Slack WebClient
+        channel: Channel of the message
+        ts: Timestamp of the message to edit (the placeholder)
+        thread_ts: Thread to post in if the message cannot be edited
+        interval: Minimum seconds between intermediate updates of a stream
+            while it is the only one; scaled by the number of active streams
+    """
+
+    def __init__(self, client: Any, channel: str, ts: str, thread_ts: Optional[str], interval: float = 1.0) -> None:
+        self.client = client
+        self.channel = channel
+        self.ts = ts
+        self.thread_ts = thread_ts
+        self.interval = interval
+        self.updates = 0
+        self._last_sent = 0.0
+        self._last_text = ""
+        self._paused_until = 0.0
+        _throttle.opened(self)
+
+    def _due(self, text: str) -> bool:
+        """True if an intermediate update with this text should be sent now (and mark it sent)."""
+        now = time.monotonic()
+        if not text.strip() or text == self._last_text:
+            return False
+        if now - self._last_sent < self.interval * _throttle.active():
+            return False
+        if now < self._paused_until or now < _throttle.paused_until():
+            return False
+        self._last_sent = now
+        return True
+
+    def _wait_time(self) -> float:
+        """Seconds until this stream may call Slack again."""
+        return max(self._paused_until, _throttle.paused_until()) - time.monotonic()
+
+    def _sent(self, text: str) -> None:
+        self._last_text = text
+        self.updates += 1
+
+    def _failed(self, error: Exception) -> None:
+        """Pause intermediate updates after a failed one: of every stream for Retry-After on rate limits."""
+        retry_after = _retry_after(error)
+        if retry_after is None:
+            logger.warning("Streaming update of Slack message failed: %s", error)
+            self._paused_until = time.monotonic() + self.interval
+        else:
+            _throttle.pause(retry_after)
+
+    def update(self, text: str) -> None:
+        """Show the text written so far, unless the last update was too recent."""
+        if not self._due(text):
+            return
+        try:
+            self.client.chat_update(channel=self.channel, ts=self.ts, text=text + CURSOR)
+            self._sent(text)
+        except Exception as e:
+            self._failed(e)
+
+    def finish(self, text: str) -> None:
+        """
+        Replace the message with the final text.
+
+        Waits out rate limits; if the message cannot be edited (e.g. it was
+        deleted), the text is posted as a new message in the thread.
+        """
+        _throttle.closed(self)
+        for attempt in range(FINAL_ATTEMPTS):
+            wait = self._wait_time()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                self.client.chat_update(channel=self.channel, ts=self.ts, text=text)
+                self.updates += 1
+                return
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None or attempt == FINAL_ATTEMPTS - 1:
+                    logger.warning("Final update of Slack message failed, posting a new message: %s", e)
+                    break
+                _throttle.pause(retry_after)
+
+        self.client.chat_postMessage(channel=self.channel, text=text, thread_ts=self.thread_ts)
+
+
+class AsyncSlackReplyStream(SlackReplyStream):
+    """SlackReplyStream for the async runtime (AsyncWebClient); update and finish are coroutines."""
+
+    async def update(self, text: str) -> None:  # type: ignore[override]
+        """Show the text written so far, unless the last update was too recent."""
+        if not self._due(text):
+            return
+        try:
+            await self.client.chat_update(channel=self.channel, ts=self.ts, text=text + CURSOR)
+            self._sent(text)
+        except Exception as e:
+            self._failed(e)
+
+    async def finish(self, text: str) -> None:  # type: ignore[override]
+        """Replace the message with the final text (see SlackReplyStream.finish)."""
+        _throttle.closed(self)
+        for attempt in range(FINAL_ATTEMPTS):
+            wait = self._wait_time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.client.chat_update(channel=self.channel, ts=self.ts, text=text)
+                self.updates += 1
+                return
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None or attempt == FINAL_ATTEMPTS - 1:
+                    logger.warning("Final update of Slack message failed, posting a new message: %s", e)
+                    break
+                _throttle.pause(retry_after)
+
+        await self.client.chat_postMessage(channel=self.channel, text=text, thread_ts=self.thread_ts)
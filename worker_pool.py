@@ -0,0 +1,403 @@
+"""Bounded, fair worker pool for Slack requests.
+
+Tasks are queued per channel and per user and dispatched round-robin:
+channels take turns, and within a channel its users take turns, so one
+busy channel or one user sending a burst of messages cannot starve the
+others. The queue is bounded in total and per user; submit() tells the
+caller how many requests are waiting, or raises QueueFull.
+
+AsyncRequestLimiter offers the same admission control and round-robin
+order to the asyncio runtime, where requests are coroutines rather than
+threads.
+"""
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the queue wait histogram buckets
+WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class QueueFull(RuntimeError):
+    """Raised when a task is rejected because the queue (or the user's share of it) is full."""
+
+
+class WaitHistogram:
+    """Thread-safe histogram of queue wait times (seconds)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self._counts[index] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return wait_count, wait_avg and wait_max."""
+        with self._lock:
+            return {
+                "wait_count": self.count,
+                "wait_avg": self.total / self.count if self.count else 0.0,
+                "wait_max": self.max,
+            }
+
+    def prometheus_lines(self, name: str) -> List[str]:
+        """Render the histogram in Prometheus text format under the given metric name."""
+        with self._lock:
+            counts, count, total = list(self._counts), self.count, self.total
+        lines = [
+            f"# HELP {name} Time requests waited in the queue before they were started.",
+            f"# TYPE {name} histogram",
+        ]
+        lines += [f'{name}_bucket{{le="{bound}"}} {cumulative}' for bound, cumulative in zip(self.buckets, counts)]
+        lines += [f'{name}_bucket{{le="+Inf"}} {count}', f"{name}_sum {total:.6f}", f"{name}_count {count}"]
+        return lines
+
+
+def _gauge_lines(prefix: str, stats: Dict[str, Any]) -> List[str]:
+    """Prometheus lines of the request gauges and counters shared by both pools."""
+    lines = []
+    for field, kind, help_text in (
+        ("queued", "gauge", "Requests waiting to be started."),
+        ("busy", "gauge", "Requests being answered."),
+        ("rejected", "counter", "Requests turned away because the queue was full."),
+        ("completed", "counter", "Requests that finished."),
+        ("failed", "counter", "Requests that raised an exception."),
+    ):
+        metric = f"{prefix}_requests_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}", f"{metric} {stats[field]}"]
+    return lines
+
+
+class _Task:
+    __slots__ = ("fn", "channel", "user", "enqueued_at")
+
+    def __init__(self, fn: Callable[[], Any], channel: str, user: str) -> None:
+        self.fn = fn
+        self.channel = channel
+        self.user = user
+        self.enqueued_at = time.monotonic()
+
+
+class _FairQueue:
+    """
+    Waiting requests (anything with channel and user attributes), queued
+    per channel and per user and popped round-robin: channels take turns,
+    and within a channel its users take turns. Not thread-safe; the owner
+    guards it.
+    """
+
+    def __init__(self) -> None:
+        # channel -> user -> waiting requests; the order deques hold whose turn is next
+        self._queues: Dict[str, Dict[str, Deque[Any]]] = {}
+        self._channel_order: Deque[str] = deque()
+        self._user_order: Dict[str, Deque[str]] = {}
+        self._by_user: Dict[str, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def waiting(self, user: str) -> int:
+        """Number of requests of a user waiting, across all channels."""
+        return self._by_user.get(user, 0)
+
+    def push(self, request: Any) -> None:
+        users = self._queues.get(request.channel)
+        if users is None:
+            users = self._queues[request.channel] = {}
+            self._user_order[request.channel] = deque()
+            self._channel_order.append(request.channel)
+        waiting = users.get(request.user)
+        if waiting is None:
+            waiting = users[request.user] = deque()
+            self._user_order[request.channel].append(request.user)
+        waiting.append(request)
+        self._counted(request.user, 1)
+
+    def pop(self) -> Any:
+        """Pop the request whose turn it is (the queue must not be empty)."""
+        channel = self._channel_order.popleft()
+        users = self._queues[channel]
+        user = self._user_order[channel].popleft()
+        request = users[user].popleft()
+        if users[user]:
+            self._user_order[channel].append(user)
+        else:
+            del users[user]
+        if users:
+            self._channel_order.append(channel)
+        else:
+            del self._queues[channel]
+            del self._user_order[channel]
+        self._counted(user, -1)
+        return request
+
+    def remove(self, request: Any) -> bool:
+        """Take a request out of the queue before its turn; False if it is not waiting."""
+        users = self._queues.get(request.channel) or {}
+        waiting = users.get(request.user)
+        if not waiting or request not in waiting:
+            return False
+        waiting.remove(request)
+        if not waiting:
+            del users[request.user]
+            self._user_order[request.channel].remove(request.user)
+        if not users:
+            del self._queues[request.channel]
+            del self._user_order[request.channel]
+            self._channel_order.remove(request.channel)
+        self._counted(request.user, -1)
+        return True
+
+    def _counted(self, user: str, delta: int) -> None:
+        self._size += delta
+        remaining = self._by_user.get(user, 0) + delta
+        if remaining:
+            self._by_user[user] = remaining
+        else:
+            del self._by_user[user]
+
+
+class FairWorkerPool:
+    """
+    Fixed number of worker threads fed by a bounded, fair queue.
+
+    Args:
+        workers: Number of worker threads (tasks running at the same time)
+        max_queue: Maximum number of waiting tasks in total
+        max_per_user: Maximum number of waiting tasks per user (0 = no limit)
+        name: Prefix of the worker thread names
+    """
+
+    def __init__(self, workers: int, max_queue: int, max_per_user: int = 0, name: str = "worker") -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.max_per_user = max(0, max_per_user)
+        self._cond = threading.Condition()
+        self._queue = _FairQueue()
+        self._busy = 0
+        self._closed = False
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self.wait = WaitHistogram()
+        self._name = name
+        # Started with the first task, so an unused pool costs no threads
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, fn: Callable[[], Any], channel: str, user: str) -> int:
+        """
+        Queue a task.
+
+        Returns:
+            0 if a worker picks the task up right away, otherwise the
+            number of tasks waiting for a worker, across all users and
+            including this one. That is only an estimate of its place:
+            round-robin dispatch can start it before tasks of busier
+            users, and tasks of users who arrive later can go first.
+
+        Raises:
+            QueueFull: If the queue, or the user's share of it, is full
+        """
+        channel, user = str(channel), str(user)
+        with self._cond:
+            if self._closed:
+                raise QueueFull("worker pool is shut down")
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=self._run, name=f"{self._name}-{index}", daemon=True)
+                    for index in range(self.workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+            idle = self.workers - self._busy
+            if len(self._queue) >= idle + self.max_queue:
+                self._stats["rejected"] += 1
+                raise QueueFull(f"queue full ({len(self._queue)} waiting)")
+            if self.max_per_user and self._queue.waiting(user) >= self.max_per_user + idle:
+                self._stats["rejected"] += 1
+                raise QueueFull(f"user {user} already has {self._queue.waiting(user)} requests waiting")
+
+            self._queue.push(_Task(fn, channel, user))
+            self._stats["submitted"] += 1
+
+            self._cond.notify()
+            return max(len(self._queue) - idle, 0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                task = self._queue.pop()
+                self._busy += 1
+                waited = time.monotonic() - task.enqueued_at
+            self.wait.record(waited)
+
+            if waited > 1:
+                logger.info("Task for user %s in %s waited %.1f s in the queue", task.user, task.channel, waited)
+            outcome = "completed"
+            try:
+                task.fn()
+            except Exception:
+                outcome = "failed"
+                logger.exception("Worker task failed")
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self._stats[outcome] += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks; workers finish the queued ones and exit."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, busy workers, task counters and queue wait numbers (seconds)."""
+        with self._cond:
+            stats = dict(self._stats, workers=self.workers, busy=self._busy, queued=len(self._queue))
+        stats.update(self.wait.stats())
+        return stats
+
+    def prometheus_lines(self, prefix: str = "saiborg") -> List[str]:
+        """Render the queue wait histogram and pool gauges in Prometheus text format."""
+        return self.wait.prometheus_lines(f"{prefix}_queue_wait_seconds") + _gauge_lines(prefix, self.stats())
+
+
+class _Ticket:
+    """An admitted request of an AsyncRequestLimiter; `granted` resolves when it may start."""
+
+    __slots__ = ("channel", "user", "enqueued_at", "granted", "position")
+
+    def __init__(self, channel: str, user: str, granted: "asyncio.Future[None]") -> None:
+        self.channel = channel
+        self.user = user
+        self.enqueued_at = time.monotonic()
+        self.granted = granted
+        # Requests waiting when it was admitted, including itself (0 = started right away)
+        self.position = 0
+
+
+class AsyncRequestLimiter:
+    """
+    Admission control for the asyncio runtime: at most `concurrency`
+    requests run at once, the rest wait in a queue bounded in total and
+    per user and are started round-robin across channels and their users,
+    like FairWorkerPool. Same QueueFull contract and metrics.
+
+    Use from the event loop: admit() a request, then run() it with its ticket.
+
+    Args:
+        concurrency: Requests answered at the same time
+        max_queue: Maximum number of waiting requests in total
+        max_per_user: Maximum number of waiting requests per user (0 = no limit)
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, max_per_user: int = 0) -> None:
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_per_user = max(0, max_per_user)
+        self._queue = _FairQueue()
+        # Requests holding a slot, started or granted and about to start
+        self._busy = 0
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self.wait = WaitHistogram()
+
+    def admit(self, channel: str, user: str) -> _Ticket:
+        """
+        Queue a request for a slot.
+
+        Returns:
+            Its ticket, for run() (or cancel()); ticket.position is 0 if
+            the request can start right away, otherwise the number of
+            requests waiting, including this one (an estimate of its place,
+            as in FairWorkerPool.submit)
+
+        Raises:
+            QueueFull: If the queue, or the user's share of it, is full
+        """
+        channel, user = str(channel), str(user)
+        if self._busy >= self.concurrency:
+            if len(self._queue) >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise QueueFull(f"queue full ({len(self._queue)} waiting)")
+            if self.max_per_user and self._queue.waiting(user) >= self.max_per_user:
+                self._stats["rejected"] += 1
+                raise QueueFull(f"user {user} already has {self._queue.waiting(user)} requests waiting")
+
+        ticket = _Ticket(channel, user, asyncio.get_running_loop().create_future())
+        self._queue.push(ticket)
+        self._stats["submitted"] += 1
+        self._dispatch()
+        ticket.position = 0 if ticket.granted.done() else len(self._queue)
+        return ticket
+
+    def _dispatch(self) -> None:
+        """Grant the free slots to the waiting requests whose turn it is."""
+        while self._busy < self.concurrency and self._queue:
+            ticket = self._queue.pop()
+            if ticket.granted.done():
+                # Its task was cancelled while waiting; cancel() finds nothing left to free
+                continue
+            self._busy += 1
+            self.wait.record(time.monotonic() - ticket.enqueued_at)
+            ticket.granted.set_result(None)
+
+    def _release(self) -> None:
+        self._busy -= 1
+        self._dispatch()
+
+    def cancel(self, ticket: _Ticket) -> None:
+        """Give up an admitted request that will not be run, freeing its place or slot."""
+        if self._queue.remove(ticket):
+            return
+        if ticket.granted.done() and not ticket.granted.cancelled():
+            self._release()
+
+    async def run(self, ticket: _Ticket, coro: Awaitable[Any]) -> Any:
+        """Wait for the ticket's turn, then run the admitted request."""
+        try:
+            await ticket.granted
+        except BaseException:
+            coro.close()
+            self.cancel(ticket)
+            raise
+        outcome = "completed"
+        try:
+            return await coro
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            self._stats[outcome] += 1
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, running requests, counters and queue wait numbers (seconds)."""
+        stats = dict(self._stats, workers=self.concurrency, busy=self._busy, queued=len(self._queue))
+        stats.update(self.wait.stats())
+        return stats
+
+    def prometheus_lines(self, prefix: str = "saiborg") -> List[str]:
+        """Render the queue wait histogram and gauges in Prometheus text format."""
+        return self.wait.prometheus_lines(f"{prefix}_queue_wait_seconds") + _gauge_lines(prefix, self.stats())